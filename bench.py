@@ -0,0 +1,807 @@
+#!/usr/bin/env python3
+"""
+⏱️ LoL Rank Tracker - Bancs d'essai et vérifications
+Génère des historiques synthétiques réalistes et compare les chemins rapides
+aux fonctions de référence de script.py.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import script
+
+
+def generate_history(count, seed=42, start_rank='Silver II', start_time=datetime(2024, 1, 8, 18, 0)):
+    """Génère un historique déterministe (mêmes règles de promotion/démotion que add_entry)"""
+    rng = random.Random(seed)
+    rank_idx = script.RANKS.index(start_rank)
+    lp = rng.randint(0, 99)
+    timestamp = start_time
+    skill_idx = rank_idx + 2  # Niveau "réel" du joueur : le winrate s'équilibre autour
+    form = 0.0
+    history = []
+
+    for i in range(count):
+        # Sessions du soir : ~35 min entre deux games, puis une pause de quelques heures/jours
+        if rng.random() < 0.15:
+            timestamp += timedelta(hours=rng.randint(10, 60), minutes=rng.randint(0, 59))
+        else:
+            timestamp += timedelta(minutes=rng.randint(25, 45))
+
+        # Winrate : ~50% au niveau réel du joueur, plus une forme qui dérive lentement
+        form = min(0.1, max(-0.1, form + rng.uniform(-0.01, 0.01)))
+        winrate = min(0.7, max(0.3, 0.5 + 0.04 * (skill_idx - rank_idx) + form))
+        roll = rng.random()
+        if roll < 0.01:
+            lp_change = 0  # Remake
+        elif roll < 0.01 + winrate:
+            lp_change = rng.randint(14, 28)
+        else:
+            lp_change = -rng.randint(12, 26)
+
+        rank = script.RANKS[rank_idx]
+        new_lp = lp + lp_change
+        entry = {
+            "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "rank": rank,
+            "lp_change": lp_change,
+            "lp_total": new_lp
+        }
+
+        # Les plus anciennes entrées n'ont pas de KDA ni de grade
+        if i >= count // 20:
+            won = lp_change > 0
+            kills = max(0, int(rng.gauss(7 if won else 4, 3)))
+            deaths = max(0, int(rng.gauss(4 if won else 7, 2)))
+            assists = max(0, int(rng.gauss(9 if won else 6, 4)))
+            grade_idx = min(len(script.GRADE_ORDER) - 1, max(0, int(rng.gauss(5 if won else 9, 3))))
+            entry.update(kills=kills, deaths=deaths, assists=assists, grade=script.GRADE_ORDER[grade_idx])
+        if rng.random() < 0.05:
+            entry["note"] = rng.choice(["tilt", "duo", "smurf en face", "nouveau champion", "afk top"])
+
+        if new_lp >= 100 and not script.rank_info(rank).is_apex and rank_idx + 1 < len(script.RANKS):
+            start_lp = min(new_lp - 100, 100)
+            rank_idx += 1
+            entry["lp_change"] = (100 - lp) + start_lp
+            entry["promote"] = {"to": script.RANKS[rank_idx], "start_lp": start_lp}
+            entry["rank"] = script.RANKS[rank_idx]
+            entry["lp_total"] = start_lp
+        elif new_lp < 0 and rank_idx > 0:
+            rank_idx -= 1
+            entry["demote"] = {"to": script.RANKS[rank_idx], "start_lp": 75}
+            entry["rank"] = script.RANKS[rank_idx]
+            entry["lp_total"] = 75
+        lp = entry["lp_total"]
+        history.append(entry)
+
+    return history
+
+
+def reference_stats(data):
+    """Chiffres de show_stats() calculés avec les fonctions historiques (plusieurs passages)"""
+    wins = len([e for e in data if e.get('lp_change', 0) > 0])
+    losses = len([e for e in data if e.get('lp_change', 0) < 0])
+    positions = [script.absolute_lp(e['rank'], e['lp_total']) for e in data]
+    peak = data[positions.index(max(positions))] if data else None
+    return {
+        'basics': {
+            'total_games': len(data),
+            'total_lp_gained': sum(entry.get('lp_change', 0) for entry in data),
+            'wins': wins,
+            'losses': losses,
+            'promotions': len([e for e in data if 'promote' in e]),
+            'demotions': len([e for e in data if 'demote' in e]),
+            'lp_won': sum(e.get('lp_change', 0) for e in data if e.get('lp_change', 0) > 0),
+            'lp_lost': sum(e.get('lp_change', 0) for e in data if e.get('lp_change', 0) < 0)
+        },
+        'streaks': script.calculate_streaks(data),
+        'rank_distribution': script.get_rank_distribution(data),
+        'peak': {'rank': peak['rank'], 'lp_total': peak['lp_total']} if peak else None,
+        'kda': script.calculate_kda_stats(data),
+        'grades': script.calculate_grade_stats(data)
+    }
+
+
+def verify_stats(sizes, seeds):
+    """Vérifie que l'accumulateur à un passage donne exactement les mêmes chiffres"""
+    failures = 0
+    for size in sizes:
+        for seed in seeds:
+            data = generate_history(size, seed=seed)
+            expected = reference_stats(data)
+            got = script.StatsAccumulator().add_all(data).report()
+            for section, value in expected.items():
+                if got[section] != value:
+                    failures += 1
+                    print(f"❌ {size} entrées (seed {seed}) : section '{section}' différente")
+            # Cas limites : historique vide, sans KDA, une seule entrée
+            for sample in ([], data[:1], [{k: v for k, v in e.items() if k not in ('kills', 'grade')} for e in data[:50]]):
+                if script.StatsAccumulator().add_all(sample).report() != reference_stats(sample):
+                    failures += 1
+                    print(f"❌ Cas limite différent ({len(sample)} entrées)")
+        print(f"✅ {size} entrées vérifiées" if not failures else f"⚠️  {size} entrées : {failures} écart(s)")
+    return failures == 0
+
+
+def _traced_size(build):
+    """Mémoire encore allouée (et pic) après construction d'un objet"""
+    tracemalloc.start()
+    obj = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, peak
+
+
+def bench_memory(sizes, seed):
+    """Compare la liste de dicts (format JSON) à la représentation EntryColumns"""
+    for size in sizes:
+        # On repart de lignes JSON, comme au chargement du journal
+        lines = [json.dumps(entry, ensure_ascii=False) for entry in generate_history(size, seed=seed)]
+        dicts, dict_bytes, dict_peak = _traced_size(lambda: [json.loads(line) for line in lines])
+        columns, col_bytes, col_peak = _traced_size(lambda: script.EntryColumns(json.loads(line) for line in lines))
+        assert list(columns) == dicts, "EntryColumns ne restitue pas les mêmes entrées"
+        print(f"📦 {size:>9} entrées │ dicts {dict_bytes / 1e6:8.2f} Mo ({dict_bytes / size:6.1f} o/entrée)"
+              f" │ colonnes {col_bytes / 1e6:8.2f} Mo ({col_bytes / size:6.1f} o/entrée, pic {col_peak / 1e6:.2f} Mo)"
+              f" │ x{dict_bytes / max(col_bytes, 1):.1f}")
+        del dicts, columns
+
+
+def verify_ranges(sizes, seed, queries=200):
+    """Vérifie range_stats() (sommes cumulées) contre un calcul direct sur des plages aléatoires"""
+    rng = random.Random(seed)
+    failures = 0
+    for size in sizes:
+        data = generate_history(size, seed=seed)
+        for _ in range(queries):
+            start = rng.randint(-size, size)
+            stop = rng.choice([None, rng.randint(-size, size)])
+            window = data[start:stop]
+            got = script.range_stats(data, start, stop)
+            kda = script.calculate_kda_stats(window)
+            grades = script.calculate_grade_stats(window)
+            expected = {
+                'games': len(window),
+                'lp': sum(e.get('lp_change', 0) for e in window),
+                'wins': len([e for e in window if e.get('lp_change', 0) > 0]),
+                'losses': len([e for e in window if e.get('lp_change', 0) < 0]),
+                'kda': kda['avg_kda'] if kda else None,
+                'avg_grade_points': grades['avg_grade_points'] if grades else None
+            }
+            for key, value in expected.items():
+                same = (got[key] == value if value is None or isinstance(value, int)
+                        else abs(got[key] - value) < 1e-9)
+                if not same:
+                    failures += 1
+                    print(f"❌ {size} entrées, plage [{start}:{stop}] : '{key}' = {got[key]} au lieu de {value}")
+        print(f"✅ {queries} plages vérifiées sur {size} entrées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def verify_rolling(size, seed, days=3):
+    """Fenêtres glissantes en jours comparées à un comptage direct ; sur un historique non trié
+    (timestamps permutés) ou une durée nulle, chaque fenêtre contient au moins son entrée"""
+    rng = random.Random(seed)
+    failures = 0
+    data = generate_history(size, seed=seed)
+    span = days * 86400
+    times = [script.entry_seconds(entry) for entry in data]
+    expected = [sum(1 for j in range(max(0, i - 500), i + 1) if times[j] > times[i] - span) for i in range(size)]
+    if script.rolling_series(data, days=days)['games'] != expected:
+        failures += 1
+        print(f"❌ {size} entrées : fenêtres de {days} jours différentes d'un comptage direct")
+    shuffled = [dict(entry) for entry in data]
+    for _ in range(size // 10):
+        i, j = rng.randrange(size), rng.randrange(size)
+        shuffled[i]['timestamp'], shuffled[j]['timestamp'] = shuffled[j]['timestamp'], shuffled[i]['timestamp']
+    shuffled[-1]['timestamp'] = data[0]['timestamp']
+    for label, history, window in (('non triées', shuffled, days), ('fenêtre de 0 jour', data, 0)):
+        try:
+            counts = script.rolling_series(history, days=window)['games']
+            if any(not 1 <= count <= i + 1 for i, count in enumerate(counts)):
+                failures += 1
+                print(f"❌ {size} entrées ({label}) : fenêtre vide ou trop grande")
+        except (ZeroDivisionError, IndexError) as e:
+            failures += 1
+            print(f"❌ {size} entrées ({label}) : {e!r}")
+    print(f"✅ Fenêtres glissantes vérifiées sur {size} entrées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def verify_sessions(sizes, seed):
+    """Sessions : index construit depuis les colonnes ou étendu entrée par entrée, comparé à un
+    découpage direct (calculate_streaks, calculate_kda_stats, calculate_grade_stats par session)"""
+    failures = 0
+    for size in sizes:
+        data = generate_history(size, seed=seed)
+        groups = []
+        previous = None
+        for entry in data:
+            seconds = script.entry_seconds(entry)
+            if previous is None or abs(seconds - previous) > script.SESSION_GAP:
+                groups.append([])
+            groups[-1].append(entry)
+            previous = seconds
+        half = script.SessionIndex.build(data[:size // 2])
+        for entry in data[size // 2:]:
+            half.add(entry)
+        for label, idx in (('colonnes', script.SessionIndex.build(script.EntryColumns(data))),
+                           ('incrémental', half)):
+            if len(idx.sessions) != len(groups):
+                failures += 1
+                print(f"❌ {size} entrées ({label}) : {len(idx.sessions)} sessions au lieu de {len(groups)}")
+                continue
+            start = 0
+            for session, group in zip(idx.sessions, groups):
+                streaks = script.calculate_streaks(group)
+                kda = script.calculate_kda_stats(group)
+                grades = script.calculate_grade_stats(group)
+                expected = {
+                    'start': start,
+                    'games': len(group),
+                    'lp': sum(e.get('lp_change', 0) for e in group),
+                    'wins': len([e for e in group if e.get('lp_change', 0) > 0]),
+                    'losses': len([e for e in group if e.get('lp_change', 0) < 0]),
+                    'rank': group[-1]['rank'],
+                    'lp_total': group[-1]['lp_total'],
+                    'tilted': streaks['type'] == 'lose' and streaks['current'] >= script.SESSION_TILT_STREAK,
+                    'kda': kda['avg_kda'] if kda else None,
+                    'avg_grade_points': grades['avg_grade_points'] if grades else None
+                }
+                start += len(group)
+                for key, value in expected.items():
+                    got = getattr(session, key)
+                    same = (got == value if not isinstance(value, float) else abs(got - value) < 1e-9)
+                    if not same:
+                        failures += 1
+                        print(f"❌ {size} entrées ({label}), session {session.start} : '{key}' = {got} au lieu de {value}")
+        print(f"✅ {len(groups)} sessions vérifiées sur {size} entrées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def verify_corrections(size, seed, operations=40):
+    """Corrections (edit/delete/undo) sur un journal, chargé ou lu à la demande : historique comparé
+    à un re-chaînage complet, statistiques et index comparés à un recalcul depuis zéro"""
+    rng = random.Random(seed)
+    failures = 0
+    base = generate_history(size, seed=seed)
+
+    def rechained(entries, start):
+        for i in range(max(start, 1), len(entries)):
+            entries[i] = script.rechain_entry(entries[i], entries[i - 1])
+        return entries
+
+    for materialized in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'journal.jsonl')
+            script.write_journal(path, base)
+            data = script.JournalHistory(path)
+            data.write_snapshot()
+            data.stats()
+            if materialized:
+                data.columns()
+            for index_cls in (script.LadderSeries, script.TimestampIndex, script.SessionIndex):
+                data.index(index_cls)
+            expected = list(base)
+            history = []
+            for step in range(operations):
+                action = rng.choice(('edit', 'edit', 'delete', 'undo'))
+                position = rng.randrange(len(expected))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if action == 'edit' and 'promote' not in expected[position]:
+                        lp_change = rng.randint(-30, 30)
+                        kda = (rng.randint(0, 20), rng.randint(0, 12), rng.randint(0, 25))
+                        if script.edit_entry(data, position, lp_change=lp_change, kda=kda):
+                            history.append(list(expected))
+                            entry = dict(expected[position], lp_change=lp_change)
+                            entry['kills'], entry['deaths'], entry['assists'] = kda
+                            if position:
+                                entry = script.rechain_entry(entry, expected[position - 1])
+                            elif 'demote' not in entry:
+                                entry['lp_total'] += lp_change - expected[position].get('lp_change', 0)
+                            expected[position] = entry
+                            rechained(expected, position + 1)
+                    elif action == 'delete':
+                        script.delete_entry(data, position)
+                        history.append(list(expected))
+                        del expected[position]
+                        rechained(expected, position)
+                    elif action == 'undo' and script.undo_change(data) is not None:
+                        expected = history.pop()
+                label = f"{size} entrées ({'chargées' if materialized else 'paresseuses'}), étape {step} ({action})"
+                if list(data) != expected:
+                    failures += 1
+                    print(f"❌ {label} : historique différent du re-chaînage complet")
+                    break
+                if data.stats().report() != script.StatsAccumulator().add_all(expected).report():
+                    failures += 1
+                    print(f"❌ {label} : statistiques différentes d'un recalcul complet")
+                if (data.index(script.LadderSeries).values != script.LadderSeries.build(expected).values
+                        or data.index(script.TimestampIndex).times != script.TimestampIndex.build(expected).times
+                        or [(session.start, session.games, session.lp, session.streak)
+                            for session in data.index(script.SessionIndex).sessions]
+                        != [(session.start, session.games, session.lp, session.streak)
+                            for session in script.SessionIndex.build(expected).sessions]):
+                    failures += 1
+                    print(f"❌ {label} : index dérivés différents d'une reconstruction")
+            reloaded = script.JournalHistory(path)
+            if list(reloaded) != expected or reloaded.stats().report() != data.stats().report():
+                failures += 1
+                print(f"❌ {size} entrées : journal ou cache de statistiques relu différent")
+            # Ligne corrompue après les corrections : l'instantané ne doit pas ramener d'anciennes games
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            lines[len(lines) // 2] = '{"timestamp": corrompu\n'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            with contextlib.redirect_stderr(io.StringIO()):
+                if list(script.JournalHistory(path)) != expected:
+                    failures += 1
+                    print(f"❌ {size} entrées : reprise depuis un instantané antérieur aux corrections")
+    print(f"✅ {operations} corrections vérifiées sur {size} entrées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def _same(a, b):
+    """Égalité récursive, aux arrondis flottants près (agrégats SQL vs Python)"""
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and abs(a - b) < 1e-9
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same(a[key], b[key]) for key in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def verify_sqlite(sizes, seed):
+    """Statistiques du backend SQLite (requêtes : séries, pic, KDA, grades) comparées à celles
+    du journal (StatsAccumulator), du bas du ladder jusqu'à Master+"""
+    failures = 0
+    for size in sizes:
+        for start_rank in ('Iron IV', 'Gold II', 'Master'):
+            data = generate_history(size, seed=seed, start_rank=start_rank)
+            with tempfile.TemporaryDirectory() as tmp:
+                journal = os.path.join(tmp, 'journal.jsonl')
+                script.write_journal(journal, data)
+                expected = script.collect_stats(script.JournalHistory(journal))
+                sqlite = script.SqliteHistory(os.path.join(tmp, 'journal.db'))
+                try:
+                    empty = script.collect_stats(sqlite)
+                    sqlite.extend(data)
+                    got = script.collect_stats(sqlite)
+                finally:
+                    sqlite.conn.close()
+            for label, report, reference in (('vide', empty, script.StatsAccumulator().report()),
+                                             (f"{size} entrées depuis {start_rank}", got, expected)):
+                for section, value in reference.items():
+                    if not _same(report[section], value):
+                        failures += 1
+                        print(f"❌ SQLite ({label}) : section '{section}' différente")
+        print(f"✅ SQLite vérifié sur {size} entrées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def verify_journal_merge(size, seed):
+    """Deux terminaux sur le même journal (ajouts successifs puis entrelacés par date), et reprise
+    des lignes corrompues depuis l'instantané avec deux games de la même seconde"""
+    base = generate_history(size + 40, seed=seed)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'journal.jsonl')
+        script.write_journal(path, base[:size])
+        first, second = script.JournalHistory(path), script.JournalHistory(path)
+        first.stats(), second.stats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Ajouts successifs : les entrées du second terminal sont re-chaînées sur le fichier
+            first.extend(base[size:size + 10])
+            first.save()
+            second.extend(base[size + 10:size + 20])
+            second.save()
+            # Ajouts entrelacés : le journal est fusionné par date
+            first.refresh()
+            first.extend(base[size + 21:size + 40:2])
+            first.save()
+            second.extend(base[size + 20:size + 40:2])
+            second.save()
+            first.refresh()
+        expected = base[:size + 40]
+        expected_stats = script.StatsAccumulator().add_all(expected).report()
+        for label, data in (('premier terminal', first), ('second terminal', second),
+                            ('journal relu', script.JournalHistory(path))):
+            if list(data) != expected:
+                failures += 1
+                print(f"❌ Écritures concurrentes ({label}) : historique différent du chaînage attendu")
+            elif data.stats().report() != expected_stats:
+                failures += 1
+                print(f"❌ Écritures concurrentes ({label}) : statistiques différentes d'un recalcul")
+
+        # Deux games saisies dans la même seconde, dont une perdue dans le journal
+        twins = [dict(entry) for entry in base[:size]]
+        twins[size // 2]['timestamp'] = twins[size // 2 - 1]['timestamp']
+        script.write_journal(path, twins)
+        script.copy_journal(path, script.snapshot_path(path), os.path.getsize(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        lines[size // 2] = '{"timestamp": corrompu\n'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        with contextlib.redirect_stderr(io.StringIO()):
+            recovered = list(script.JournalHistory(path))
+        if recovered != twins:
+            failures += 1
+            print("❌ Instantané : games de la même seconde mal reprises")
+    print(f"✅ Écritures concurrentes et reprise d'instantané vérifiées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def generate_match_dump(history, player='Joueur#EUW', seed=42):
+    """Matchs match-v5 simulés pour les entrées avec K/D/A (fixtures locales, sans réseau) :
+    fin de game quelques minutes avant la saisie, 10 participants, remake si 0 LP"""
+    rng = random.Random(seed)
+    name, tag = player.split('#')
+    matches = []
+    for i, entry in enumerate(history):
+        if 'kills' not in entry:
+            continue
+        end = datetime.strptime(entry['timestamp'], script.TIMESTAMP_FORMAT) - timedelta(minutes=rng.randint(1, 20))
+        win = entry.get('lp_change', 0) > 0
+        participants = [{
+            'puuid': f"puuid-{i}-{slot}", 'riotIdGameName': f"Autre{slot}", 'riotIdTagline': 'EUW',
+            'kills': rng.randint(0, 15), 'deaths': rng.randint(0, 12), 'assists': rng.randint(0, 20),
+            'win': (slot < 5) == win, 'gameEndedInEarlySurrender': entry.get('lp_change', 0) == 0
+        } for slot in range(10)]
+        me = participants[rng.randrange(5)]
+        me.update(puuid='puuid-joueur', riotIdGameName=name, riotIdTagline=tag,
+                  kills=entry['kills'], deaths=entry['deaths'], assists=entry['assists'])
+        duration = rng.randint(15 * 60, 40 * 60)
+        matches.append({
+            'metadata': {'matchId': f"EUW1_{1000000 + i}", 'participants': [p['puuid'] for p in participants]},
+            'info': {'gameStartTimestamp': int(end.timestamp() - duration) * 1000, 'gameDuration': duration,
+                     'gameEndTimestamp': int(end.timestamp()) * 1000, 'queueId': 420, 'participants': participants}
+        })
+    return matches
+
+
+def verify_matches(size, seed):
+    """Import match-v5 : K/D/A effacés puis restaurés depuis des exports (tableau et JSONL),
+    games récentes ajoutées, lecture en flux sur des blocs minuscules"""
+    data = generate_history(size, seed=seed)
+    matches = generate_match_dump(data, seed=seed)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        half = len(matches) // 2
+        array_path, lines_path = os.path.join(tmp, 'matchs.json'), os.path.join(tmp, 'matchs.jsonl')
+        with open(array_path, 'w', encoding='utf-8') as f:
+            json.dump(matches[:half], f, indent=2)
+        with open(lines_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(match) + "\n" for match in matches[half:])
+        with open(array_path, 'r', encoding='utf-8') as f:
+            if list(script.iter_json_values(f, block_size=7)) != matches[:half]:
+                failures += 1
+                print("❌ Lecture en flux différente de json.load")
+
+        kept = len(data) - 20
+        blanked = [dict(e, kills=0, deaths=0, assists=0) if 'kills' in e else e for e in data[:kept]]
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = script.import_match_dumps(blanked, [array_path, lines_path], 'joueur#euw',
+                                                lp_win=20, lp_loss=-20, jobs=2)
+        if blanked[:kept] != data[:kept]:
+            failures += 1
+            print("❌ K/D/A non restaurés à l'identique")
+        if summary['added'] != 20 or summary['unmatched'] or summary['result_mismatch']:
+            failures += 1
+            print(f"❌ Résumé inattendu : {summary}")
+        added = blanked[kept:]
+        if [(e['timestamp'][:10], e['kills']) for e in added] != [(e['timestamp'][:10], e['kills']) for e in data[kept:]]:
+            failures += 1
+            print("❌ Games récentes mal ajoutées")
+    print(f"✅ {len(matches)} matchs importés sur {size} entrées" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def verify_projection(seed, simulations=4000):
+    """Projection Monte Carlo : cas déterministes, plancher à Iron IV, reproductibilité quel que soit
+    le nombre de processus, et probabilité comparée à une simulation game par game"""
+    import random
+    failures = 0
+    always_win = script.increment_table([20], [-20], 100.0)
+    if list(script.simulate_batch(always_win, 0, 100, 50, 3, seed)) != [5, 5, 5]:
+        failures += 1
+        print("❌ 100 % de victoires : cible attendue en 5 games")
+    always_lose = script.increment_table([20], [-20], 0.0)
+    if any(script.simulate_batch(always_lose, 30, 100, 50, 3, seed)):
+        failures += 1
+        print("❌ 0 % de victoires : cible atteinte")
+    table = script.increment_table([15, 25], [-20], 45.0)
+    hits = script.run_projection(table, 50, 400, 600, simulations, seed=seed, jobs=1)
+    if script.run_projection(table, 50, 400, 600, simulations, seed=seed, jobs=2) != hits:
+        failures += 1
+        print("❌ Résultats différents selon le nombre de processus")
+    rng = random.Random(seed)
+    reference = 0
+    for _ in range(simulations):
+        position = 50
+        for _ in range(600):
+            position = max(position + (rng.choice([15, 25]) if rng.random() < 0.45 else -20), 0)
+            if position >= 400:
+                reference += 1
+                break
+    simulated = sum(1 for hit in hits if hit) / simulations
+    expected = reference / simulations
+    tolerance = 4 * (expected * (1 - expected) * 2 / simulations) ** 0.5 + 1e-9
+    if abs(simulated - expected) > tolerance:
+        failures += 1
+        print(f"❌ Probabilité simulée {simulated:.3f} ≠ référence {expected:.3f}")
+    print(f"✅ Projection vérifiée ({simulations} trajectoires)" if not failures else f"⚠️  {failures} écart(s)")
+    return failures == 0
+
+
+def legacy_pad_colored_string(text, width):
+    """Ancien pad_colored_string() : regex compilée à chaque appel"""
+    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+    visible_len = len(ansi_escape.sub('', text))
+    return text if visible_len >= width else text + ' ' * (width - visible_len)
+
+
+def legacy_render(entries):
+    """Ancien rendu de display_data() : un print() par ligne, 4 paddings par regex"""
+    for entry in entries:
+        timestamp = entry['timestamp'][:16] if len(entry['timestamp']) > 16 else entry['timestamp']
+        rank_colored = script.colorize_rank(entry['rank'])
+        lp_change_colored = script.format_lp_change(entry.get('lp_change', 0))
+        lp_total = f"{entry['lp_total']} LP"
+        kills = entry.get('kills', 0)
+        deaths = entry.get('deaths', 1)
+        assists = entry.get('assists', 0)
+        kda_colored = script.format_kda(kills, deaths, assists) if 'kills' in entry else "N/A"
+        grade = entry.get('grade', 'N/A')
+        grade_colored = script.colorize_grade(grade) if grade != 'N/A' else grade
+        notes = entry.get('note', '')
+        if 'promote' in entry:
+            promo_note = f"🚀 → {entry['promote']['to']}"
+            notes = f"{notes} {promo_note}" if notes else promo_note
+        elif 'demote' in entry:
+            demo_note = f"📉 → {entry['demote']['to']}"
+            notes = f"{notes} {demo_note}" if notes else demo_note
+        print(f"{timestamp:<20} {legacy_pad_colored_string(rank_colored, 20)} "
+              f"{legacy_pad_colored_string(lp_change_colored, 15)} {lp_total:<12} "
+              f"{legacy_pad_colored_string(kda_colored, 15)} {legacy_pad_colored_string(grade_colored, 8)} {notes}")
+
+
+def buffered_render(entries):
+    """Nouveau rendu : tableau construit en mémoire puis une seule écriture"""
+    sys.stdout.write("\n".join(script.render_history_table(entries)) + "\n")
+
+
+def _timed(func, *args, repeat=3):
+    """Meilleur temps sur quelques exécutions, sortie standard redirigée vers /dev/null"""
+    best = float('inf')
+    with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_render(sizes, seed):
+    """Compare l'ancien rendu ligne par ligne au rendu tamponné"""
+    data = generate_history(max(sizes), seed=seed)
+    for size in sizes:
+        rows = data[-size:]
+        legacy_out, new_out = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(legacy_out):
+            legacy_render(rows[:500])
+        with contextlib.redirect_stdout(new_out):
+            buffered_render(rows[:500])
+        assert legacy_out.getvalue() == new_out.getvalue().split("\n", 3)[3], "rendu différent"
+        legacy = _timed(legacy_render, rows)
+        buffered = _timed(buffered_render, rows)
+        print(f"🖥️  {size:>7} lignes │ print + regex {legacy * 1000:9.1f} ms │ tampon {buffered * 1000:8.1f} ms"
+              f" │ x{legacy / max(buffered, 1e-9):.1f}")
+
+
+STARTUP_TARGET_MS = 150  # Objectif de démarrage à froid de `script.py status` (process complet)
+
+
+def _process_time(argv, cwd, repeat):
+    """Temps médian d'un processus Python complet (démarrage de l'interpréteur inclus)"""
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(script.__file__)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + argv, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def bench_startup(sizes, seed, repeat):
+    """Démarrage à froid des commandes ponctuelles, comparé à un interpréteur nu"""
+    script_path = os.path.abspath(script.__file__)
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = _process_time(['-c', 'pass'], tmp, repeat)
+        print(f"🐍 interpréteur nu            {baseline * 1000:8.1f} ms")
+        ok = True
+        for size in sizes:
+            journal = os.path.join(tmp, script.JOURNAL_FILE)
+            script.write_journal(journal, generate_history(size, seed=seed))
+            # Cache de statistiques présent, comme après n'importe quel lancement du tracker
+            with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+                script.JournalHistory(journal).stats()
+            status = _process_time([script_path, 'status'], tmp, repeat)
+            module = _process_time(['-m', 'script', 'status'], tmp, repeat)
+            history = _process_time([script_path, 'history', '--last', '20'], tmp, repeat)
+            mark = "✅" if status * 1000 <= STARTUP_TARGET_MS else "❌"
+            ok = ok and mark == "✅"
+            print(f"{mark} {size:>8} entrées │ status {status * 1000:7.1f} ms │ -m script status {module * 1000:7.1f} ms"
+                  f" │ history --last 20 {history * 1000:7.1f} ms │ objectif {STARTUP_TARGET_MS} ms")
+    return ok
+
+
+BENCH_OPERATIONS = ('load_data', 'display_data', 'show_stats', 'calculate_streaks', 'calculate_kda_stats',
+                    'calculate_grade_stats', 'draw_lp_trend', 'save_data')
+
+
+def _session(journal_entries, trace):
+    """Une session type sur un journal fraîchement écrit : chargement, affichages, statistiques
+    puis sauvegarde d'une nouvelle game. Retourne {opération: (secondes, pic mémoire en octets)}."""
+    script.write_journal(script.JOURNAL_FILE, journal_entries)
+    sidecar = script.stats_cache_path(script.JOURNAL_FILE)
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+    state = {}
+
+    def save():
+        last = state['data'][-1]
+        moment = datetime.strptime(last['timestamp'], script.TIMESTAMP_FORMAT) + timedelta(minutes=35)
+        state['data'].append(dict(last, timestamp=moment.strftime(script.TIMESTAMP_FORMAT)))
+        return script.save_data(state['data'], quiet=True)
+
+    steps = {
+        'load_data': lambda: state.setdefault('data', script.load_data()),
+        'display_data': lambda: script.display_data(state['data']),
+        'show_stats': lambda: script.show_stats(state['data']),
+        'calculate_streaks': lambda: script.calculate_streaks(state['data']),
+        'calculate_kda_stats': lambda: script.calculate_kda_stats(state['data']),
+        'calculate_grade_stats': lambda: script.calculate_grade_stats(state['data']),
+        'draw_lp_trend': lambda: script.draw_lp_trend(state['data']),
+        'save_data': save,
+    }
+    results = {}
+    with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+        for name in BENCH_OPERATIONS:
+            if trace:
+                tracemalloc.start()
+            start = time.perf_counter()
+            steps[name]()
+            elapsed = time.perf_counter() - start
+            peak = 0
+            if trace:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            results[name] = (elapsed, peak)
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_run(sizes, seed, output):
+    """Temps (session sans traçage) et pic mémoire (session identique sous tracemalloc) de chaque
+    opération, écrits en JSON pour comparer deux versions"""
+    report = {
+        'revision': _git_revision(),
+        'date': datetime.now().strftime(script.TIMESTAMP_FORMAT),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'backend': script.STORAGE_BACKEND,
+        'seed': seed,
+        'results': []
+    }
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for size in sizes:
+                history = generate_history(size, seed=seed)
+                timings = _session(history, trace=False)
+                peaks = _session(history, trace=True)
+                del history
+                print(f"\n📦 {size} entrées")
+                for name in BENCH_OPERATIONS:
+                    seconds, peak = timings[name][0], peaks[name][1]
+                    report['results'].append({'size': size, 'operation': name, 'seconds': seconds, 'peak_bytes': peak})
+                    print(f"   {name:<22} {seconds * 1000:10.1f} ms │ pic {peak / 1e6:8.1f} Mo")
+        finally:
+            os.chdir(cwd)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Résultats écrits dans {output}")
+
+
+def bench_compare(old_path, new_path, threshold):
+    """Compare deux fichiers de résultats ; code de retour 1 si une opération ralentit au-delà du seuil"""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+    before = {(r['size'], r['operation']): r for r in old['results']}
+    print(f"🔎 {old.get('revision')} → {new.get('revision')} (seuil {threshold:.0%})")
+    regressions = 0
+    for result in new['results']:
+        previous = before.get((result['size'], result['operation']))
+        if previous is None:
+            continue
+        ratio = result['seconds'] / max(previous['seconds'], 1e-9)
+        memory = result['peak_bytes'] / max(previous['peak_bytes'], 1)
+        mark = "❌" if ratio > 1 + threshold else "✅"
+        regressions += mark == "❌"
+        print(f"{mark} {result['size']:>8} {result['operation']:<22} temps x{ratio:5.2f} │ mémoire x{memory:5.2f}")
+    return regressions == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bancs d'essai du LoL Rank Tracker")
+    sub = parser.add_subparsers(dest='command', required=True)
+    verify = sub.add_parser('verify', help="compare les chemins rapides aux fonctions de référence")
+    verify.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000])
+    verify.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3])
+    memory = sub.add_parser('memory', help="mémoire : liste de dicts vs EntryColumns")
+    memory.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000])
+    memory.add_argument('--seed', type=int, default=42)
+    render = sub.add_parser('render', help="rendu de l'historique : print par ligne vs tampon")
+    render.add_argument('--sizes', type=int, nargs='+', default=[500, 10000, 100000])
+    render.add_argument('--seed', type=int, default=42)
+    startup = sub.add_parser('startup', help="démarrage à froid de `script.py status` / `history`")
+    startup.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    startup.add_argument('--seed', type=int, default=42)
+    startup.add_argument('--repeat', type=int, default=5)
+    run = sub.add_parser('run', help="temps et pic mémoire des opérations principales, écrits en JSON")
+    run.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--output', default='bench_results.json')
+    compare = sub.add_parser('compare', help="compare deux fichiers de résultats de `run`")
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.2, help="ralentissement toléré (défaut: 0.2)")
+    args = parser.parse_args()
+
+    if args.command == 'verify':
+        ok = verify_stats(args.sizes, args.seeds)
+        ok = verify_ranges(args.sizes, args.seeds[0]) and ok
+        ok = verify_rolling(min(args.sizes), args.seeds[0]) and ok
+        ok = verify_matches(min(args.sizes), args.seeds[0]) and ok
+        ok = verify_sessions(args.sizes, args.seeds[0]) and ok
+        ok = verify_corrections(min(args.sizes), args.seeds[0]) and ok
+        ok = verify_journal_merge(min(args.sizes), args.seeds[0]) and ok
+        ok = verify_sqlite(args.sizes, args.seeds[0]) and ok
+        ok = verify_projection(args.seeds[0]) and ok
+        sys.exit(0 if ok else 1)
+    elif args.command == 'memory':
+        bench_memory(args.sizes, args.seed)
+    elif args.command == 'render':
+        bench_render(args.sizes, args.seed)
+    elif args.command == 'startup':
+        sys.exit(0 if bench_startup(args.sizes, args.seed, args.repeat) else 1)
+    elif args.command == 'run':
+        bench_run(args.sizes, args.seed, os.path.abspath(args.output))
+    elif args.command == 'compare':
+        sys.exit(0 if bench_compare(args.old, args.new, args.threshold) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,34 @@
 Pas de dépendances externes, que du Python pur !
 """
 import os
+import re
+import sys
 import json
-from datetime import datetime
+import time
+import zlib
+import calendar
+from array import array
+from collections import Counter, namedtuple
+from itertools import accumulate
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 
 # Configuration
-STORAGE_FILE = 'progression_data.json'
+STORAGE_FILE = 'progression_data.json'   # Ancien format (tableau JSON), migré au démarrage
+JOURNAL_FILE = 'progression_data.jsonl'  # Journal : une entrée JSON par ligne
+AUTOSAVE_DELAY = 0.05                    # Fenêtre de regroupement des sauvegardes automatiques (s)
+SNAPSHOT_EVERY = 50                      # Instantané du journal toutes les N sauvegardes automatiques
+SQLITE_FILE = 'progression_data.db'      # Base SQLite (backend optionnel)
+STORAGE_BACKEND = os.environ.get('LOL_TRACKER_BACKEND', 'journal')  # 'journal' ou 'sqlite'
+LAZY_BATCH_SIZE = 1000                   # Taille des blocs lus par les historiques paresseux
+JOURNAL_BLOCK_SIZE = 64 * 1024           # Taille des blocs lus dans le journal
+JOURNAL_CACHE_SIZE = 5000                # Entrées décodées gardées en cache
+STATS_CACHE_VERSION = 2                  # À incrémenter si StatsAccumulator change
+PROFILE_SETTING = os.environ.get('LOL_TRACKER_PROFILE', '')  # '1' : chronos par phase, sinon fichier pstats
+PROFILES_DIR = 'profils'                 # Un sous-dossier par compte suivi (profils nommés)
+ACCOUNT = os.environ.get('LOL_TRACKER_ACCOUNT', '')  # Profil actif ('' : fichiers du dossier courant)
+_DEFAULT_FILES = (STORAGE_FILE, JOURNAL_FILE, SQLITE_FILE)
 
 # Les ranks avec leurs couleurs ANSI
 RANK_COLORS = {
@@ -35,12 +58,52 @@ for tier in ["Iron", "Bronze", "Silver", "Gold", "Platinum", "Emerald", "Diamond
         RANKS.append(f"{tier} {div}")
 RANKS.extend(["Master", "Grandmaster", "Challenger"])
 
+# Grades valides (du meilleur au pire) et leur valeur en points
+GRADE_ORDER = ['S+', 'S', 'S-', 'A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-']
+GRADE_POINTS = {
+    'S+': 13, 'S': 12, 'S-': 11,
+    'A+': 10, 'A': 9, 'A-': 8,
+    'B+': 7, 'B': 6, 'B-': 5,
+    'C+': 4, 'C': 3, 'C-': 2,
+    'D+': 1, 'D': 0, 'D-': -1
+}
+GRADE_BY_POINTS = {points: grade for grade, points in GRADE_POINTS.items()}
+RANK_ORDINALS = {rank: idx for idx, rank in enumerate(RANKS)}
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Table des rangs précalculée : ordinal, tier, apex et version colorée
+APEX_TIERS = ('Master', 'Grandmaster', 'Challenger')
+RankInfo = namedtuple('RankInfo', 'name ordinal tier is_apex colored')
+
+def _build_rank_info(rank):
+    """Calcule les infos d'un rang (mêmes règles que l'ancien colorize_rank)"""
+    tier = next((t for t in RANK_COLORS if rank.startswith(t)), None)
+    colored = f"{RANK_COLORS[tier]}{rank}{RESET}" if tier else rank
+    is_apex = any(t in rank for t in APEX_TIERS)
+    return RankInfo(rank, RANK_ORDINALS.get(rank), tier, is_apex, colored)
+
+RANK_TABLE = {rank: _build_rank_info(rank) for rank in RANKS}
+MASTER_ORDINAL = RANK_ORDINALS['Master']
+
+def rank_info(rank):
+    """Infos précalculées d'un rang (un rang inconnu est calculé une fois puis mémorisé)"""
+    info = RANK_TABLE.get(rank)
+    if info is None:
+        info = RANK_TABLE[rank] = _build_rank_info(rank)
+    return info
+
+def absolute_lp(rank, lp_total):
+    """Position absolue sur le ladder : ordinal * 100 + LP (Master+ partagent la même échelle)"""
+    info = rank_info(rank)
+    if info.is_apex:
+        return MASTER_ORDINAL * 100 + lp_total
+    if info.ordinal is None:
+        return lp_total
+    return info.ordinal * 100 + lp_total
+
 def colorize_rank(rank):
     """Applique la couleur appropriée au rang"""
-    for tier, color in RANK_COLORS.items():
-        if rank.startswith(tier):
-            return f"{color}{rank}{RESET}"
-    return rank
+    return rank_info(rank).colored
 
 def colorize_grade(grade):
     """Applique la couleur appropriée à la note (alignée sur la logique KDA)"""
@@ -77,12 +140,12 @@ def format_kda(kills, deaths, assists):
     
     return f"{color}{kills}/{deaths}/{assists}{RESET}"
 
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
 def pad_colored_string(text, width):
     """Pad une chaîne colorée en tenant compte des codes ANSI"""
     # Calculer la longueur visible (sans codes ANSI)
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    clean_text = ansi_escape.sub('', text)
+    clean_text = ANSI_ESCAPE.sub('', text)
     visible_len = len(clean_text)
     
     if visible_len >= width:
@@ -91,6 +154,94 @@ def pad_colored_string(text, width):
     padding = width - visible_len
     return text + ' ' * padding
 
+# Instrumentation : chronos par phase, actifs seulement en mode profil
+PHASE_TIMINGS = None  # phase -> [appels, secondes] ; None quand le profil est désactivé
+
+class _NoPhase:
+    """Phase inactive : un seul objet partagé, aucun chrono"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_PHASE = _NoPhase()
+
+class _Phase:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record = PHASE_TIMINGS.setdefault(self.name, [0, 0.0])
+        record[0] += 1
+        record[1] += time.perf_counter() - self.start
+        return False
+
+def phase(name):
+    """Chronomètre un bloc (`with phase('load'):`) quand le profil est actif"""
+    if PHASE_TIMINGS is None:
+        return _NO_PHASE
+    return _Phase(name)
+
+def timed_phase(name):
+    """Décorateur : chronomètre chaque appel de la fonction comme une phase"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if PHASE_TIMINGS is None:
+                return func(*args, **kwargs)
+            with _Phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class Profiling:
+    """Active le profil pour la durée d'une commande : '1' pour les chronos par phase,
+    un chemin de fichier pour y ajouter un cProfile (pstats). Résumé affiché à la sortie."""
+
+    def __init__(self, setting):
+        self.setting = setting
+        self.profiler = None
+
+    def __enter__(self):
+        global PHASE_TIMINGS
+        if self.setting:
+            PHASE_TIMINGS = {}
+            if self.setting != '1':
+                import cProfile
+                self.profiler = cProfile.Profile()
+                self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        global PHASE_TIMINGS
+        if not self.setting:
+            return False
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.setting)
+        timings, PHASE_TIMINGS = PHASE_TIMINGS, None
+        lines = [f"\n{BOLD}⏱️  PROFIL{RESET}"]
+        for name, (calls, seconds) in sorted(timings.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<16} {calls:>5}× {seconds * 1000:10.1f} ms")
+        if self.profiler is not None:
+            lines.append(f"  📄 cProfile → {self.setting} (python -m pstats {self.setting})")
+        print("\n".join(lines), file=sys.stderr)
+        return False
+
+def terminal_size():
+    """Taille du terminal (shutil n'est importé que pour les vues qui en ont besoin)"""
+    import shutil
+    return shutil.get_terminal_size()
+
 def print_banner():
     """Affiche un banner sexy"""
     banner = f"""
@@ -125,132 +276,2688 @@ def print_progress_bar(current_lp, max_lp=100):
     
     return f"{color}[{bar}] {percentage}%{RESET}"
 
-def load_data():
-    """Charge les données avec gestion d'erreur sexy"""
+def _journal_line(entry):
+    """Sérialise une entrée sur une ligne du journal"""
+    return json.dumps(entry, ensure_ascii=False) + "\n"
+
+def _iter_journal(path, stats=None):
+    """Parcourt le journal ligne par ligne, en ignorant les lignes corrompues"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                # Dernière ligne tronquée (crash pendant une écriture)
+                if stats is not None:
+                    stats['dead_lines'] += 1
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                if stats is not None:
+                    stats['dead_lines'] += 1
+
+def write_journal(path, entries):
+    """Réécrit un journal complet (fichier temporaire + remplacement atomique)"""
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(_journal_line(entry))
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+def splice_journal(path, begin, end, payload, size):
+    """Remplace les octets [begin:end] d'un journal par `payload` ; le reste est recopié tel quel,
+    sans décodage (fichier temporaire + remplacement atomique). Retourne la nouvelle taille et son CRC32."""
+    tmp_path = path + '.tmp'
+    crc = 0
+    with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        
+        def copy(start, stop):
+            nonlocal crc
+            src.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                block = src.read(min(JOURNAL_BLOCK_SIZE * 16, remaining))
+                if not block:
+                    break
+                dst.write(block)
+                crc = zlib.crc32(block, crc)
+                remaining -= len(block)
+        
+        copy(0, begin)
+        dst.write(payload)
+        crc = zlib.crc32(payload, crc)
+        copy(end, size)
+        dst.flush()
+        os.fsync(dst.fileno())
+        new_size = dst.tell()
+    os.replace(tmp_path, path)
+    return new_size, crc
+
+def snapshot_path(path):
+    """Dernier instantané valide d'un journal (copie complète, remplacée atomiquement)"""
+    return os.path.splitext(path)[0] + '.snapshot.jsonl'
+
+def copy_journal(source, target, size=None):
+    """Copie les `size` premiers octets d'un journal (fichier temporaire + remplacement atomique)"""
+    tmp_path = target + '.tmp'
+    with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+        remaining = os.path.getsize(source) if size is None else size
+        while remaining > 0:
+            block = src.read(min(JOURNAL_BLOCK_SIZE * 16, remaining))
+            if not block:
+                break
+            dst.write(block)
+            remaining -= len(block)
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp_path, target)
+
+def corrupt_lines_path(path):
+    """Lignes illisibles retirées d'un journal à sa compaction (ajoutées à la suite)"""
+    return os.path.splitext(path)[0] + '.corrompu.jsonl'
+
+def keep_corrupt_lines(path):
+    """Recopie les lignes illisibles du journal (JSON invalide, fin tronquée) avant qu'une
+    réécriture ne les efface : sans instantané, c'est leur seule trace. Retourne leur nombre."""
+    corrupt = []
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                corrupt.append(line + b"\n")
+                continue
+            if not line.strip():
+                continue
+            try:
+                json.loads(line)
+            except ValueError:
+                corrupt.append(line)
+    if corrupt:
+        with open(corrupt_lines_path(path), 'ab') as f:
+            f.writelines(corrupt)
+    return len(corrupt)
+
+def restore_snapshot(path):
+    """Remplace un journal illisible par son dernier instantané (l'original est gardé à côté).
+    Retourne False s'il n'y a pas d'instantané."""
+    snapshot = snapshot_path(path)
+    if not os.path.exists(snapshot):
+        return False
+    if os.path.exists(path):
+        os.replace(path, path + '.corrompu')
+    copy_journal(snapshot, path)
+    stats_path = stats_cache_path(path)
+    if os.path.exists(stats_path):
+        os.remove(stats_path)
+    return True
+
+def merge_by_timestamp(primary, secondary):
+    """Fusionne deux historiques par timestamp : les entrées de `primary` font foi,
+    celles de `secondary` absentes de `primary` sont réintégrées à leur place. Deux games
+    de la même seconde restent distinctes. Une game est identifiée par ses champs saisis (timestamp,
+    résultat, K/D/A, grade, note), pas par le rang et les LP totaux qu'un re-chaînage recalcule."""
+    def game_key(entry):
+        return (entry.get('timestamp'), game_outcome(entry), entry.get('kills'), entry.get('deaths'),
+                entry.get('assists'), entry.get('grade'), entry.get('note'))
+    
+    known = Counter(map(game_key, primary))
+    missing = []
+    for entry in secondary:
+        key = game_key(entry)
+        if known.get(key):
+            known[key] -= 1
+        else:
+            missing.append(entry)
+    if not missing:
+        return list(primary), 0
+    merged = list(primary) + missing
+    merged.sort(key=entry_seconds)
+    return merged, len(missing)
+
+def _file_stamp(path):
+    """Identité d'un fichier (inode, taille, date de modification), None s'il n'existe pas"""
     try:
-        if os.path.exists(STORAGE_FILE):
-            with open(STORAGE_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+class JournalLock:
+    """Verrou consultatif (fcntl.flock) sur `<journal>.lock` : partagé en lecture, exclusif en
+    écriture. Réentrant dans un même processus ; sans effet si fcntl est absent (Windows)."""
+    _held = {}  # fichier de verrou -> [descripteur, profondeur]
+
+    def __init__(self, path, shared=False):
+        self.path = os.path.splitext(path)[0] + '.lock'
+        self.shared = shared
+
+    def __enter__(self):
+        held = JournalLock._held.get(self.path)
+        if held is not None:
+            held[1] += 1
+            return self
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            import fcntl  # import paresseux : absent sous Windows
+            fcntl.flock(fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        except ImportError:
+            pass
+        JournalLock._held[self.path] = [fd, 1]
+        return self
+
+    def __exit__(self, *exc):
+        held = JournalLock._held[self.path]
+        held[1] -= 1
+        if not held[1]:
+            del JournalLock._held[self.path]
+            os.close(held[0])  # libère le verrou
+        return False
+
+def _journal_locked(method):
+    """Décorateur des écritures de JournalHistory : verrou exclusif le temps de l'écriture,
+    puis mémorise l'état du fichier pour reconnaître les écritures des autres processus"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with JournalLock(self.path):
+            result = method(self, *args, **kwargs)
+            self._stamp = _file_stamp(self.path)
+            return result
+    return wrapper
+
+def migrate_legacy_storage(quiet=False):
+    """Migration unique de l'ancien tableau JSON vers le journal"""
+    with open(STORAGE_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_journal(JOURNAL_FILE, data)
+    print(f"🔄 {len(data)} entrées migrées de {STORAGE_FILE} vers {JOURNAL_FILE}", file=sys.stderr if quiet else sys.stdout)
+
+@timed_phase('load')
+def load_data(quiet=False):
+    """Charge les données avec gestion d'erreur sexy (lecture paresseuse).
+    En mode silencieux, rien n'est lu au-delà de ce que demandera l'appelant."""
+    try:
+        if STORAGE_BACKEND == 'sqlite':
+            data = load_sqlite_history(quiet=quiet)
+            if not quiet:
+                print(f"✅ {len(data)} entrées disponibles dans {SQLITE_FILE} !")
+            return data
+        if not os.path.exists(JOURNAL_FILE) and os.path.exists(STORAGE_FILE):
+            migrate_legacy_storage(quiet)
+        if not os.path.exists(JOURNAL_FILE) and restore_snapshot(JOURNAL_FILE):
+            print(f"♻️  Journal absent, restauré depuis {snapshot_path(JOURNAL_FILE)}", file=sys.stderr if quiet else sys.stdout)
+        if os.path.exists(JOURNAL_FILE):
+            data = JournalHistory(JOURNAL_FILE)
+            if data.dead_lines:
+                print("⚠️  Dernière ligne du journal tronquée, elle sera ignorée", file=sys.stderr if quiet else sys.stdout)
+            if not quiet:
                 print(f"✅ {len(data)} entrées chargées avec succès !")
-                return data
+            return data
     except Exception as e:
-        print(f"⚠️  Erreur lors du chargement: {e}")
+        print(f"⚠️  Erreur lors du chargement: {e}", file=sys.stderr if quiet else sys.stdout)
+        if STORAGE_BACKEND != 'sqlite' and os.path.exists(JOURNAL_FILE):
+            try:
+                if restore_snapshot(JOURNAL_FILE):
+                    print(f"♻️  Journal restauré depuis {snapshot_path(JOURNAL_FILE)} "
+                          f"(l'original est gardé dans {JOURNAL_FILE}.corrompu)", file=sys.stderr if quiet else sys.stdout)
+                    return JournalHistory(JOURNAL_FILE)
+            except OSError as e:
+                print(f"❌ Restauration impossible: {e}", file=sys.stderr if quiet else sys.stdout)
     
-    print("🆕 Nouveau fichier de progression créé !")
-    return []
+    if not quiet:
+        print("🆕 Nouveau fichier de progression créé !")
+    return JournalHistory(JOURNAL_FILE)
 
-def save_data(data):
-    """Sauvegarde avec feedback visuel"""
+@timed_phase('save')
+def save_data(data, quiet=False):
+    """Sauvegarde avec feedback visuel (ajout en fin de journal, compaction si besoin)"""
     try:
-        with open(STORAGE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"💾 Données sauvegardées ({len(data)} entrées)")
+        if isinstance(data, LazyHistory):
+            data.save()
+        else:
+            write_journal(JOURNAL_FILE, data)
+        if not quiet:
+            print(f"💾 Données sauvegardées ({len(data)} entrées)")
         return True
     except Exception as e:
         print(f"❌ Erreur de sauvegarde: {e}")
         return False
 
-def get_next_rank(rank):
-    """Obtient le rang suivant"""
+class AutoSaver:
+    """Sauvegarde automatique en arrière-plan : le prompt n'attend jamais le disque.
+    Les demandes rapprochées sont regroupées en une seule écriture ; le thread principal
+    tient `lock` pendant qu'il exécute une commande, le thread d'écriture pendant qu'il sauvegarde."""
+
+    def __init__(self, data):
+        import threading  # import paresseux : inutile aux commandes ponctuelles
+        self.data = data
+        self.lock = threading.RLock()
+        self.saves = 0
+        self._since_snapshot = 0
+        self._dirty = False
+        self._stopping = False
+        self._wakeup = threading.Condition()
+        # SQLite valide déjà chaque ajout, et sa connexion reste attachée au thread principal
+        self._thread = None
+        if not isinstance(data, SqliteHistory):
+            self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+            self._thread.start()
+
+    def request(self):
+        """Demande une sauvegarde (retour immédiat)"""
+        if self._thread is None:
+            save_data(self.data, quiet=True)
+            return
+        with self._wakeup:
+            self._dirty = True
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while not self._dirty and not self._stopping:
+                    self._wakeup.wait()
+                if not self._dirty:
+                    return
+            if not self._stopping:
+                time.sleep(AUTOSAVE_DELAY)  # les ajouts qui suivent partent dans la même écriture
+            with self._wakeup:
+                self._dirty = False
+            with self.lock:
+                if save_data(self.data, quiet=True):
+                    self.saves += 1
+                    self._since_snapshot += 1
+                    if self._since_snapshot >= SNAPSHOT_EVERY:
+                        self.snapshot()
+
+    def snapshot(self):
+        """Met à jour l'instantané de secours du journal (copie atomique)"""
+        if isinstance(self.data, JournalHistory):
+            try:
+                if self.data.write_snapshot():
+                    self._since_snapshot = 0
+            except OSError as e:
+                print(f"⚠️  Instantané impossible: {e}", file=sys.stderr)
+
+    def stop(self):
+        """Vide les sauvegardes en attente puis arrête le thread (à appeler sans tenir `lock`)"""
+        if self._thread is not None:
+            with self._wakeup:
+                self._stopping = True
+                self._wakeup.notify()
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        """Arrêt propre : dernière sauvegarde synchrone et instantané à jour"""
+        self.stop()
+        saved = save_data(self.data)
+        if saved and isinstance(self.data, JournalHistory) and (
+                self._since_snapshot or not os.path.exists(snapshot_path(self.data.path))):
+            self.snapshot()
+        return saved
+
+# Drapeaux des champs présents dans une entrée compacte
+_HAS_LP_CHANGE = 1
+_HAS_KDA = 2
+_HAS_GRADE = 4
+_HAS_NOTE = 8
+_PROMOTE = 16
+_DEMOTE = 32
+_EMPTY_ROW = (0, -1, 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+_DAY_SECONDS = {}  # "AAAA-MM-JJ" -> secondes epoch du jour (None si date invalide)
+
+
+def _day_seconds(day):
+    """Secondes epoch d'un jour "AAAA-MM-JJ", mémorisées (une seule conversion par jour)"""
+    seconds = _DAY_SECONDS.get(day, False)
+    if seconds is False:
+        try:
+            if day[4] != '-' or day[7] != '-' or not (day[0:4] + day[5:7] + day[8:10]).isdigit():
+                raise ValueError(day)
+            seconds = calendar.timegm(datetime(int(day[0:4]), int(day[5:7]), int(day[8:10])).timetuple())
+        except (ValueError, IndexError):
+            seconds = None
+        _DAY_SECONDS[day] = seconds
+    return seconds
+
+
+def parse_timestamp(timestamp):
+    """Convertit un timestamp "%Y-%m-%d %H:%M:%S" en secondes epoch (None si format inattendu)"""
+    if len(timestamp) != 19 or timestamp[10] != ' ' or timestamp[13] != ':' or timestamp[16] != ':':
+        return None
+    day = _day_seconds(timestamp[:10])
+    clock = timestamp[11:13] + timestamp[14:16] + timestamp[17:19]
+    if day is None or not (clock.isdigit() and clock.isascii()):
+        return None
+    hours, minutes, seconds = int(clock[0:2]), int(clock[2:4]), int(clock[4:6])
+    if hours > 23 or minutes > 59 or seconds > 59:
+        return None
+    return day + hours * 3600 + minutes * 60 + seconds
+
+
+def format_timestamp(seconds):
+    """Inverse de parse_timestamp()"""
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(seconds))
+
+
+def _entry_layouts():
+    """Ordres de clés produits par add_entry(), avec les drapeaux correspondants"""
+    layouts = {}
+    for lp_flag in (0, _HAS_LP_CHANGE):
+        for kda_flag in (0, _HAS_KDA):
+            for grade_flag in (0, _HAS_GRADE):
+                for note_flag in (0, _HAS_NOTE):
+                    for move_flag, move_key in ((0, None), (_PROMOTE, 'promote'), (_DEMOTE, 'demote')):
+                        keys = ['timestamp', 'rank']
+                        keys += ['lp_change'] if lp_flag else []
+                        keys += ['lp_total']
+                        keys += ['kills', 'deaths', 'assists'] if kda_flag else []
+                        keys += ['grade'] if grade_flag else []
+                        keys += ['note'] if note_flag else []
+                        keys += [move_key] if move_key else []
+                        layouts[tuple(keys)] = lp_flag | kda_flag | grade_flag | note_flag | move_flag
+    return layouts
+
+
+_ENTRY_LAYOUTS = _entry_layouts()
+
+
+def _pack_entry(entry):
+    """Encode une entrée en valeurs de colonnes, ou None si elle sort du format de add_entry()"""
+    flags = _ENTRY_LAYOUTS.get(tuple(entry))
+    if flags is None:
+        return None
+    try:
+        seconds = parse_timestamp(entry['timestamp'])
+        rank = RANK_ORDINALS.get(entry['rank'])
+        if seconds is None or rank is None:
+            return None
+        lp_change = entry['lp_change'] if flags & _HAS_LP_CHANGE else 0
+        lp_total = entry['lp_total']
+        if flags & _HAS_KDA:
+            kills, deaths, assists = entry['kills'], entry['deaths'], entry['assists']
+        else:
+            kills = deaths = assists = 0
+        grade = GRADE_POINTS.get(entry['grade']) if flags & _HAS_GRADE else 0
+        if grade is None or (flags & _HAS_NOTE and type(entry['note']) is not str):
+            return None
+        move_lp = 0
+        if flags & (_PROMOTE | _DEMOTE):
+            move = entry['promote' if flags & _PROMOTE else 'demote']
+            if type(move) is not dict or tuple(move) != ('to', 'start_lp') or move['to'] != entry['rank']:
+                return None
+            move_lp = move['start_lp']
+    except TypeError:
+        return None
+    if not (type(lp_change) is int and type(lp_total) is int and type(kills) is int
+            and type(deaths) is int and type(assists) is int and type(move_lp) is int):
+        return None
+    if not (-2**31 <= lp_change < 2**31 and -2**31 <= lp_total < 2**31
+            and 0 <= kills < 2**16 and 0 <= deaths < 2**16 and 0 <= assists < 2**16
+            and -2**15 <= move_lp < 2**15):
+        return None
+    return (seconds, rank, lp_change, lp_total, kills, deaths, assists, grade, flags, move_lp)
+
+
+class EntryColumns:
+    """Historique compact en colonnes `array` : rang en ordinal de RANKS, grade en points,
+    timestamp en secondes epoch. Se lit comme la liste de dicts (décodage à la volée)."""
+
+    __slots__ = ('timestamps', 'ranks', 'lp_changes', 'lp_totals', 'kills', 'deaths', 'assists',
+                 'grades', 'flags', 'move_lp', 'notes', 'raw')
+
+    def __init__(self, entries=()):
+        self.timestamps = array('q')
+        self.ranks = array('b')
+        self.lp_changes = array('i')
+        self.lp_totals = array('i')
+        self.kills = array('H')
+        self.deaths = array('H')
+        self.assists = array('H')
+        self.grades = array('b')
+        self.flags = array('B')
+        self.move_lp = array('h')
+        self.notes = {}   # position -> note (rares)
+        self.raw = {}     # position -> dict d'origine, pour les entrées hors format
+        self.extend(entries)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def append(self, entry):
+        packed = _pack_entry(entry)
+        if packed is None:
+            self.raw[len(self.flags)] = entry
+            packed = _EMPTY_ROW
+        seconds, rank, lp_change, lp_total, kills, deaths, assists, grade, flags, move_lp = packed
+        if flags & _HAS_NOTE:
+            self.notes[len(self.flags)] = entry['note']
+        self.timestamps.append(seconds)
+        self.ranks.append(rank)
+        self.lp_changes.append(lp_change)
+        self.lp_totals.append(lp_total)
+        self.kills.append(kills)
+        self.deaths.append(deaths)
+        self.assists.append(assists)
+        self.grades.append(grade)
+        self.move_lp.append(move_lp)
+        self.flags.append(flags)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def splice(self, start, stop, entries):
+        """Remplace les entrées [start:stop] : colonnes découpées, notes et entrées hors format décalées"""
+        replacement = EntryColumns(entries)
+        shift = len(replacement) - (stop - start)
+        for name in self.__slots__:
+            column = getattr(self, name)
+            if isinstance(column, dict):
+                moved = {(index + shift if index >= stop else index): value
+                         for index, value in column.items() if not start <= index < stop}
+                moved.update((index + start, value) for index, value in getattr(replacement, name).items())
+                setattr(self, name, moved)
+            else:
+                column[start:stop] = getattr(replacement, name)
+
+    def entry(self, index):
+        """Reconstruit l'entrée au format JSON (dict)"""
+        if self.raw and index in self.raw:
+            return self.raw[index]
+        flags = self.flags[index]
+        rank = RANKS[self.ranks[index]]
+        entry = {'timestamp': format_timestamp(self.timestamps[index]), 'rank': rank}
+        if flags & _HAS_LP_CHANGE:
+            entry['lp_change'] = self.lp_changes[index]
+        entry['lp_total'] = self.lp_totals[index]
+        if flags & _HAS_KDA:
+            entry['kills'] = self.kills[index]
+            entry['deaths'] = self.deaths[index]
+            entry['assists'] = self.assists[index]
+        if flags & _HAS_GRADE:
+            entry['grade'] = GRADE_BY_POINTS[self.grades[index]]
+        if flags & _HAS_NOTE:
+            entry['note'] = self.notes[index]
+        if flags & _PROMOTE:
+            entry['promote'] = {'to': rank, 'start_lp': self.move_lp[index]}
+        elif flags & _DEMOTE:
+            entry['demote'] = {'to': rank, 'start_lp': self.move_lp[index]}
+        return entry
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.entry(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("index d'historique hors limites")
+        return self.entry(key)
+
+    def __iter__(self):
+        return (self.entry(i) for i in range(len(self)))
+
+    def __reversed__(self):
+        return (self.entry(i) for i in range(len(self) - 1, -1, -1))
+
+
+class LazyHistory:
+    """Historique paresseux : se comporte comme une liste d'entrées sans tout charger"""
+
+    def __init__(self):
+        self._indexes = {}   # index dérivés (classe -> instance), étendus à chaque ajout
+
+    def index(self, index_cls):
+        """Index dérivé, construit au premier usage puis tenu à jour"""
+        idx = self._indexes.get(index_cls)
+        if idx is None:
+            idx = self._indexes[index_cls] = index_cls.build(self)
+        return idx
+
+    def has_index(self, index_cls):
+        return index_cls in self._indexes
+
+    def _notify_append(self, entry):
+        for idx in self._indexes.values():
+            idx.add(entry)
+
+    def _notify_splice(self, start, stop, entries):
+        """Répercute le remplacement de [start:stop] sur les index qui savent le faire (appelé avant
+        la modification de l'historique) ; les autres seront reconstruits au prochain usage"""
+        for index_cls, idx in list(self._indexes.items()):
+            if hasattr(idx, 'splice'):
+                idx.splice(self, start, stop, entries)
+            else:
+                del self._indexes[index_cls]
+
+    def columns(self):
+        """Tout l'historique sous forme compacte"""
+        return EntryColumns(self)
+
+    def refresh(self):
+        """Prend en compte les écritures d'un autre processus (rien à faire par défaut)"""
+        return 0
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def _fetch(self, start, stop):
+        """Retourne les entrées [start:stop] (indices positifs) dans l'ordre"""
+        raise NotImplementedError
+
+    def _iter_range(self, start, stop, reverse=False):
+        """Parcourt les entrées [start:stop] par blocs, sans tout garder en mémoire"""
+        positions = range(start, stop, LAZY_BATCH_SIZE)
+        for block_start in (reversed(positions) if reverse else positions):
+            block = self._fetch(block_start, min(block_start + LAZY_BATCH_SIZE, stop))
+            yield from (reversed(block) if reverse else block)
+
+    def __getitem__(self, key):
+        size = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(size)
+            if step != 1:
+                return list(self._iter_range(0, size))[key]
+            return self._fetch(start, stop) if start < stop else []
+        if key < 0:
+            key += size
+        if not 0 <= key < size:
+            raise IndexError("index d'historique hors limites")
+        return self._fetch(key, key + 1)[0]
+
+    def __iter__(self):
+        return self._iter_range(0, len(self))
+
+    def __reversed__(self):
+        return self._iter_range(0, len(self), reverse=True)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def bulk_extend(self, chunks):
+        """Ajoute des lots d'entrées et les persiste en une seule écriture"""
+        for chunk in chunks:
+            self.extend(chunk)
+        self.save()
+
+    def replace_entries(self, updates):
+        """Remplace des entrées existantes ({position: entrée}) ; les index dérivés sont abandonnés"""
+        raise NotImplementedError
+
+    def splice(self, start, old, new):
+        """Remplace les entrées [start:start+len(old)], qui doivent valoir `old`, par `new`
+        (tout de suite persisté)"""
+        raise NotImplementedError
+
+    def save(self):
+        """Persiste les entrées ajoutées depuis la dernière sauvegarde"""
+        raise NotImplementedError
+
+
+# Colonnes SQLite des champs écrits par add_entry()
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    rank TEXT NOT NULL,
+    lp_change INTEGER,
+    lp_total INTEGER NOT NULL,
+    kills INTEGER,
+    deaths INTEGER,
+    assists INTEGER,
+    grade TEXT,
+    note TEXT,
+    promote_to TEXT,
+    promote_start_lp INTEGER,
+    demote_to TEXT,
+    demote_start_lp INTEGER,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_rank ON entries(rank);
+"""
+SQLITE_COLUMNS = ('timestamp', 'rank', 'lp_change', 'lp_total', 'kills', 'deaths', 'assists',
+                  'grade', 'note', 'promote_to', 'promote_start_lp', 'demote_to', 'demote_start_lp', 'extra')
+SQLITE_FIELDS = ('timestamp', 'rank', 'lp_change', 'lp_total', 'kills', 'deaths', 'assists', 'grade', 'note')
+# Position absolue sur le ladder en SQL (mêmes règles que absolute_lp)
+SQLITE_LADDER_POSITION = (
+    "(CASE WHEN " + " OR ".join(f"instr(rank, '{tier}')" for tier in APEX_TIERS)
+    + f" THEN {MASTER_ORDINAL * 100} ELSE COALESCE(CASE rank "
+    + " ".join(f"WHEN '{rank}' THEN {ordinal * 100}" for ordinal, rank in enumerate(RANKS))
+    + " END, 0) END + lp_total)")
+
+
+def entry_to_row(entry):
+    """Convertit une entrée (dict) en ligne SQLite"""
+    promote = entry.get('promote') or {}
+    demote = entry.get('demote') or {}
+    extra = {k: v for k, v in entry.items() if k not in SQLITE_FIELDS and k not in ('promote', 'demote')}
+    return tuple(entry.get(field) for field in SQLITE_FIELDS) + (
+        promote.get('to'), promote.get('start_lp'),
+        demote.get('to'), demote.get('start_lp'),
+        json.dumps(extra, ensure_ascii=False) if extra else None
+    )
+
+
+def row_to_entry(row):
+    """Reconstruit l'entrée (dict au format JSON) depuis une ligne SQLite"""
+    entry = {field: value for field, value in zip(SQLITE_FIELDS, row) if value is not None}
+    promote_to, promote_start_lp, demote_to, demote_start_lp, extra = row[len(SQLITE_FIELDS):]
+    if promote_to is not None:
+        entry['promote'] = {'to': promote_to, 'start_lp': promote_start_lp}
+    if demote_to is not None:
+        entry['demote'] = {'to': demote_to, 'start_lp': demote_start_lp}
+    if extra:
+        entry.update(json.loads(extra))
+    return entry
+
+
+class SqliteHistory(LazyHistory):
+    """Historique stocké en SQLite : les vues et statistiques sont des requêtes"""
+
+    def __init__(self, path, threaded=False):
+        super().__init__()
+        import sqlite3  # import paresseux : inutile au backend journal
+        self.path = path
+        # threaded : connexion partagée entre threads, l'appelant sérialise les accès (mode serve)
+        self.conn = sqlite3.connect(path, check_same_thread=not threaded)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return self._count
+
+    def _fetch(self, start, stop):
+        columns = ", ".join(SQLITE_COLUMNS)
+        size = len(self)
+        if start >= size - stop:
+            # Fenêtre proche de la fin : on part des derniers ids (cas de l'affichage)
+            rows = self.conn.execute(
+                f"SELECT {columns} FROM entries ORDER BY id DESC LIMIT ? OFFSET ?",
+                (stop - start, size - stop)).fetchall()
+            rows.reverse()
+        else:
+            rows = self.conn.execute(
+                f"SELECT {columns} FROM entries ORDER BY id LIMIT ? OFFSET ?",
+                (stop - start, start)).fetchall()
+        return [row_to_entry(row) for row in rows]
+
+    def _iter_range(self, start, stop, reverse=False):
+        columns = ", ".join(SQLITE_COLUMNS)
+        order = "DESC" if reverse else "ASC"
+        offset = len(self) - stop if reverse else start
+        cursor = self.conn.execute(
+            f"SELECT {columns} FROM entries ORDER BY id {order} LIMIT ? OFFSET ?",
+            (stop - start, offset))
+        while True:
+            rows = cursor.fetchmany(LAZY_BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield row_to_entry(row)
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def _insert(self, entries):
+        placeholders = ", ".join("?" for _ in SQLITE_COLUMNS)
+        self.conn.executemany(
+            f"INSERT INTO entries ({', '.join(SQLITE_COLUMNS)}) VALUES ({placeholders})",
+            (entry_to_row(entry) for entry in entries))
+        if self._count is not None:
+            self._count += len(entries)
+        for entry in entries:
+            self._notify_append(entry)
+
+    def extend(self, entries):
+        with self.conn:
+            self._insert(list(entries))
+
+    def replace_entries(self, updates):
+        assignments = ", ".join(f"{column} = ?" for column in SQLITE_COLUMNS)
+        with self.conn:
+            # Un seul parcours des ids pour retrouver les positions demandées
+            ids = {}
+            for position, (row_id,) in enumerate(self.conn.execute("SELECT id FROM entries ORDER BY id")):
+                if position in updates:
+                    ids[position] = row_id
+            self.conn.executemany(
+                f"UPDATE entries SET {assignments} WHERE id = ?",
+                ((*entry_to_row(entry), ids[position]) for position, entry in updates.items()))
+        self._indexes = {}
+
+    def splice(self, start, old, new):
+        """Les lignes remplacées gardent leur id ; une insertion reprend les ids libres avant
+        l'entrée suivante, ou décale les ids de la fin de table s'il n'y en a pas assez"""
+        stop = start + len(old)
+        if self[start:stop] != old:
+            raise ValueError("historique modifié entre-temps, relancez la commande")
+        self._notify_splice(start, stop, new)
+        columns = ", ".join(SQLITE_COLUMNS)
+        placeholders = ", ".join("?" for _ in SQLITE_COLUMNS)
+        assignments = ", ".join(f"{column} = ?" for column in SQLITE_COLUMNS)
+        with self.conn:
+            first = max(start - 1, 0)
+            ids = [row_id for (row_id,) in self.conn.execute(
+                "SELECT id FROM entries ORDER BY id LIMIT ? OFFSET ?", (stop + 1 - first, first))]
+            span = ids[start - first:stop - first]
+            next_id = ids[stop - first] if len(ids) > stop - first else None
+            kept = min(len(span), len(new))
+            self.conn.executemany(
+                f"UPDATE entries SET {assignments} WHERE id = ?",
+                ((*entry_to_row(entry), row_id) for entry, row_id in zip(new, span)))
+            self.conn.executemany("DELETE FROM entries WHERE id = ?", ((row_id,) for row_id in span[kept:]))
+            extra = new[kept:]
+            if extra:
+                low = span[-1] if span else (ids[0] if start else 0)
+                if next_id is not None and next_id - low <= len(extra):
+                    shift = len(extra) - (next_id - low) + 1
+                    # Deux passes (ids négatifs) pour ne jamais heurter la clé primaire
+                    self.conn.execute("UPDATE entries SET id = -(id + ?) WHERE id >= ?", (shift, next_id))
+                    self.conn.execute("UPDATE entries SET id = -id WHERE id < 0")
+                self.conn.executemany(
+                    f"INSERT INTO entries (id, {columns}) VALUES (?, {placeholders})",
+                    ((low + 1 + offset, *entry_to_row(entry)) for offset, entry in enumerate(extra)))
+        self._count = None
+
+    def bulk_extend(self, chunks):
+        """Tous les lots dans une seule transaction"""
+        with self.conn:
+            for chunk in chunks:
+                self._insert(chunk)
+
+    def save(self):
+        self.conn.commit()
+
+    def basic_stats(self):
+        row = self.conn.execute("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(lp_change), 0),
+                   COALESCE(SUM(lp_change > 0), 0),
+                   COALESCE(SUM(lp_change < 0), 0),
+                   COUNT(promote_to),
+                   COUNT(demote_to),
+                   COALESCE(SUM(CASE WHEN lp_change > 0 THEN lp_change END), 0),
+                   COALESCE(SUM(CASE WHEN lp_change < 0 THEN lp_change END), 0)
+            FROM entries""").fetchone()
+        keys = ('total_games', 'total_lp_gained', 'wins', 'losses', 'promotions', 'demotions', 'lp_won', 'lp_lost')
+        return dict(zip(keys, row))
+
+    def rank_distribution(self):
+        return self.conn.execute("""
+            SELECT rank, COUNT(*) FROM entries
+            GROUP BY rank ORDER BY COUNT(*) DESC, MIN(id)""").fetchall()
+
+    def kda_stats(self):
+        row = self.conn.execute("""
+            SELECT COUNT(*), SUM(kills), SUM(deaths), SUM(assists),
+                   MAX((kills + assists) * 1.0 / MAX(deaths, 1)),
+                   MIN((kills + assists) * 1.0 / MAX(deaths, 1)),
+                   SUM(kills >= 15)
+            FROM entries WHERE kills IS NOT NULL""").fetchone()
+        games_count, total_kills, total_deaths, total_assists, best_kda, worst_kda, exceptional = row
+        if not games_count:
+            return None
+        avg_kills = total_kills / games_count
+        avg_deaths = total_deaths / games_count
+        avg_assists = total_assists / games_count
+        return {
+            'games_count': games_count,
+            'avg_kills': avg_kills,
+            'avg_deaths': avg_deaths,
+            'avg_assists': avg_assists,
+            'avg_kda': (avg_kills + avg_assists) / max(avg_deaths, 0.1),
+            'total_kills': total_kills,
+            'total_deaths': total_deaths,
+            'total_assists': total_assists,
+            'best_kda': best_kda,
+            'worst_kda': worst_kda,
+            'exceptional_games': exceptional
+        }
+
+    def streaks(self):
+        """Séries de victoires/défaites (mêmes règles que next_streak) : chaque série est un
+        groupe de games consécutives de même résultat (différence de deux ROW_NUMBER)"""
+        row = self.conn.execute("""
+            WITH games AS (
+                SELECT id, CASE WHEN demote_to IS NOT NULL THEN -1
+                                WHEN promote_to IS NOT NULL THEN 1
+                                WHEN lp_change > 0 THEN 1
+                                WHEN lp_change < 0 THEN -1 END AS outcome
+                FROM entries),
+            runs AS (
+                SELECT outcome, COUNT(*) AS length, MAX(id) AS last_id
+                FROM (SELECT id, outcome,
+                             ROW_NUMBER() OVER (ORDER BY id)
+                             - ROW_NUMBER() OVER (PARTITION BY outcome ORDER BY id) AS run
+                      FROM games WHERE outcome IS NOT NULL)
+                GROUP BY outcome, run)
+            SELECT outcome, length,
+                   MAX(CASE WHEN outcome > 0 THEN length END) OVER (),
+                   MAX(CASE WHEN outcome < 0 THEN length END) OVER ()
+            FROM runs ORDER BY last_id DESC LIMIT 1""").fetchone()
+        if row is None:
+            return {"current": 0, "best_win": 0, "worst_lose": 0, "type": "none"}
+        outcome, length, best_win, worst_lose = row
+        return {"current": length, "best_win": best_win or 0, "worst_lose": worst_lose or 0,
+                "type": "win" if outcome > 0 else "lose"}
+
+    def peak(self):
+        """Entrée la plus haute sur le ladder (la première en cas d'égalité), None si vide"""
+        row = self.conn.execute(
+            f"SELECT rank, lp_total FROM entries ORDER BY {SQLITE_LADDER_POSITION} DESC, id LIMIT 1").fetchone()
+        return {'rank': row[0], 'lp_total': row[1]} if row else None
+
+    def grade_counts(self):
+        rows = self.conn.execute("""
+            SELECT grade, COUNT(*) FROM entries
+            WHERE grade IS NOT NULL AND grade != 'N/A'
+            GROUP BY grade ORDER BY MIN(id)""").fetchall()
+        return dict(rows)
+
+
+class JournalHistory(LazyHistory):
+    """Historique adossé au journal JSONL : les entrées sont décodées à la demande,
+    en lisant le fichier à rebours pour les fenêtres récentes"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._pending = []       # entrées ajoutées pas encore écrites
+        self._reset_view()
+
+    def _reset_view(self):
+        """(Re)lit l'état du fichier ; les entrées en attente sont conservées"""
+        self._indexes = {}
+        self.dead_lines = 0
+        self._entries = None     # historique complet, seulement si un parcours total a eu lieu
+        self._offsets = None     # début de chaque ligne, construit pour l'accès aléatoire
+        self._count = None       # nombre d'entrées dans le fichier
+        self._cache = {}         # entrées déjà décodées, par position
+        self._stats = None       # statistiques agrégées (cache persistant)
+        self._crc = 0            # CRC32 des octets du journal couverts par les statistiques
+        self._stamp = _file_stamp(self.path)  # pour détecter les écritures d'un autre processus
+        self._size = self._stamp[1] if self._stamp else 0
+        if self._size:
+            with open(self.path, 'rb') as f:
+                f.seek(self._size - 1)
+                if f.read(1) != b"\n":
+                    # Ligne tronquée en fin de fichier : on l'exclut de la lecture
+                    self.dead_lines = 1
+                    self._size = self._complete_size(f)
+
+    def _complete_size(self, f):
+        """Position juste après le dernier saut de ligne du fichier"""
+        pos = self._size
+        while pos > 0:
+            start = max(0, pos - JOURNAL_BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(pos - start)
+            idx = block.rfind(b"\n")
+            if idx >= 0:
+                return start + idx + 1
+            pos = start
+        return 0
+
+    def _file_count(self):
+        if not self._size:
+            return 0
+        if self._count is None:
+            # Le cache de statistiques connaît le nombre de lignes : pas de relecture du journal
+            self._count = cached_line_count(self.path, self._size)
+        if self._count is None:
+            count = 0
+            remaining = self._size
+            with open(self.path, 'rb') as f:
+                while remaining > 0:
+                    block = f.read(min(JOURNAL_BLOCK_SIZE, remaining))
+                    count += block.count(b"\n")
+                    remaining -= len(block)
+            self._count = count
+        return self._count
+
+    def __len__(self):
+        if self._entries is not None:
+            return len(self._entries)
+        return self._file_count() + len(self._pending)
+
+    def _decode(self, raw_lines, first_index):
+        """Décode des lignes brutes ; une ligne invalide bascule en chargement validé"""
+        entries = []
+        for offset, raw in enumerate(raw_lines):
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                entry = None
+            if not isinstance(entry, dict):
+                self._materialize()
+                return None
+            entries.append(entry)
+            self._cache[first_index + offset] = entry
+        return entries
+
+    def _tail_lines(self, count):
+        """Lit les `count` dernières lignes du fichier, par blocs depuis la fin"""
+        chunks = []
+        newlines = 0
+        pos = self._size
+        with open(self.path, 'rb') as f:
+            while pos > 0 and newlines <= count:
+                start = max(0, pos - JOURNAL_BLOCK_SIZE)
+                f.seek(start)
+                block = f.read(pos - start)
+                newlines += block.count(b"\n")
+                chunks.append(block)
+                pos = start
+        lines = b"".join(reversed(chunks)).split(b"\n")[:-1]
+        return lines[-count:] if count else []
+
+    def _build_offsets(self):
+        """Indexe le début de chaque ligne (un seul passage sur les octets bruts)"""
+        offsets = array('Q')
+        base = 0
+        line_start = 0
+        with open(self.path, 'rb') as f:
+            remaining = self._size
+            while remaining > 0:
+                block = f.read(min(JOURNAL_BLOCK_SIZE, remaining))
+                idx = block.find(b"\n")
+                while idx >= 0:
+                    offsets.append(line_start)
+                    line_start = base + idx + 1
+                    idx = block.find(b"\n", idx + 1)
+                base += len(block)
+                remaining -= len(block)
+        self._offsets = offsets
+        self._count = len(offsets)
+
+    def _read_file_range(self, start, stop):
+        """Décode les entrées [start:stop] du fichier"""
+        if all(i in self._cache for i in range(start, stop)):
+            return [self._cache[i] for i in range(start, stop)]
+        file_count = self._file_count()
+        if stop == file_count and self._offsets is None:
+            raw_lines = self._tail_lines(stop - start)
+        else:
+            if self._offsets is None:
+                self._build_offsets()
+            begin = self._offsets[start]
+            end = self._offsets[stop] if stop < len(self._offsets) else self._size
+            with open(self.path, 'rb') as f:
+                f.seek(begin)
+                raw_lines = f.read(end - begin).split(b"\n")[:-1]
+        if len(self._cache) > JOURNAL_CACHE_SIZE:
+            self._cache.clear()
+        return self._decode(raw_lines, start)
+
+    def _fetch(self, start, stop):
+        if self._entries is not None:
+            return self._entries[start:stop]
+        file_count = self._file_count()
+        entries = []
+        if start < file_count:
+            entries = self._read_file_range(start, min(stop, file_count))
+            if entries is None:
+                # Ligne corrompue rencontrée : l'historique a été rechargé et validé
+                return self._entries[start:stop]
+        if stop > file_count:
+            entries = entries + self._pending[max(start - file_count, 0):stop - file_count]
+        return entries
+
+    @timed_phase('parse')
+    def _materialize(self):
+        """Charge tout l'historique (en ignorant les lignes corrompues)"""
+        stats = {'dead_lines': 0}
+        entries = EntryColumns(_iter_journal(self.path, stats) if self._size else ())
+        self.dead_lines = max(self.dead_lines, stats['dead_lines'])
+        recovered = 0
+        if stats['dead_lines'] and os.path.exists(snapshot_path(self.path)):
+            # Lignes corrompues : les entrées perdues sont reprises du dernier instantané
+            merged, recovered = merge_by_timestamp(entries, _iter_journal(snapshot_path(self.path)))
+            if recovered:
+                entries = EntryColumns(merged)
+                print(f"♻️  {recovered} entrées corrompues récupérées depuis {snapshot_path(self.path)}",
+                      file=sys.stderr)
+        self._count = len(entries)
+        entries.extend(self._pending)
+        self._entries = entries
+        self._cache.clear()
+        if recovered:
+            # Le fichier ne correspond plus à l'historique : état dérivé recalculé, compaction à la sauvegarde
+            acc = StatsAccumulator()
+            for entry in entries:
+                acc.add(entry)
+            self._stats = acc
+            self._indexes = {}
+
+    def __iter__(self):
+        if self._entries is None:
+            self._materialize()
+        return iter(self._entries)
+
+    def append(self, entry):
+        self._pending.append(entry)
+        if self._entries is not None:
+            self._entries.append(entry)
+        if self._stats is not None:
+            self._stats.add(entry)
+        self._notify_append(entry)
+
+    def columns(self):
+        if self._entries is None:
+            self._materialize()
+        return self._entries
+
+    def stats(self):
+        """Statistiques agrégées, tenues à jour à chaque ajout (voir load_stats_cache)"""
+        if self._stats is None:
+            self._stats, self._crc = load_stats_cache(self.path, self._size)
+            for entry in self._pending:
+                self._stats.add(entry)
+        return self._stats
+
+    def _file_changed(self):
+        """'append' si un autre processus a ajouté des lignes au journal depuis notre dernière
+        lecture, 'rewrite' s'il l'a réécrit (compaction, import), None sinon"""
+        stamp = _file_stamp(self.path)
+        if stamp == self._stamp:
+            return None
+        if stamp and self._stamp and stamp[0] == self._stamp[0] and stamp[1] > self._stamp[1] \
+                and not self.dead_lines:
+            return 'append'
+        return 'rewrite'
+
+    def _absorb_appends(self):
+        """Intègre les lignes ajoutées par un autre processus ; None si elles sont incomplètes
+        ou corrompues (le journal est alors relu entièrement)"""
+        with open(self.path, 'rb') as f:
+            f.seek(self._size)
+            payload = f.read()
+        if not payload.endswith(b"\n"):
+            return None
+        try:
+            entries = [json.loads(line) for line in payload.split(b"\n")[:-1]]
+        except ValueError:
+            return None
+        file_count = self._file_count()
+        self._count = file_count + len(entries)
+        self._size += len(payload)
+        self._crc = zlib.crc32(payload, self._crc)
+        self._stamp = _file_stamp(self.path)
+        self._offsets = None
+        self._entries = None
+        self._stats = None
+        self._indexes = {}
+        return entries
+
+    def refresh(self):
+        """Prend en compte les écritures d'un autre terminal. Retourne le nombre d'entrées
+        apparues (-1 si le journal a été réécrit)."""
+        if self._pending:
+            return 0  # la prochaine sauvegarde fusionnera
+        with JournalLock(self.path, shared=True):
+            change = self._file_changed()
+            if change is None:
+                return 0
+            if change == 'append':
+                entries = self._absorb_appends()
+                if entries is not None:
+                    return len(entries)
+            self._reset_view()
+            return -1
+
+    def _merge_pending(self, change):
+        """Fusionne nos entrées en attente avec les écritures d'un autre processus (sous verrou).
+        Cas courant : nos entrées restent les plus récentes et sont seulement re-chaînées
+        (rang, LP totaux) sur la dernière entrée du fichier, avant l'ajout normal.
+        Sinon le journal est réécrit en flux, trié par timestamp."""
+        pending = self._pending
+        if change != 'append' or self._absorb_appends() is None:
+            self._reset_view()
+        file_count = self._file_count()
+        last = self._read_file_range(file_count - 1, file_count)[0] if file_count else None
+        if last is None or entry_seconds(pending[0]) > entry_seconds(last):
+            previous = last
+            for position, entry in enumerate(pending):
+                if previous is not None:
+                    pending[position] = rechain_entry(entry, previous)
+                previous = pending[position]
+            print(f"🔀 Journal modifié par un autre terminal : {len(pending)} entrée(s) re-chaînée(s)")
+            return False
+        acc = StatsAccumulator()
+        
+        def entries():
+            for entry in merge_chronological(_iter_journal(self.path), pending):
+                acc.add(entry)
+                yield entry
+        
+        count = write_journal(self.path, entries())
+        self._pending = []
+        self._reset_view()
+        self._count = count
+        self._stats = acc
+        self._crc = _journal_crc(self.path, self._size)
+        save_stats_cache(self.path, self._size, self._crc, acc, count)
+        self._refresh_snapshot()
+        print(f"🔀 Journal modifié par un autre terminal : {len(pending)} entrée(s) fusionnée(s) par date")
+        return True
+
+    @_journal_locked
+    def save(self):
+        change = self._file_changed()
+        if change is not None:
+            if self._pending:
+                if self._merge_pending(change):
+                    return
+            elif change == 'rewrite' or self._absorb_appends() is None:
+                self._reset_view()
+        if self.dead_lines:
+            self.compact()
+        elif self._pending:
+            stats = self.stats()
+            file_count = self._file_count()
+            payload = "".join(_journal_line(entry) for entry in self._pending).encode('utf-8')
+            with open(self.path, 'ab') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._count = file_count + len(self._pending)
+            self._pending = []
+            self._offsets = None
+            self._size += len(payload)
+            self._crc = zlib.crc32(payload, self._crc)
+            save_stats_cache(self.path, self._size, self._crc, stats, self._count)
+
+    @_journal_locked
+    def bulk_extend(self, chunks):
+        """Écrit les lots dans un fichier temporaire puis les ajoute au journal d'un seul
+        bloc (tout ou rien) : aucune entrée n'est gardée en attente en mémoire"""
+        self.save()
+        stats = self.stats()
+        file_count = self._file_count()
+        tmp_path = self.path + '.import'
+        crc = self._crc
+        added = 0
+        try:
+            with open(tmp_path, 'wb') as tmp:
+                for chunk in chunks:
+                    payload = "".join(_journal_line(entry) for entry in chunk).encode('utf-8')
+                    tmp.write(payload)
+                    crc = zlib.crc32(payload, crc)
+                    for entry in chunk:
+                        stats.add(entry)
+                        if self._entries is not None:
+                            self._entries.append(entry)
+                        self._notify_append(entry)
+                    added += len(chunk)
+            if added:
+                with open(tmp_path, 'rb') as tmp, open(self.path, 'ab') as f:
+                    while True:
+                        block = tmp.read(JOURNAL_BLOCK_SIZE)
+                        if not block:
+                            break
+                        f.write(block)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except BaseException:
+            # Import abandonné : l'état dérivé en mémoire est recalculé à la demande
+            self._stats = None
+            self._entries = None
+            self._indexes = {}
+            raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if added:
+            self._count = file_count + added
+            self._offsets = None
+            self._size = os.path.getsize(self.path)
+            self._crc = crc
+            save_stats_cache(self.path, self._size, self._crc, stats, self._count)
+
+    @_journal_locked
+    def replace_entries(self, updates):
+        """Réécrit le journal avec les entrées remplacées (lecture en flux si l'historique
+        n'est pas chargé) et recalcule les statistiques au passage"""
+        self.save()
+        acc = StatsAccumulator()
+        source = self._entries if self._entries is not None else _iter_journal(self.path)
+        
+        def entries():
+            for position, entry in enumerate(source):
+                entry = updates.get(position, entry)
+                acc.add(entry)
+                yield entry
+        
+        self._count = write_journal(self.path, entries())
+        self._entries = None
+        self._offsets = None
+        self._cache.clear()
+        self._indexes = {}
+        self._size = os.path.getsize(self.path)
+        self.dead_lines = 0
+        self._stats = acc
+        self._crc = _journal_crc(self.path, self._size)
+        save_stats_cache(self.path, self._size, self._crc, acc, self._count)
+        self._refresh_snapshot()
+
+    @_journal_locked
+    def splice(self, start, old, new):
+        """Seules les lignes remplacées sont encodées : le reste du journal est recopié octet
+        par octet. Statistiques et index sont mis à jour à partir des entrées voisines."""
+        self.save()
+        stop = start + len(old)
+        if self[start:stop] != old:
+            raise ValueError("historique modifié entre-temps, relancez la commande")
+        stats = self.stats()
+        before, _ = streak_run(self, start - 1, -1)
+        after, at_end = streak_run(self, stop, 1)
+        count = self._file_count()
+        if self._offsets is None:
+            self._build_offsets()
+        begin = self._offsets[start] if start < count else self._size
+        end = self._offsets[stop] if stop < count else self._size
+        payload = "".join(_journal_line(entry) for entry in new).encode('utf-8')
+        try:
+            self._notify_splice(start, stop, new)
+            self._size, self._crc = splice_journal(self.path, begin, end, payload, self._size)
+        except BaseException:
+            # Écriture abandonnée : l'état dérivé en mémoire est recalculé à la demande
+            self._stats = None
+            self._entries = None
+            self._indexes = {}
+            raise
+        self._count = count + len(new) - len(old)
+        self._offsets = None
+        self._cache.clear()
+        if self._entries is not None:
+            self._entries.splice(start, stop, new)
+        if not stats.replace(old, new, before, after, at_end):
+            # Un record a disparu avec les entrées remplacées : recomptage complet
+            stats = StatsAccumulator()
+            if self._entries is not None:
+                stats.add_all(self._entries)
+            else:
+                _scan_journal_stats(self.path, 0, self._size, stats, 0)
+            self._stats = stats
+        save_stats_cache(self.path, self._size, self._crc, stats, self._count)
+        self._refresh_snapshot()
+
+    def write_snapshot(self):
+        """Copie le journal écrit vers son instantané, s'il ne contient aucune ligne corrompue"""
+        if self.dead_lines or self._pending or not self._size:
+            return False
+        with JournalLock(self.path, shared=True):
+            if self._file_changed():
+                return False
+            copy_journal(self.path, snapshot_path(self.path), self._size)
+        return True
+
+    def _refresh_snapshot(self):
+        """Après une réécriture (sous verrou) : un instantané périmé réintroduirait à la prochaine
+        reprise les games corrigées ou supprimées, il est donc recopié (ou supprimé si le journal
+        contient des lignes corrompues)"""
+        snapshot = snapshot_path(self.path)
+        if not os.path.exists(snapshot):
+            return
+        if self.dead_lines or not self._size:
+            os.remove(snapshot)
+        else:
+            copy_journal(self.path, snapshot, self._size)
+
+    @_journal_locked
+    def compact(self):
+        """Réécrit le journal sans lignes mortes (gardées à part, voir corrupt_lines_path)"""
+        if self._entries is None:
+            self._materialize()
+        kept = keep_corrupt_lines(self.path)
+        if kept:
+            print(f"⚠️  {kept} ligne(s) corrompue(s) retirée(s) du journal, gardées dans {corrupt_lines_path(self.path)}",
+                  file=sys.stderr)
+        write_journal(self.path, self._entries)
+        self._pending = []
+        self._offsets = None
+        self._count = len(self._entries)
+        self._size = os.path.getsize(self.path)
+        self.dead_lines = 0
+        if self._stats is not None:
+            self._crc = _journal_crc(self.path, self._size)
+            save_stats_cache(self.path, self._size, self._crc, self._stats, self._count)
+
+
+def stats_cache_path(path):
+    """Fichier annexe du cache de statistiques d'un journal"""
+    return os.path.splitext(path)[0] + '.stats.json'
+
+def _journal_crc(path, size):
+    """CRC32 des `size` premiers octets du journal"""
+    crc = 0
+    with open(path, 'rb') as f:
+        remaining = size
+        while remaining > 0:
+            block = f.read(min(JOURNAL_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            remaining -= len(block)
+    return crc
+
+def _scan_journal_stats(path, start, end, acc, crc):
+    """Intègre les lignes du journal entre deux positions dans l'accumulateur (et le CRC).
+    Retourne le CRC et le nombre de lignes lues."""
+    carry = b""
+    count = 0
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(JOURNAL_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            crc = zlib.crc32(block, crc)
+            lines = (carry + block).split(b"\n")
+            carry = lines.pop()
+            count += len(lines)
+            for raw in lines:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    acc.add(entry)
+    return crc, count
+
+@timed_phase('stats_cache')
+def load_stats_cache(path, size):
+    """Charge le cache de statistiques s'il correspond au journal, sinon le reconstruit.
+    Si seule la fin du journal est nouvelle (CRC du début inchangé), seule la fin est relue."""
+    if not size:
+        return StatsAccumulator(), 0
+    try:
+        with open(stats_cache_path(path), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == STATS_CACHE_VERSION and cache['size'] <= size:
+            acc = StatsAccumulator.from_dict(cache['stats'])
+            if cache['size'] == size and cache['mtime_ns'] == os.stat(path).st_mtime_ns:
+                return acc, cache['crc']
+            if _journal_crc(path, cache['size']) == cache['crc']:
+                crc, _ = _scan_journal_stats(path, cache['size'], size, acc, cache['crc'])
+                return acc, crc
+        print("♻️  Cache de statistiques périmé (journal modifié), reconstruction...", file=sys.stderr)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    acc = StatsAccumulator()
+    crc, lines = _scan_journal_stats(path, 0, size, acc, 0)
+    save_stats_cache(path, size, crc, acc, lines)
+    return acc, crc
+
+def cached_line_count(path, size):
+    """Nombre de lignes du journal d'après le cache, s'il décrit exactement le fichier actuel"""
     try:
-        idx = RANKS.index(rank)
-        return RANKS[idx + 1] if idx + 1 < len(RANKS) else rank
+        with open(stats_cache_path(path), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if (cache.get('version') == STATS_CACHE_VERSION and cache['size'] == size
+                and cache['mtime_ns'] == os.stat(path).st_mtime_ns):
+            return cache.get('lines')
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def save_stats_cache(path, size, crc, acc, lines=None):
+    """Écrit le cache de statistiques (remplacement atomique), avec le nombre de lignes
+    du journal quand il est connu"""
+    cache_path = stats_cache_path(path)
+    cache = {
+        'version': STATS_CACHE_VERSION,
+        'size': size,
+        'mtime_ns': os.stat(path).st_mtime_ns,
+        'crc': crc,
+        'stats': acc.to_dict()
+    }
+    if lines is not None:
+        cache['lines'] = lines
+    try:
+        with open(cache_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(cache_path + '.tmp', cache_path)
+    except OSError:
+        pass  # Le cache est facultatif : il sera reconstruit au prochain lancement
+
+
+def _iter_entries_file(path):
+    """Lit un fichier d'entrées JSON (tableau) ou JSONL"""
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def import_data(data, path, quiet=False):
+    """Importe des entrées depuis un fichier JSON ou JSONL"""
+    before = len(data)
+    data.extend(_iter_entries_file(path))
+    print(f"📥 {len(data) - before} entrées importées depuis {path}", file=sys.stderr if quiet else sys.stdout)
+    return data
+
+
+IMPORT_CHUNK_SIZE = 10000               # Lignes validées par lot lors d'un import en masse
+
+def normalize_timestamp(text):
+    """Timestamp d'une ligne importée : secondes epoch et texte au format du tracker
+    (ISO 8601 accepté, converti en heure locale s'il porte un fuseau)"""
+    if not isinstance(text, str):
+        raise ValueError("timestamp", f"timestamp manquant ou invalide: {text!r}")
+    seconds = parse_timestamp(text)
+    if seconds is not None:
+        return seconds, text
+    try:
+        moment = datetime.fromisoformat(text.strip())
     except ValueError:
+        raise ValueError("timestamp", f"timestamp invalide '{text}'")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    seconds = datetime_seconds(moment)
+    return seconds, format_timestamp(seconds)
+
+def _row_int(row, key, minimum=None):
+    value = row.get(key)
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValueError(key, f"{key} invalide '{value}'")
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(key, f"{key} manquant ou invalide: {value!r}")
+    if minimum is not None and value < minimum:
+        raise ValueError(key, f"{key} doit être >= {minimum}")
+    return value
+
+def carried_start_lp(change, lp_total):
+    """LP de départ par défaut après un changement de division : les LP en trop sont reportés
+    dans la division suivante, les LP manquants retirés de la division inférieure"""
+    return lp_total - 100 if change == 'promote' else 100 + lp_total
+
+def import_row_fields(row):
+    """Valide une ligne importée (mêmes grades que add_entry(), KDA entiers positifs) ;
+    le rang et les LP totaux sont calculés ensuite par import_row_entry()"""
+    seconds, timestamp = normalize_timestamp(row.get('timestamp'))
+    lp_change = _row_int(row, 'lp_change')
+    grade = str(row.get('grade', '')).strip()
+    if grade not in GRADE_ORDER:
+        raise ValueError("grade", f"grade invalide '{grade}'")
+    if row.get('kda'):
+        try:
+            kills, deaths, assists = parse_kda(str(row['kda']).strip())
+        except ValueError as e:
+            raise ValueError("kda", str(e))
+    else:
+        kills = _row_int(row, 'kills', 0)
+        deaths = _row_int(row, 'deaths', 0)
+        assists = _row_int(row, 'assists', 0)
+    start_lp = None
+    if row.get('start_lp') not in (None, ''):
+        start_lp = _row_int(row, 'start_lp', 0)
+    return {'seconds': seconds, 'timestamp': timestamp, 'lp_change': lp_change, 'grade': grade,
+            'kda': (kills, deaths, assists), 'note': str(row.get('note') or '').strip(), 'start_lp': start_lp}
+
+def import_row_entry(fields, state):
+    """Construit l'entrée d'une ligne validée comme add_entry() (promotions/démotions selon le
+    ladder) à partir du rang et des LP de `state`, mis à jour si la ligne est acceptée"""
+    entry = make_entry(state['rank'], state['lp'], fields['lp_change'], fields['grade'], *fields['kda'],
+                       fields['note'], fields['timestamp'])
+    change = rank_change_available(state['rank'], entry['lp_total'])
+    if change:
+        start_lp = fields['start_lp']
+        if start_lp is None:
+            start_lp = carried_start_lp(change, entry['lp_total'])
+        if not 0 <= start_lp <= 100:
+            raise ValueError("start_lp", f"LP de départ hors limites ({start_lp})")
+        apply_rank_change(entry, state['lp'], change, start_lp)
+    state['rank'] = entry['rank']
+    state['lp'] = entry['lp_total']
+    return entry
+
+def import_key(fields):
+    """Une game importée est un doublon si une game du même instant a le même résultat"""
+    return fields['seconds'], (fields['lp_change'] > 0) - (fields['lp_change'] < 0)
+
+def known_game(data, key):
+    """La game (timestamp, résultat) est-elle déjà dans l'historique ?"""
+    seconds, outcome = key
+    position = find_position_by_time(data, seconds)
+    while position < len(data):
+        entry = data[position]
+        if entry_seconds(entry) != seconds:
+            return False
+        if game_outcome(entry) == outcome:
+            return True
+        position += 1
+    return False
+
+def backfill_entries(data, rows, reject, start_rank=None, start_lp=0):
+    """Insère à leur place des lignes validées (numéro, ligne brute, champs) antérieures à la fin
+    de l'historique : les entrées suivantes sont re-chaînées (rang, LP totaux) jusqu'à retomber
+    sur le chaînage enregistré. Avant la première entrée, le chaînage part du rang initial donné,
+    sinon de l'état qui précédait cette première game. Une ligne invalide à sa place (LP de départ)
+    est passée à `reject` sans bloquer les autres. Retourne les lignes insérées."""
+    rows = sorted(rows, key=lambda row: row[2]['seconds'])
+    first_seconds = rows[0][2]['seconds']
+    position = find_position_by_time(data, first_seconds)
+    while position < len(data) and entry_seconds(data[position]) <= first_seconds:
+        position += 1  # après les games du même instant
+    if position:
+        previous = data[position - 1]
+        state = {'rank': previous['rank'], 'lp': previous['lp_total']}
+    elif start_rank in RANK_ORDINALS:
+        state = {'rank': start_rank, 'lp': start_lp}
+    else:
+        first = data[0]
+        state = {'rank': first['rank'], 'lp': first['lp_total'] - first.get('lp_change', 0)}
+        if 'promote' in first:
+            state = {'rank': get_prev_rank(first['rank']), 'lp': 100 + state['lp']}
+        elif 'demote' in first:
+            state = {'rank': get_next_rank(first['rank']), 'lp': 0}
+    total = len(data)
+    cursor = position
+    new = []
+    inserted = []
+    previous = None
+    for line_no, row, fields in rows:
+        # Les entrées existantes plus anciennes que la ligne sont re-chaînées au passage
+        for entry in data[cursor:find_position_by_time(data, fields['seconds'] + 1)] if cursor < total else ():
+            previous = rechain_entry(entry, previous) if previous is not None else entry
+            new.append(previous)
+            state = {'rank': previous['rank'], 'lp': previous['lp_total']}
+            cursor += 1
+        try:
+            previous = import_row_entry(fields, state)
+        except ValueError as e:
+            reject(line_no, row, e)
+            continue
+        new.append(previous)
+        inserted.append((line_no, row, fields))
+    if not inserted:
+        return inserted
+    if not cursor and total:
+        new.append(rechain_entry(data[0], previous))  # sert de référence au re-chaînage suivant
+        cursor = 1
+    old, new = rechain_following(data, position, new, cursor - position)
+    splice_history(data, position, old, new)
+    return inserted
+
+def _iter_import_rows(path):
+    """Lignes brutes d'un fichier CSV (avec en-tête) ou JSONL : (numéro de ligne, dict ou erreur)"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            import csv
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_no, row if isinstance(row, dict) else ValueError("json", f"ligne JSON invalide: {line[:80]}")
+
+def rejects_path(path):
+    """Rapport des lignes rejetées d'un import"""
+    return os.path.splitext(path)[0] + '.rejets.csv'
+
+def bulk_import(data, path, start_rank=None, start_lp=0):
+    """Import en masse d'un journal de games (CSV ou JSONL) : lecture et validation par lots,
+    LP et promotions recalculés, doublons écartés, rapport des rejets. Les games plus récentes
+    que l'historique sont ajoutées en une seule écriture (mémoire indépendante du nombre de
+    lignes) ; les plus anciennes sont gardées de côté puis insérées à leur place."""
+    import csv
+    if data:
+        last = data[-1]
+        state = {'rank': last['rank'], 'lp': last['lp_total']}
+        last_seconds = entry_seconds(last)
+    elif start_rank in RANK_ORDINALS:
+        state = {'rank': start_rank, 'lp': start_lp}
+        last_seconds = -1
+    else:
+        raise ValueError("historique vide : rang initial requis (ex: 'Silver II')")
+    
+    accepted = 0
+    rejected = {}
+    backfill = []
+    backfill_keys = set()
+    rejected_lines = set()
+    tail_keys = set()   # (timestamp, résultat) des games importées à la seconde `last_seconds`
+    report = rejects_path(path)
+    with open(report, 'w', encoding='utf-8', newline='') as out:
+        writer = csv.writer(out)
+        writer.writerow(['ligne', 'raison', 'contenu'])
+        
+        def reject(line_no, row, error):
+            rejected_lines.add(line_no)
+            reason, detail = error.args if len(error.args) == 2 else ("valeur", str(error))
+            rejected[reason] = rejected.get(reason, 0) + 1
+            writer.writerow([line_no, detail, json.dumps(row, ensure_ascii=False) if isinstance(row, dict) else ''])
+        
+        def chunks():
+            nonlocal accepted, last_seconds
+            chunk = []
+            for line_no, row in _iter_import_rows(path):
+                try:
+                    if isinstance(row, ValueError):
+                        raise row
+                    fields = import_row_fields(row)
+                    key = import_key(fields)
+                    if key in tail_keys or key in backfill_keys:
+                        raise ValueError("doublon", f"game déjà importée ({fields['timestamp']})")
+                    if fields['seconds'] < last_seconds:
+                        backfill.append((line_no, row, fields))
+                        backfill_keys.add(key)
+                        continue
+                    if fields['seconds'] == last_seconds and known_game(data, key):
+                        raise ValueError("doublon", f"game déjà présente ({fields['timestamp']})")
+                    chunk.append(import_row_entry(fields, state))
+                    if fields['seconds'] > last_seconds:
+                        tail_keys.clear()
+                        last_seconds = fields['seconds']
+                    tail_keys.add(key)
+                except ValueError as e:
+                    reject(line_no, row, e)
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    accepted += len(chunk)
+                    yield chunk
+                    chunk = []
+            if chunk:
+                accepted += len(chunk)
+                yield chunk
+        
+        if isinstance(data, LazyHistory):
+            data.bulk_extend(chunks())
+        else:
+            for chunk in chunks():
+                data.extend(chunk)
+        
+        rows = []
+        for line_no, row, fields in backfill:
+            if known_game(data, import_key(fields)):
+                reject(line_no, row, ValueError("doublon", f"game déjà présente ({fields['timestamp']})"))
+            else:
+                rows.append((line_no, row, fields))
+        inserted = 0
+        if rows:
+            try:
+                inserted = len(backfill_entries(data, rows, reject, start_rank, start_lp))
+            except ValueError as e:
+                # Écriture refusée (historique modifié entre-temps) : aucune ligne n'a été insérée
+                for line_no, row, fields in rows:
+                    if line_no not in rejected_lines:
+                            reject(line_no, row, ValueError("insertion", f"insertion impossible: {e.args[-1]}"))
+            accepted += inserted
+    
+    total_rejected = sum(rejected.values())
+    print(f"📥 {accepted} games importées depuis {path}" + (f" (dont {inserted} insérées dans l'historique)" if inserted else ""))
+    if total_rejected:
+        details = ", ".join(f"{reason}: {count}" for reason, count in sorted(rejected.items()))
+        print(f"⚠️  {total_rejected} lignes rejetées ({details}) → {report}")
+    else:
+        os.remove(report)
+    return accepted, total_rejected
+
+# Import hors ligne d'exports match-v5 (fichiers locaux, aucun accès réseau)
+MATCH_MERGE_WINDOW = (-5 * 60, 45 * 60)  # Entrée saisie entre 5 min avant et 45 min après la fin de la game
+MatchGame = namedtuple('MatchGame', 'seconds timestamp kills deaths assists win remake match_id')
+
+def iter_json_values(f, block_size=JOURNAL_BLOCK_SIZE):
+    """Valeurs JSON successives d'un flux (tableau de premier niveau, JSONL ou valeur seule),
+    décodées une à une : seul l'élément en cours est gardé en mémoire"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    read_size = block_size
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                return
+            buffer, pos = f.read(block_size), 0
+            eof = not buffer
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            if end == len(buffer) and not eof:
+                raise ValueError("valeur peut-être incomplète")
+        except ValueError:
+            if eof:
+                raise ValueError(f"JSON invalide près de: {buffer[pos:pos + 60]!r}")
+            # Élément coupé par la fin du bloc : on lit la suite (par blocs de plus en plus grands)
+            chunk = f.read(read_size)
+            read_size *= 2
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        read_size = block_size
+        yield value
+        pos = end
+
+def match_game(match, player):
+    """Game du joueur suivi dans un match match-v5 (puuid, Riot ID 'Nom#TAG' ou nom d'invocateur)"""
+    info = match.get('info') if isinstance(match, dict) else None
+    if not isinstance(info, dict):
+        return None
+    wanted = player.lower()
+    for participant in info.get('participants') or ():
+        riot_id = f"{participant.get('riotIdGameName', '')}#{participant.get('riotIdTagline', '')}"
+        names = (participant.get('puuid', ''), riot_id, participant.get('summonerName', ''))
+        if wanted in (str(name).lower() for name in names):
+            break
+    else:
+        return None
+    end_ms = info.get('gameEndTimestamp')
+    if not end_ms:
+        end_ms = (info.get('gameStartTimestamp') or info.get('gameCreation') or 0) + info.get('gameDuration', 0) * 1000
+    # Heure locale, comme les timestamps saisis par add_entry()
+    timestamp = datetime.fromtimestamp(end_ms / 1000).strftime(TIMESTAMP_FORMAT)
+    return MatchGame(parse_timestamp(timestamp), timestamp,
+                     int(participant.get('kills', 0)), int(participant.get('deaths', 0)),
+                     int(participant.get('assists', 0)), bool(participant.get('win')),
+                     bool(participant.get('gameEndedInEarlySurrender')),
+                     (match.get('metadata') or {}).get('matchId', ''))
+
+def scan_match_dump(path, player):
+    """Games du joueur suivi dans un fichier d'export (exécuté dans un processus du pool)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [game for game in (match_game(match, player) for match in iter_json_values(f)) if game]
+
+def scan_match_dumps(paths, player, jobs=None):
+    """Games de plusieurs exports, analysés en parallèle ; triées et sans doublon de match"""
+    if jobs == 1 or len(paths) < 2:
+        results = [scan_match_dump(path, player) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(scan_match_dump, paths, [player] * len(paths)))
+    games = {}
+    for game in (game for result in results for game in result):
+        games[game.match_id or (game.seconds, game.kills, game.deaths, game.assists)] = game
+    return sorted(games.values())
+
+def merge_match_games(data, games, lp_win=None, lp_loss=None):
+    """Rapproche les games des entrées existantes par timestamp et corrige leur K/D/A.
+    Les games plus récentes que l'historique sont ajoutées si les LP par victoire/défaite
+    sont fournis (l'export ne contient ni LP ni grade). Retourne un résumé."""
+    summary = {'matched': 0, 'updated': 0, 'added': 0, 'unmatched': 0, 'result_mismatch': 0}
+    updates = {}
+    claimed = set()
+    new_entries = []
+    if data:
+        last = data[-1]
+        state = {'rank': last['rank'], 'lp': last['lp_total'], 'last_seconds': entry_seconds(last)}
+    else:
+        state = None
+    low, high = MATCH_MERGE_WINDOW
+    
+    for game in games:
+        position = find_position_by_time(data, game.seconds + low)
+        while position < len(data) and position in claimed:
+            position += 1
+        if position < len(data) and entry_seconds(data[position]) <= game.seconds + high:
+            claimed.add(position)
+            summary['matched'] += 1
+            entry = data[position]
+            lp_change = entry.get('lp_change', 0)
+            if not game.remake and lp_change and (lp_change > 0) != game.win:
+                summary['result_mismatch'] += 1
+            kda = (game.kills, game.deaths, game.assists)
+            if (entry.get('kills'), entry.get('deaths'), entry.get('assists')) != kda:
+                entry = dict(entry)
+                entry['kills'], entry['deaths'], entry['assists'] = kda
+                updates[position] = entry
+                summary['updated'] += 1
+        elif state and lp_win is not None and lp_loss is not None and game.seconds > state['last_seconds']:
+            lp_change = 0 if game.remake else lp_win if game.win else lp_loss
+            entry = make_entry(state['rank'], state['lp'], lp_change, None, game.kills, game.deaths,
+                               game.assists, timestamp=game.timestamp)
+            change = rank_change_available(state['rank'], entry['lp_total'])
+            if change:
+                apply_rank_change(entry, state['lp'], change,
+                                  min(100, max(0, carried_start_lp(change, entry['lp_total']))))
+            state.update(rank=entry['rank'], lp=entry['lp_total'], last_seconds=game.seconds)
+            new_entries.append(entry)
+        else:
+            summary['unmatched'] += 1
+    
+    if isinstance(data, LazyHistory):
+        if updates:
+            data.replace_entries(updates)
+        if new_entries:
+            data.bulk_extend([new_entries])
+    else:
+        for position, entry in updates.items():
+            data[position] = entry
+        data.extend(new_entries)
+    summary['added'] = len(new_entries)
+    return summary
+
+def import_match_dumps(data, paths, player, lp_win=None, lp_loss=None, jobs=None):
+    """Import hors ligne d'exports match-v5 : K/D/A et résultat du joueur suivi"""
+    games = scan_match_dumps(paths, player, jobs)
+    summary = merge_match_games(data, games, lp_win, lp_loss)
+    print(f"🔗 {len(games)} games de {player} trouvées : {summary['matched']} rapprochées "
+          f"({summary['updated']} K/D/A corrigés), {summary['added']} ajoutées, "
+          f"{summary['unmatched']} sans entrée correspondante")
+    if summary['result_mismatch']:
+        print(f"⚠️  {summary['result_mismatch']} entrées ont un résultat (signe des LP) différent de l'export")
+    return summary
+
+def export_data(data, path=None):
+    """Exporte l'historique au format tableau JSON (écriture en flux)"""
+    path = path or STORAGE_FILE
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for entry in data:
+            f.write(",\n  " if count else "\n  ")
+            f.write(json.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            count += 1
+        f.write("\n]" if count else "]")
+    os.replace(tmp_path, path)
+    print(f"📤 {count} entrées exportées vers {path}")
+    return count
+
+
+_PROFILE_NAME = re.compile(r'^[\w.-]+$')
+
+def profile_files(name):
+    """Fichiers (JSON historique, journal, base SQLite) d'un profil ; '' : dossier courant"""
+    if name and (not _PROFILE_NAME.match(name) or name.startswith('.')):
+        raise ValueError(f"nom de profil invalide '{name}' (lettres, chiffres, . _ -)")
+    folder = os.path.join(PROFILES_DIR, name) if name else ''
+    return tuple(os.path.join(folder, os.path.basename(path)) for path in _DEFAULT_FILES)
+
+def use_profile(name):
+    """Bascule tout le stockage vers le profil `name` (créé au besoin)"""
+    global STORAGE_FILE, JOURNAL_FILE, SQLITE_FILE
+    files = profile_files(name)
+    if name:
+        os.makedirs(os.path.dirname(files[0]), exist_ok=True)
+    STORAGE_FILE, JOURNAL_FILE, SQLITE_FILE = files
+
+def profile_names():
+    """Profils existants (sous-dossiers de PROFILES_DIR), par ordre alphabétique"""
+    try:
+        names = os.listdir(PROFILES_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names
+                  if _PROFILE_NAME.match(name) and not name.startswith('.')
+                  and os.path.isdir(os.path.join(PROFILES_DIR, name)))
+
+def summary_cache_path(path):
+    """Résumé de classement mis en cache à côté du journal d'un profil"""
+    return os.path.splitext(path)[0] + '.summary.json'
+
+def storage_stamp(files=None):
+    """Empreinte des fichiers de stockage (ceux du profil actif par défaut) :
+    tant qu'elle ne change pas, tout ce qui en est dérivé reste valide"""
+    storage, journal, sqlite = files or (STORAGE_FILE, JOURNAL_FILE, SQLITE_FILE)
+    files = (sqlite, sqlite + '-wal') if STORAGE_BACKEND == 'sqlite' else (journal, storage)
+    stamps = [_file_stamp(path) for path in files]
+    return [STORAGE_BACKEND, STATS_CACHE_VERSION] + [list(stamp[1:]) if stamp else None for stamp in stamps]
+
+def profile_stamp(name):
+    """Empreinte des fichiers lus pour le résumé d'un profil"""
+    return storage_stamp(profile_files(name))
+
+def cached_profile_summary(name):
+    """Résumé en cache d'un profil, None s'il est absent ou périmé"""
+    try:
+        with open(summary_cache_path(profile_files(name)[1]), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('stamp') == profile_stamp(name):
+            return cache['summary']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def profile_summary(name):
+    """Résumé d'un profil pour le classement (exécuté dans un processus du pool) : statut actuel,
+    winrate, KDA et grade moyen, calculés comme show_stats() puis mis en cache"""
+    stamp = profile_stamp(name)
+    storage, journal, sqlite = profile_files(name)
+    if STORAGE_BACKEND == 'sqlite' and os.path.exists(sqlite):
+        data = source = SqliteHistory(sqlite)
+    elif os.path.exists(journal) or not os.path.exists(storage):
+        data = JournalHistory(journal)
+        source = data.stats()
+    else:
+        # Profil pas encore migré : ancien tableau JSON lu tel quel
+        data = list(_iter_entries_file(storage))
+        source = StatsAccumulator().add_all(data)
+    summary = {'profile': name, 'games': len(data)}
+    if data:
+        last = data[-1]
+        basics = source.basic_stats()
+        kda = calculate_kda_stats(source)
+        grades = calculate_grade_stats(source)
+        summary.update({
+            'rank': last['rank'],
+            'lp_total': last['lp_total'],
+            'position': absolute_lp(last['rank'], last['lp_total']),
+            'winrate': basics['wins'] / basics['total_games'] * 100 if basics['total_games'] else 0,
+            'kda': kda['avg_kda'] if kda else None,
+            'avg_grade': grades['avg_grade'] if grades else None,
+            'last_game': last['timestamp']
+        })
+    cache_path = summary_cache_path(journal)
+    try:
+        with open(cache_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'stamp': stamp, 'summary': summary}, f, ensure_ascii=False)
+        os.replace(cache_path + '.tmp', cache_path)
+    except OSError:
+        pass  # Le cache est facultatif
+    return summary
+
+def leaderboard(names=None, jobs=None):
+    """Résumés de tous les profils, du mieux classé au moins bien classé. Les profils inchangés
+    sont lus dans leur cache ; les autres sont analysés en parallèle (un processus par profil)."""
+    names = profile_names() if names is None else names
+    summaries = []
+    stale = []
+    for name in names:
+        cached = cached_profile_summary(name)
+        if cached is None:
+            stale.append(name)
+        else:
+            summaries.append(cached)
+    if jobs == 1 or len(stale) < 2:
+        summaries.extend(profile_summary(name) for name in stale)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            summaries.extend(pool.map(profile_summary, stale))
+    summaries.sort(key=lambda summary: (summary['games'] > 0, summary.get('position', 0), summary['profile']),
+                   reverse=True)
+    return summaries
+
+def show_leaderboard(jobs=None):
+    """Classement de tous les profils : rang, LP, winrate, KDA et grade moyen"""
+    with phase('leaderboard'):
+        summaries = leaderboard(jobs=jobs)
+    if not summaries:
+        print(f"👥 Aucun profil dans {PROFILES_DIR}/ (lancez le tracker avec --account NOM)")
+        return
+    lines = [
+        f"\n{BOLD}🏆 CLASSEMENT DES PROFILS{RESET}",
+        "─" * 100,
+        f"{'#':<4} {'Profil':<20} {'Rang':<20} {'LP':<8} {'Games':<8} {'Winrate':<9} {'KDA':<7} {'Grade':<8} {'Dernière game'}",
+        "─" * 100
+    ]
+    for place, summary in enumerate(summaries, 1):
+        if not summary['games']:
+            lines.append(f"{place:<4} {summary['profile']:<20} {'—':<20} {'':<8} 0")
+            continue
+        kda = f"{summary['kda']:.2f}" if summary['kda'] is not None else 'N/A'
+        lines.append(f"{place:<4} {summary['profile']:<20} {rank_cell(summary['rank'])} "
+                     f"{str(summary['lp_total']) + ' LP':<8} {summary['games']:<8} "
+                     f"{summary['winrate']:>6.1f} %  {kda:<7} {grade_cell(summary['avg_grade'] or 'N/A')} "
+                     f"{summary['last_game'][:16]}")
+    lines.append("─" * 100)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def load_sqlite_history(threaded=False, quiet=False):
+    """Ouvre la base SQLite (import unique du journal ou du JSON si elle est vide)"""
+    history = SqliteHistory(SQLITE_FILE, threaded)
+    if len(history) == 0:
+        for source in (JOURNAL_FILE, STORAGE_FILE):
+            if os.path.exists(source):
+                import_data(history, source, quiet)
+                break
+    return history
+
+def get_next_rank(rank):
+    """Obtient le rang suivant"""
+    idx = RANK_ORDINALS.get(rank)
+    if idx is None:
         return rank
+    return RANKS[idx + 1] if idx + 1 < len(RANKS) else rank
 
 def get_prev_rank(rank):
     """Obtient le rang précédent"""
-    try:
-        idx = RANKS.index(rank)
-        return RANKS[idx - 1] if idx > 0 else rank
-    except ValueError:
+    idx = RANK_ORDINALS.get(rank)
+    if idx is None:
         return rank
+    return RANKS[idx - 1] if idx > 0 else rank
 
-def format_lp_change(lp_change):
-    """Formate le changement de LP avec couleurs"""
+class LadderSeries:
+    """Série précalculée des positions absolues (ordinal * 100 + LP), une par entrée"""
+
+    def __init__(self):
+        self.values = array('i')
+
+    @classmethod
+    def build(cls, entries):
+        series = cls()
+        if isinstance(entries, LazyHistory):
+            entries = entries.columns()
+        if isinstance(entries, EntryColumns):
+            # Colonnes déjà numériques : aucun rang à relire
+            series.values = array('i', (
+                absolute_lp(RANKS[ordinal], lp_total) if ordinal >= 0 else 0
+                for ordinal, lp_total in zip(entries.ranks, entries.lp_totals)))
+            for index, entry in entries.raw.items():
+                series.values[index] = absolute_lp(entry['rank'], entry['lp_total'])
+            return series
+        for entry in entries:
+            series.add(entry)
+        return series
+
+    def add(self, entry):
+        self.values.append(absolute_lp(entry['rank'], entry['lp_total']))
+
+    def splice(self, history, start, stop, entries):
+        self.values[start:stop] = array('i', (absolute_lp(entry['rank'], entry['lp_total']) for entry in entries))
+
+    def peak_index(self):
+        """Position de l'entrée la plus haute sur le ladder (None si vide)"""
+        if not self.values:
+            return None
+        return self.values.index(max(self.values))
+
+def history_index(data, index_cls):
+    """Index dérivé de l'historique : gardé et étendu à chaque ajout pour les historiques
+    paresseux, recalculé pour une simple liste"""
+    if isinstance(data, LazyHistory):
+        return data.index(index_cls)
+    return index_cls.build(data)
+
+class PrefixSums:
+    """Sommes cumulées (LP, victoires, défaites, KDA, points de grade) : n'importe quelle
+    plage contiguë d'entrées se calcule en temps constant. `base` est la position de la
+    première entrée couverte, ce qui permet de n'indexer que la fin de l'historique."""
+
+    FIELDS = ('lp', 'wins', 'losses', 'kills', 'deaths', 'assists', 'kda_games', 'grade_points', 'grade_games')
+
+    def __init__(self, base=0):
+        self.base = base
+        self.sums = {field: array('q', [0]) for field in self.FIELDS}
+
+    @staticmethod
+    def values(entry):
+        """Contribution d'une entrée à chaque somme (mêmes règles que show_stats)"""
+        lp_change = entry.get('lp_change', 0)
+        has_kda = 'kills' in entry
+        grade = entry.get('grade', 'N/A')
+        has_grade = grade != 'N/A'
+        return (
+            lp_change,
+            lp_change > 0,
+            lp_change < 0,
+            entry['kills'] if has_kda else 0,
+            entry['deaths'] if has_kda else 0,
+            entry['assists'] if has_kda else 0,
+            has_kda,
+            GRADE_POINTS.get(grade, 0) if has_grade else 0,
+            has_grade
+        )
+
+    @classmethod
+    def build(cls, entries, base=0):
+        prefix = cls(base)
+        columns = zip(*(cls.values(entry) for entry in entries))
+        for field, column in zip(cls.FIELDS, columns):
+            prefix.sums[field] = array('q', accumulate(column, initial=0))
+        return prefix
+
+    def add(self, entry):
+        for field, value in zip(self.FIELDS, self.values(entry)):
+            sums = self.sums[field]
+            sums.append(sums[-1] + value)
+
+    def __len__(self):
+        """Position juste après la dernière entrée couverte"""
+        return self.base + len(self.sums['lp']) - 1
+
+    def range(self, start, stop):
+        """Totaux des entrées [start:stop] (positions absolues, start >= base)"""
+        lo = start - self.base
+        hi = stop - self.base
+        totals = {field: sums[hi] - sums[lo] for field, sums in self.sums.items()}
+        totals['games'] = stop - start
+        return totals
+
+def prefix_index(data, start=0):
+    """Index de sommes cumulées couvrant au moins les entrées [start:]"""
+    if not isinstance(data, LazyHistory):
+        return PrefixSums.build(data[start:], base=start)
+    idx = data._indexes.get(PrefixSums)
+    if idx is None or idx.base > start:
+        # On double la zone couverte à chaque extension vers le passé
+        covered = len(data) - idx.base if idx is not None else 0
+        base = max(0, min(start, len(data) - 2 * covered))
+        idx = data._indexes[PrefixSums] = PrefixSums.build(data[base:], base=base)
+    return idx
+
+def range_stats(data, start=0, stop=None):
+    """Statistiques d'une plage d'entrées (indices comme un slice, négatifs acceptés)
+    en temps constant : LP, winrate, KDA et grade moyen"""
+    start, stop, _ = slice(start, stop).indices(len(data))
+    stop = max(start, stop)
+    totals = prefix_index(data, start).range(start, stop)
+    games = totals['games']
+    kda_games = totals['kda_games']
+    totals['winrate'] = totals['wins'] / games * 100 if games else 0
+    totals['avg_lp'] = totals['lp'] / games if games else 0
+    if kda_games:
+        # Même formule que calculate_kda_stats() : (K + A) moyens / max(D moyen, 0.1)
+        avg_deaths = totals['deaths'] / kda_games
+        totals['kda'] = (totals['kills'] + totals['assists']) / kda_games / max(avg_deaths, 0.1)
+    else:
+        totals['kda'] = None
+    totals['avg_grade_points'] = (totals['grade_points'] / totals['grade_games']
+                                  if totals['grade_games'] else None)
+    return totals
+
+def entry_seconds(entry):
+    """Timestamp d'une entrée en secondes epoch (formats ISO tolérés, 0 si illisible)"""
+    seconds = parse_timestamp(entry['timestamp'])
+    if seconds is None:
+        try:
+            seconds = calendar.timegm(datetime.fromisoformat(entry['timestamp']).timetuple())
+        except (TypeError, ValueError):
+            seconds = 0
+    return seconds
+
+def datetime_seconds(moment):
+    """Secondes epoch d'un datetime naïf (même convention que parse_timestamp)"""
+    return calendar.timegm(moment.timetuple())
+
+class TimestampIndex:
+    """Timestamps décodés une seule fois (secondes epoch) et recherche dichotomique par date"""
+
+    def __init__(self):
+        self.times = array('q')
+        self.is_sorted = True
+        self._order = None         # permutation triée, seulement si l'historique n'est pas chronologique
+        self._sorted_times = None
+
+    @classmethod
+    def build(cls, entries):
+        idx = cls()
+        if isinstance(entries, LazyHistory):
+            entries = entries.columns()
+        if isinstance(entries, EntryColumns):
+            # Timestamps déjà décodés par EntryColumns
+            idx.times = array('q', entries.timestamps)
+            for index, entry in entries.raw.items():
+                idx.times[index] = entry_seconds(entry)
+        else:
+            idx.times = array('q', (entry_seconds(entry) for entry in entries))
+        times = idx.times
+        idx.is_sorted = all(times[i] <= times[i + 1] for i in range(len(times) - 1))
+        return idx
+
+    def add(self, entry):
+        seconds = entry_seconds(entry)
+        if self.times and seconds < self.times[-1]:
+            self.is_sorted = False
+        self.times.append(seconds)
+        self._order = None
+
+    def splice(self, history, start, stop, entries):
+        self.times[start:stop] = array('q', (entry_seconds(entry) for entry in entries))
+        self._order = None
+        if self.is_sorted:
+            # Seuls les raccords avec les entrées voisines sont à vérifier
+            times = self.times
+            end = min(start + len(entries) + 1, len(times))
+            self.is_sorted = all(times[i] <= times[i + 1] for i in range(max(start - 1, 0), end - 1))
+
+    def positions(self, start, end):
+        """Positions des entrées avec start <= timestamp < end (secondes epoch), dans l'ordre
+        de l'historique. Une plage contiguë (range) si l'historique est chronologique."""
+        if self.is_sorted:
+            return range(bisect_left(self.times, start), bisect_left(self.times, end))
+        if self._order is None:
+            self._order = sorted(range(len(self.times)), key=self.times.__getitem__)
+            self._sorted_times = array('q', (self.times[i] for i in self._order))
+        lo = bisect_left(self._sorted_times, start)
+        hi = bisect_left(self._sorted_times, end)
+        return sorted(self._order[lo:hi])
+
+def entries_between(data, start, end):
+    """Entrées jouées entre deux datetimes (fin exclue) ; coût proportionnel à la plage"""
+    positions = history_index(data, TimestampIndex).positions(datetime_seconds(start), datetime_seconds(end))
+    if isinstance(positions, range):
+        return data[positions.start:positions.stop]
+    return [data[i] for i in positions]
+
+SESSION_GAP = 90 * 60       # Pause (s) au-delà de laquelle une nouvelle session commence
+SESSION_TILT_STREAK = 3     # Défaites d'affilée en fin de session pour la marquer « tilt »
+SESSIONS_SHOWN = 15         # Sessions affichées par défaut
+
+class Session:
+    """Résumé d'une session (games séparées par moins de SESSION_GAP), mis à jour game par game"""
+
+    __slots__ = ('start', 'games', 'first_seconds', 'last_seconds', 'wins', 'losses', 'lp',
+                 'kills', 'deaths', 'assists', 'kda_games', 'grade_points', 'grade_games',
+                 'rank', 'lp_total', 'peak_position', 'peak_rank', 'peak_lp', 'streak')
+
+    def __init__(self, start, seconds):
+        self.start = start              # position de la première game dans l'historique
+        self.games = 0
+        self.first_seconds = seconds
+        self.last_seconds = seconds
+        self.wins = 0
+        self.losses = 0
+        self.lp = 0
+        self.kills = 0
+        self.deaths = 0
+        self.assists = 0
+        self.kda_games = 0
+        self.grade_points = 0
+        self.grade_games = 0
+        self.rank = None                # rang et LP à la fin de la session
+        self.lp_total = 0
+        self.peak_position = None
+        self.peak_rank = None
+        self.peak_lp = 0
+        self.streak = 0                 # > 0 : victoires d'affilée, < 0 : défaites d'affilée
+
+    def add(self, seconds, lp_change, promoted, demoted, rank, lp_total, kda, grade_points):
+        """Intègre une game (kda : (K, D, A) ou None, grade_points : None sans grade)"""
+        self.games += 1
+        self.last_seconds = seconds
+        self.lp += lp_change
+        if lp_change > 0:
+            self.wins += 1
+        elif lp_change < 0:
+            self.losses += 1
+        self.streak = next_streak(self.streak, lp_change, promoted, demoted)
+        if kda is not None:
+            self.kills += kda[0]
+            self.deaths += kda[1]
+            self.assists += kda[2]
+            self.kda_games += 1
+        if grade_points is not None:
+            self.grade_points += grade_points
+            self.grade_games += 1
+        self.rank = rank
+        self.lp_total = lp_total
+        position = absolute_lp(rank, lp_total)
+        if self.peak_position is None or position > self.peak_position:
+            self.peak_position = position
+            self.peak_rank = rank
+            self.peak_lp = lp_total
+
+    @property
+    def kda(self):
+        """Même formule que calculate_kda_stats() (None sans KDA)"""
+        if not self.kda_games:
+            return None
+        return (self.kills + self.assists) / self.kda_games / max(self.deaths / self.kda_games, 0.1)
+
+    @property
+    def avg_grade_points(self):
+        return self.grade_points / self.grade_games if self.grade_games else None
+
+    @property
+    def tilted(self):
+        """Session terminée sur une série de défaites"""
+        return -self.streak >= SESSION_TILT_STREAK
+
+class SessionIndex:
+    """Sessions de jeu découpées par les pauses entre deux games, avec leur résumé.
+    Un ajout ne touche que la dernière session (ou en ouvre une nouvelle)."""
+
+    def __init__(self):
+        self.sessions = []
+
+    @classmethod
+    def build(cls, entries):
+        idx = cls()
+        if isinstance(entries, LazyHistory):
+            entries = entries.columns()
+        if not isinstance(entries, EntryColumns):
+            for entry in entries:
+                idx.add(entry)
+            return idx
+        # Colonnes déjà décodées : aucun dict reconstruit, sauf entrées hors format
+        columns = entries
+        for index, flags in enumerate(columns.flags):
+            if columns.raw and index in columns.raw:
+                idx.add(columns.raw[index])
+                continue
+            idx._add(columns.timestamps[index], columns.lp_changes[index], flags & _PROMOTE, flags & _DEMOTE,
+                     RANKS[columns.ranks[index]], columns.lp_totals[index],
+                     (columns.kills[index], columns.deaths[index], columns.assists[index]) if flags & _HAS_KDA else None,
+                     columns.grades[index] if flags & _HAS_GRADE else None)
+        return idx
+
+    def add(self, entry):
+        grade = entry.get('grade', 'N/A')
+        self._add(entry_seconds(entry), entry.get('lp_change', 0), 'promote' in entry, 'demote' in entry,
+                  entry['rank'], entry['lp_total'],
+                  (entry['kills'], entry['deaths'], entry['assists']) if 'kills' in entry else None,
+                  GRADE_POINTS.get(grade, 0) if grade != 'N/A' else None)
+
+    def splice(self, history, start, stop, entries):
+        """Remplace les entrées [start:stop] (historique pas encore modifié) : seules les sessions
+        qui contiennent les entrées voisines sont recalculées, les suivantes sont décalées"""
+        sessions = self.sessions
+        if not sessions:
+            for entry in entries:
+                self.add(entry)
+            return
+        starts = [session.start for session in sessions]
+        first = max(bisect_left(starts, start) - 1, 0)      # session de l'entrée précédente
+        last = max(bisect_left(starts, stop + 1) - 1, first)  # session de l'entrée suivante
+        begin = sessions[first].start
+        end = sessions[last].start + sessions[last].games
+        rebuilt = SessionIndex()
+        for entry in history[begin:start] + list(entries) + history[stop:end]:
+            rebuilt.add(entry)
+        for session in rebuilt.sessions:
+            session.start += begin
+        shift = len(entries) - (stop - start)
+        for session in sessions[last + 1:]:
+            session.start += shift
+        sessions[first:last + 1] = rebuilt.sessions
+
+    def _add(self, seconds, lp_change, promoted, demoted, rank, lp_total, kda, grade_points):
+        sessions = self.sessions
+        if not sessions or abs(seconds - sessions[-1].last_seconds) > SESSION_GAP:
+            start = sessions[-1].start + sessions[-1].games if sessions else 0
+            sessions.append(Session(start, seconds))
+        sessions[-1].add(seconds, lp_change, promoted, demoted, rank, lp_total, kda, grade_points)
+
+ROLLING_WINDOWS = (20, 50, 100)      # Fenêtres glissantes par défaut (en games)
+ROLLING_METRICS = ('winrate', 'lp', 'kda', 'grade')
+
+def window_starts(data, games=None, days=None):
+    """Début de la fenêtre glissante finissant à chaque entrée : les N dernières games,
+    ou les games des N derniers jours (deux pointeurs, chaque entrée n'entre et ne sort qu'une fois).
+    Une fenêtre contient toujours au moins son entrée, même si l'historique n'est pas trié."""
+    total = len(data)
+    if games is not None:
+        return [max(0, stop - games) for stop in range(1, total + 1)]
+    times = history_index(data, TimestampIndex).times
+    span = days * 86400
+    starts = []
+    low = 0
+    for index, seconds in enumerate(times):
+        while low < index and times[low] <= seconds - span:
+            low += 1
+        starts.append(low)
+    return starts
+
+def rolling_series(data, games=None, days=None):
+    """Séries glissantes (winrate, LP/game, KDA, points de grade) sur tout l'historique.
+    Chaque fenêtre est la différence de deux sommes cumulées : O(1) par pas, sans relire data.
+    Les valeurs indéfinies (aucun KDA ou grade dans la fenêtre) valent None."""
+    starts = window_starts(data, games, days)
+    return window_metrics(prefix_index(data).sums, starts, range(1, len(starts) + 1))
+
+def window_metrics(sums, starts, stops):
+    """Métriques des fenêtres [start, stop) à partir des sommes cumulées (listes parallèles)"""
+    def window(field):
+        column = sums[field]
+        return [column[stop] - column[start] for start, stop in zip(starts, stops)]
+    
+    counts = [stop - start for start, stop in zip(starts, stops)]
+    kda_games = window('kda_games')
+    grade_games = window('grade_games')
+    return {
+        'winrate': [wins / count * 100 for wins, count in zip(window('wins'), counts)],
+        'lp': [lp / count for lp, count in zip(window('lp'), counts)],
+        # Même formule que calculate_kda_stats() : (K + A) moyens / max(D moyen, 0.1)
+        'kda': [(kills + assists) / n / max(deaths / n, 0.1) if n else None
+                for kills, deaths, assists, n in zip(window('kills'), window('deaths'), window('assists'), kda_games)],
+        'grade': [points / n if n else None for points, n in zip(window('grade_points'), grade_games)],
+        'games': counts,
+    }
+
+def ladder_window(data, count):
+    """Positions absolues des `count` dernières entrées"""
+    if isinstance(data, LazyHistory) and data.has_index(LadderSeries):
+        return list(data.index(LadderSeries).values[-count:])
+    return [absolute_lp(entry['rank'], entry['lp_total']) for entry in data[-count:]]
+
+def lp_change_text(lp_change):
+    """Texte visible et couleur d'un changement de LP"""
     try:
         if lp_change > 0:
-            return f"{BOLD}\033[92m+{lp_change} LP{RESET}"
+            return f"+{lp_change} LP", '\033[92m'
         elif lp_change < 0:
-            return f"{BOLD}\033[91m{lp_change} LP{RESET}"
-        else:
-            return f"{BOLD}\033[93m±0 LP{RESET}"
-    except:
-        return f"{BOLD}\033[93m±0 LP{RESET}"
+            return f"{lp_change} LP", '\033[91m'
+    except Exception:
+        pass
+    return "±0 LP", '\033[93m'
+
+def format_lp_change(lp_change):
+    """Formate le changement de LP avec couleurs"""
+    text, color = lp_change_text(lp_change)
+    return f"{BOLD}{color}{text}{RESET}"
+
+# Cellules du tableau d'historique, déjà colorées et complétées à leur largeur.
+# La largeur visible est connue (c'est le texte qu'on a coloré) : pas besoin de regex ANSI.
+@lru_cache(maxsize=None)
+def rank_cell(rank, width=20):
+    return colorize_rank(rank) + " " * max(0, width - len(rank))
+
+@lru_cache(maxsize=None)
+def lp_change_cell(lp_change, width=15):
+    text, _ = lp_change_text(lp_change)
+    return format_lp_change(lp_change) + " " * max(0, width - len(text))
+
+@lru_cache(maxsize=8192)
+def kda_cell(kills, deaths, assists, width=15):
+    text = f"{kills}/{deaths}/{assists}"
+    return format_kda(kills, deaths, assists) + " " * max(0, width - len(text))
+
+@lru_cache(maxsize=None)
+def grade_cell(grade, width=8):
+    colored = colorize_grade(grade) if grade != 'N/A' else grade
+    return colored + " " * max(0, width - len(grade))
+
+NA_KDA_CELL = f"{'N/A':<15}"
+
+def render_history_row(entry):
+    """Une ligne du tableau d'historique"""
+    timestamp = entry['timestamp'][:16]
+    kda = (kda_cell(entry['kills'], entry.get('deaths', 1), entry.get('assists', 0))
+           if 'kills' in entry else NA_KDA_CELL)
+    
+    # Notes spéciales - inclut les notes custom si elles existent
+    notes = entry.get('note', '')
+    if 'promote' in entry:
+        promo_note = f"🚀 → {entry['promote']['to']}"
+        notes = f"{notes} {promo_note}" if notes else promo_note
+    elif 'demote' in entry:
+        demo_note = f"📉 → {entry['demote']['to']}"
+        notes = f"{notes} {demo_note}" if notes else demo_note
+    
+    return (f"{timestamp:<20} {rank_cell(entry['rank'])} {lp_change_cell(entry.get('lp_change', 0))} "
+            f"{str(entry['lp_total']) + ' LP':<12} {kda} {grade_cell(entry.get('grade', 'N/A'))} {notes}")
+
+def render_history_table(entries):
+    """Lignes du tableau (en-tête compris) pour les entrées données"""
+    lines = [
+        "─" * 120,
+        f"{'Date':<20} {'Rang':<20} {'LP Change':<15} {'LP Total':<12} {'KDA':<15} {'Grade':<8} {'Notes'}",
+        "─" * 120
+    ]
+    lines.extend(render_history_row(entry) for entry in entries)
+    return lines
 
 def display_data(data):
-    """Affichage ultra sexy des données"""
+    """Affichage ultra sexy des données (tableau construit en mémoire puis écrit d'un coup)"""
     if not data:
         print(f"{BOLD}📊 Aucune donnée à afficher{RESET}")
         return
     
-    print(f"\n{BOLD}{UNDERLINE}📈 HISTORIQUE DE PROGRESSION{RESET}")
-    print(f"Nombre de parties: {BOLD}{UNDERLINE}{len(data)}{RESET}")
-    print("─" * 120)
-    
-    # En-tête avec largeurs fixes pour l'alignement
-    print(f"{'Date':<20} {'Rang':<20} {'LP Change':<15} {'LP Total':<12} {'KDA':<15} {'Grade':<8} {'Notes'}")
-    print("─" * 120)
-
+    lines = [
+        f"\n{BOLD}{UNDERLINE}📈 HISTORIQUE DE PROGRESSION{RESET}",
+        f"Nombre de parties: {BOLD}{UNDERLINE}{len(data)}{RESET}"
+    ]
     # Données - affiche les 500 dernières entrées
-    for entry in data[-500:]:
-        timestamp = entry['timestamp'][:16] if len(entry['timestamp']) > 16 else entry['timestamp']
-        
-        # Rang avec couleur
-        rank_colored = colorize_rank(entry['rank'])
-        
-        # Format LP change avec couleur
-        lp_change = entry.get('lp_change', 0)
-        lp_change_colored = format_lp_change(lp_change)
-        
-        lp_total = f"{entry['lp_total']} LP"
-        
-        # KDA et Grade (avec gestion des anciennes entrées qui n'ont pas ces champs)
-        kills = entry.get('kills', 0)
-        deaths = entry.get('deaths', 1)  # Éviter division par 0
-        assists = entry.get('assists', 0)
-        kda_colored = format_kda(kills, deaths, assists) if 'kills' in entry else "N/A"
-        
-        grade = entry.get('grade', 'N/A')
-        grade_colored = colorize_grade(grade) if grade != 'N/A' else grade
-        
-        # Notes spéciales - inclut les notes custom si elles existent
-        notes = entry.get('note', '')  # Récupère la note si elle existe
-        if 'promote' in entry:
-            promo_note = f"🚀 → {entry['promote']['to']}"
-            notes = f"{notes} {promo_note}" if notes else promo_note
-        elif 'demote' in entry:
-            demo_note = f"📉 → {entry['demote']['to']}"
-            notes = f"{notes} {demo_note}" if notes else demo_note
-        
-        # Affichage avec format fixe - utiliser le padding correct pour les chaînes colorées
-        timestamp_padded = f"{timestamp:<20}"
-        rank_padded = pad_colored_string(rank_colored, 20)
-        lp_change_padded = pad_colored_string(lp_change_colored, 15)
-        lp_total_padded = f"{lp_total:<12}"
-        kda_padded = pad_colored_string(kda_colored, 15)
-        grade_padded = pad_colored_string(grade_colored, 8)
-        
-        print(f"{timestamp_padded} {rank_padded} {lp_change_padded} {lp_total_padded} {kda_padded} {grade_padded} {notes}")
+    with phase('render'):
+        lines.extend(render_history_table(data[-500:]))
     
     # Statistiques actuelles
-    if data:
-        current = data[-1]
-        print("\n" + "═" * 120)
-        print(f"{BOLD}🎯 STATUT ACTUEL{RESET}")
-        print(f"Rang: {colorize_rank(current['rank'])}")
-        print(f"LP: {BOLD}{current['lp_total']}{RESET}")
+    current = data[-1]
+    lines.append("\n" + "═" * 120)
+    lines.append(f"{BOLD}🎯 STATUT ACTUEL{RESET}")
+    lines.append(f"Rang: {colorize_rank(current['rank'])}")
+    lines.append(f"LP: {BOLD}{current['lp_total']}{RESET}")
+    
+    # Barre de progression (si pas Master+)
+    if not rank_info(current['rank']).is_apex:
+        lp_in_rank = current['lp_total'] % 100
+        progress_bar = print_progress_bar(lp_in_rank)
+        lines.append(f"Progression: {progress_bar}")
+    
+    lines.append("═" * 120)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def find_position_by_time(data, seconds):
+    """Première position dont le timestamp est >= seconds (historique chronologique).
+    Utilise l'index des timestamps s'il existe, sinon une dichotomie qui ne décode
+    que O(log n) entrées."""
+    if isinstance(data, LazyHistory) and data.has_index(TimestampIndex):
+        return bisect_left(data.index(TimestampIndex).times, seconds)
+    lo, hi = 0, len(data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if entry_seconds(data[mid]) < seconds:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def entry_matches(entry, query):
+    """Recherche (insensible à la casse) dans le rang, la note et les promotions/démotions"""
+    haystack = [entry.get('rank', ''), entry.get('note', '')]
+    for key in ('promote', 'demote'):
+        if key in entry:
+            haystack.append(entry[key]['to'])
+    return any(query in text.lower() for text in haystack)
+
+def search_entries(data, query, start, backward=False):
+    """Position de la prochaine entrée correspondant à la recherche, lue par blocs"""
+    query = query.lower()
+    total = len(data)
+    if backward:
+        stop = start
+        while stop > 0:
+            block_start = max(0, stop - LAZY_BATCH_SIZE)
+            block = data[block_start:stop]
+            for offset in range(len(block) - 1, -1, -1):
+                if entry_matches(block[offset], query):
+                    return block_start + offset
+            stop = block_start
+    else:
+        while start < total:
+            block = data[start:start + LAZY_BATCH_SIZE]
+            for offset, entry in enumerate(block):
+                if entry_matches(entry, query):
+                    return start + offset
+            start += LAZY_BATCH_SIZE
+    return None
+
+PAGER_HELP = ("[Entrée] suivante · [b] précédente · [g N] ligne N · [d AAAA-MM-JJ] date · "
+              "[/texte] chercher · [?texte] chercher avant · [q] quitter")
+
+def page_history(data, page_size=None):
+    """Pager interactif sur tout l'historique : seules les lignes à l'écran sont lues et formatées"""
+    total = len(data)
+    if not total:
+        print(f"{BOLD}📊 Aucune donnée à afficher{RESET}")
+        return
+    page_size = page_size or max(5, terminal_size().lines - 9)
+    top = max(0, total - page_size)
+    message = ""
+    
+    while True:
+        rows = data[top:top + page_size]
+        lines = [f"\n{BOLD}{UNDERLINE}📜 HISTORIQUE COMPLET{RESET}"]
+        lines.extend(render_history_table(rows))
+        lines.append("─" * 120)
+        lines.append(f"Lignes {BOLD}{top + 1}-{top + len(rows)}{RESET} / {total}  {message}")
+        lines.append(PAGER_HELP)
+        sys.stdout.write("\n".join(lines) + "\n")
+        message = ""
         
-        # Barre de progression (si pas Master+)
-        if not any(tier in current['rank'] for tier in ['Master', 'Grandmaster', 'Challenger']):
-            lp_in_rank = current['lp_total'] % 100
-            progress_bar = print_progress_bar(lp_in_rank)
-            print(f"Progression: {progress_bar}")
+        try:
+            cmd = input(f"{BOLD}📜 >> {RESET}").strip()
+        except (KeyboardInterrupt, EOFError):
+            print()
+            return
         
-        print("═" * 120)
+        if cmd in ('', 'n'):
+            top = min(top + page_size, max(0, total - page_size))
+        elif cmd == 'b':
+            top = max(0, top - page_size)
+        elif cmd == 'q':
+            return
+        elif cmd.startswith('g'):
+            try:
+                row = int(cmd[1:].strip())
+            except ValueError:
+                message = "❌ Numéro de ligne invalide"
+                continue
+            top = min(max(0, row - 1), max(0, total - page_size))
+        elif cmd.startswith('d'):
+            try:
+                day = datetime.strptime(cmd[1:].strip(), "%Y-%m-%d")
+            except ValueError:
+                message = "❌ Date invalide (AAAA-MM-JJ)"
+                continue
+            top = min(find_position_by_time(data, datetime_seconds(day)), max(0, total - page_size))
+        elif cmd[:1] in ('/', '?') and len(cmd) > 1:
+            backward = cmd[0] == '?'
+            found = search_entries(data, cmd[1:], top if backward else top + 1, backward)
+            if found is None:
+                message = f"🔍 Aucun résultat pour '{cmd[1:]}'"
+            else:
+                top = found
+                message = f"🔍 Résultat ligne {found + 1}"
+        else:
+            message = f"❓ Commande '{cmd}' inconnue"
 
 def get_user_input(prompt, input_type=str, validation=None):
-    """Fonction d'input sécurisée avec validation"""
+    """Fonction d'input sécurisée avec validation. Ctrl+C remonte jusqu'à main(), qui attend
+    la dernière sauvegarde avant de quitter."""
     while True:
         try:
             value = input(f"{BOLD}🔸 {prompt}: {RESET}").strip()
@@ -269,9 +2976,222 @@ def get_user_input(prompt, input_type=str, validation=None):
             return value
         except ValueError:
             print(f"❌ Veuillez entrer un {input_type.__name__} valide.")
-        except KeyboardInterrupt:
-            print("\n👋 Au revoir !")
-            exit(0)
+
+def make_entry(current_rank, current_lp, lp_change, grade, kills, deaths, assists, note="", timestamp=None):
+    """Construit une entrée à partir du statut actuel (sans promotion ni démotion)"""
+    entry = {
+        "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "rank": current_rank,
+        "lp_change": lp_change,
+        "lp_total": current_lp + lp_change,
+        "kills": kills,
+        "deaths": deaths,
+        "assists": assists
+    }
+    if grade is not None:
+        entry["grade"] = grade
+    
+    # Ajouter la note si elle existe
+    if note:
+        entry["note"] = note
+    return entry
+
+def rank_change_available(current_rank, new_lp_total):
+    """'promote' ou 'demote' si le nouveau total de LP permet de changer de division, sinon None"""
+    if new_lp_total >= 100 and not rank_info(current_rank).is_apex:
+        if get_next_rank(current_rank) != current_rank:
+            return 'promote'
+    elif new_lp_total < 0:
+        if get_prev_rank(current_rank) != current_rank:
+            return 'demote'
+    return None
+
+def apply_rank_change(entry, current_lp, change, start_lp):
+    """Applique une promotion ou une démotion à une entrée, avec correction des LP"""
+    if change == 'promote':
+        next_rank = get_next_rank(entry["rank"])
+        # Calculer le vrai changement LP pour la promotion
+        # LP pour atteindre 100 + LP de départ dans le nouveau rang
+        entry["lp_change"] = (100 - current_lp) + start_lp
+        entry["promote"] = {"to": next_rank, "start_lp": start_lp}
+        entry["rank"] = next_rank
+    else:
+        prev_rank = get_prev_rank(entry["rank"])
+        # Pour les démotions, lp_change doit rester négatif pour refléter que c'est une loss
+        # On garde le changement négatif original qui a causé la démotion
+        entry["demote"] = {"to": prev_rank, "start_lp": start_lp}
+        entry["rank"] = prev_rank
+    entry["lp_total"] = start_lp
+    return entry
+
+def rechain_entry(entry, previous):
+    """Recalcule le rang et les LP totaux d'une entrée à partir de l'entrée précédente.
+    Une promotion ou démotion enregistrée est conservée, avec ses LP de départ."""
+    entry = dict(entry)
+    entry['rank'] = previous['rank']
+    for change in ('promote', 'demote'):
+        if change in entry:
+            move = entry.pop(change)
+            start_lp = move.get('start_lp', entry['lp_total']) if isinstance(move, dict) else entry['lp_total']
+            return apply_rank_change(entry, previous['lp_total'], change, start_lp)
+    entry['lp_total'] = previous['lp_total'] + entry.get('lp_change', 0)
+    return entry
+
+def merge_chronological(entries, pending):
+    """Fusionne en flux un historique et des entrées en attente, par timestamp. Les entrées en
+    attente déjà présentes (identiques) sont ignorées ; à partir de la première insertion,
+    chaque entrée est re-chaînée sur la précédente."""
+    pending = sorted(pending, key=entry_seconds)
+    position = 0
+    previous = None
+    rechain = False
+    for entry in entries:
+        seconds = entry_seconds(entry)
+        while position < len(pending) and entry_seconds(pending[position]) <= seconds:
+            candidate = pending[position]
+            position += 1
+            if candidate == entry:
+                continue
+            rechain = True
+            previous = rechain_entry(candidate, previous) if previous is not None else candidate
+            yield previous
+        if rechain and previous is not None:
+            entry = rechain_entry(entry, previous)
+        previous = entry
+        yield entry
+    for candidate in pending[position:]:
+        previous = rechain_entry(candidate, previous) if previous is not None else candidate
+        yield previous
+
+UNDO_LOG_SIZE = 100        # Corrections gardées pour `undo`
+EDIT_READ_BLOCK = 256      # Entrées lues par bloc autour d'une correction
+
+def rechain_following(data, position, replacement, count):
+    """`replacement` remplace data[position:position+count] ; les entrées suivantes sont re-chaînées
+    (rang, LP totaux) jusqu'à ce que le chaînage retombe sur celui enregistré, ce qui arrive en
+    général à la promotion ou démotion suivante. Retourne les anciennes et les nouvelles entrées
+    de toute la plage modifiée."""
+    stop = position + count
+    old = data[position:stop]
+    new = list(replacement)
+    previous = new[-1] if new else (data[position - 1] if position else None)
+    reference = old[-1] if old else (data[position - 1] if position else None)  # prédécesseur d'origine
+    total = len(data)
+    while previous is not None and reference is not None and stop < total:
+        block = data[stop:stop + EDIT_READ_BLOCK]
+        for entry in block:
+            if previous['rank'] == reference['rank'] and previous['lp_total'] == reference['lp_total']:
+                return old, new
+            reference = entry
+            previous = rechain_entry(entry, previous)
+            old.append(entry)
+            new.append(previous)
+        stop += len(block)
+    return old, new
+
+def splice_history(data, position, old, new):
+    """Remplace data[position:position+len(old)], qui doit valoir `old`, par `new`"""
+    if isinstance(data, LazyHistory):
+        data.splice(position, old, new)
+        return
+    if data[position:position + len(old)] != old:
+        raise ValueError("historique modifié entre-temps, relancez la commande")
+    data[position:position + len(old)] = new
+
+def undo_log_path(data):
+    """Corrections annulables d'un historique (une par ligne, la plus récente en dernier).
+    Propre à chaque backend : journal et base SQLite d'un même profil ne partagent pas leurs corrections."""
+    return getattr(data, 'path', JOURNAL_FILE) + '.undo.jsonl'
+
+def record_change(data, action, position, old, new):
+    """Applique une correction et la garde pour `undo` (les UNDO_LOG_SIZE dernières)"""
+    splice_history(data, position, old, new)
+    path = undo_log_path(data)
+    record = {'action': action, 'position': position, 'before': old, 'after': new,
+              'at': datetime.now().strftime(TIMESTAMP_FORMAT)}
+    try:
+        records = list(_iter_journal(path)) if os.path.exists(path) else []
+        if len(records) >= UNDO_LOG_SIZE:
+            write_journal(path, records[len(records) - UNDO_LOG_SIZE + 1:] + [record])
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(_journal_line(record))
+    except OSError as e:
+        print(f"⚠️  Correction enregistrée mais non annulable: {e}", file=sys.stderr)
+
+def history_position(data, line):
+    """Position d'une ligne de l'historique, numérotée depuis 1 comme dans le pager (-1 : la dernière)"""
+    position = line - 1 if line > 0 else len(data) + line
+    if not 0 <= position < len(data):
+        raise ValueError(f"ligne {line} hors de l'historique (1-{len(data)})")
+    return position
+
+def edit_entry(data, position, lp_change=None, kda=None, grade=None, note=None, start_lp=None):
+    """Corrige une entrée (None : champ inchangé, note '' : note effacée), puis re-chaîne les
+    suivantes. Retourne le nombre d'entrées réécrites (0 si rien ne change)."""
+    original = data[position]
+    entry = dict(original)
+    move = 'promote' if 'promote' in entry else 'demote' if 'demote' in entry else None
+    if lp_change is not None:
+        if move == 'promote':
+            raise ValueError("les LP d'une promotion découlent de ses LP de départ")
+        entry['lp_change'] = lp_change
+    if start_lp is not None:
+        if move is None:
+            raise ValueError("LP de départ : seulement pour une promotion ou une démotion")
+        if not 0 <= start_lp <= 100:
+            raise ValueError("LP de départ entre 0 et 100")
+        details = entry[move] if isinstance(entry[move], dict) else {'to': entry['rank']}
+        entry[move] = dict(details, start_lp=start_lp)
+    if kda is not None:
+        entry['kills'], entry['deaths'], entry['assists'] = kda
+    if grade is not None:
+        if grade not in GRADE_ORDER:
+            raise ValueError(f"grade invalide '{grade}'")
+        entry['grade'] = grade
+    if note is not None:
+        if note:
+            entry['note'] = note
+        else:
+            entry.pop('note', None)
+    if entry == original:
+        return 0
+    if position:
+        entry = rechain_entry(entry, data[position - 1])
+    elif move:
+        if start_lp is not None:
+            entry['lp_total'] = start_lp
+    else:
+        # Première entrée : aucun prédécesseur, les LP totaux suivent le changement de LP
+        entry['lp_total'] += entry.get('lp_change', 0) - original.get('lp_change', 0)
+    old, new = rechain_following(data, position, [entry], 1)
+    record_change(data, 'edit', position, old, new)
+    return len(new)
+
+def delete_entry(data, position):
+    """Supprime une entrée et re-chaîne les suivantes. Retourne le nombre d'entrées réécrites."""
+    old, new = rechain_following(data, position, [], 1)
+    record_change(data, 'delete', position, old, new)
+    return len(new)
+
+def undo_change(data):
+    """Annule la dernière correction : la plage modifiée reprend ses anciennes entrées, telles
+    quelles (les games ajoutées depuis sont re-chaînées). Retourne la correction annulée,
+    None s'il n'y en a pas."""
+    path = undo_log_path(data)
+    records = list(_iter_journal(path)) if os.path.exists(path) else []
+    if not records:
+        return None
+    record = records.pop()
+    position, after = record['position'], record['after']
+    if data[position:position + len(after)] != after:
+        # L'historique a été réécrit depuis (import, autre terminal) : correction abandonnée
+        write_journal(path, records)
+        raise ValueError(f"la ligne {position + 1} a changé depuis la correction du {record['at']}")
+    old, new = rechain_following(data, position, record['before'], len(after))
+    splice_history(data, position, old, new)
+    write_journal(path, records)
+    return record
 
 def add_entry(data):
     """Ajoute une nouvelle entrée avec style"""
@@ -285,7 +3205,7 @@ def add_entry(data):
         print(f"Statut actuel: {colorize_rank(current_rank)} - {current_lp} LP")
     else:
         print("🆕 Première entrée ! Définissons votre rang initial.")
-        current_rank = get_user_input("Rang initial (ex: Silver II)")
+        current_rank = get_user_input("Rang initial (ex: Silver II)", str, lambda x: x in RANK_ORDINALS)
         current_lp = get_user_input("LP initial", int, lambda x: x >= 0)
     
     # Changement de LP
@@ -293,8 +3213,7 @@ def add_entry(data):
     new_lp_total = current_lp + lp_change
 
     # Grade input with validation
-    valid_grades = ['S+', 'S', 'S-', 'A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-']
-    grade = get_user_input("Grade (S+, S, S-, A+, A, A-, B+, B, B-, C+, C, C-, D+, D, D-)", str, lambda x: x in valid_grades)
+    grade = get_user_input("Grade (S+, S, S-, A+, A, A-, B+, B, B-, C+, C, C-, D+, D, D-)", str, lambda x: x in GRADE_ORDER)
     
     # KDA input
     kills = get_user_input("Kills", int, lambda x: x >= 0)
@@ -305,54 +3224,119 @@ def add_entry(data):
     note = input(f"{BOLD}📝 Note optionnelle (Entrée pour ignorer): {RESET}").strip()
     
     # Création de l'entrée
-    entry = {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "rank": current_rank,
-        "lp_change": lp_change,
-        "lp_total": new_lp_total,
-        "kills": kills,
-        "deaths": deaths,
-        "assists": assists,
-        "grade": grade
-    }
-    
-    # Ajouter la note si elle existe
-    if note:
-        entry["note"] = note
+    entry = make_entry(current_rank, current_lp, lp_change, grade, kills, deaths, assists, note)
     
     # Gestion des promotions/démotions avec correction LP
-    if new_lp_total >= 100 and not any(tier in current_rank for tier in ['Master', 'Grandmaster', 'Challenger']):
+    change = rank_change_available(current_rank, new_lp_total)
+    if change == 'promote':
         next_rank = get_next_rank(current_rank)
-        if next_rank != current_rank:
-            promote = input(f"🚀 {new_lp_total} LP - Promotion vers {colorize_rank(next_rank)} ? (o/N): ").strip().lower()
-            if promote == 'o':
-                start_lp = get_user_input(f"LP de départ en {next_rank}", int, lambda x: 0 <= x <= 100)
-                # Calculer le vrai changement LP pour la promotion
-                # LP pour atteindre 100 + LP de départ dans le nouveau rang
-                real_lp_change = (100 - current_lp) + start_lp
-                entry["lp_change"] = real_lp_change
-                entry["promote"] = {"to": next_rank, "start_lp": start_lp}
-                entry["rank"] = next_rank
-                entry["lp_total"] = start_lp
-                print(f"🎉 Félicitations pour votre promotion en {colorize_rank(next_rank)} !")
+        promote = input(f"🚀 {new_lp_total} LP - Promotion vers {colorize_rank(next_rank)} ? (o/N): ").strip().lower()
+        if promote == 'o':
+            start_lp = get_user_input(f"LP de départ en {next_rank}", int, lambda x: 0 <= x <= 100)
+            apply_rank_change(entry, current_lp, change, start_lp)
+            print(f"🎉 Félicitations pour votre promotion en {colorize_rank(next_rank)} !")
     
-    elif new_lp_total < 0:
+    elif change == 'demote':
         prev_rank = get_prev_rank(current_rank)
-        if prev_rank != current_rank:
-            demote = input(f"📉 {new_lp_total} LP - Démotion vers {colorize_rank(prev_rank)} ? (o/N): ").strip().lower()
-            if demote == 'o':
-                start_lp = get_user_input(f"LP de départ en {prev_rank}", int, lambda x: 0 <= x <= 100)
-                # Pour les démotions, lp_change doit rester négatif pour refléter que c'est une loss
-                # On garde le changement négatif original qui a causé la démotion
-                entry["demote"] = {"to": prev_rank, "start_lp": start_lp}
-                entry["rank"] = prev_rank
-                entry["lp_total"] = start_lp
-                print(f"💪 Pas de souci, on remonte depuis {colorize_rank(prev_rank)} !")
+        demote = input(f"📉 {new_lp_total} LP - Démotion vers {colorize_rank(prev_rank)} ? (o/N): ").strip().lower()
+        if demote == 'o':
+            start_lp = get_user_input(f"LP de départ en {prev_rank}", int, lambda x: 0 <= x <= 100)
+            apply_rank_change(entry, current_lp, change, start_lp)
+            print(f"💪 Pas de souci, on remonte depuis {colorize_rank(prev_rank)} !")
     
     data.append(entry)
     print(f"\n✅ Entrée ajoutée: {colorize_rank(entry['rank'])} - {entry['lp_total']} LP")
     return data
 
+def correction_target(data, args):
+    """Position visée par `e` / `d` : numéro de ligne du pager (défaut : dernière game)"""
+    if not data:
+        raise ValueError("historique vide")
+    text = args[0] if args else '-1'
+    try:
+        line = int(text)
+    except ValueError:
+        raise ValueError(f"numéro de ligne invalide '{text}'")
+    return history_position(data, line)
+
+def ask_correction(label, current, parse):
+    """Nouvelle valeur d'un champ (Entrée : inchangé)"""
+    while True:
+        text = input(f"{BOLD}🔸 {label} [{current}]: {RESET}").strip()
+        if not text:
+            return None
+        try:
+            return parse(text)
+        except ValueError as e:
+            print(f"❌ {e}")
+
+def print_correction(data, message, rewritten):
+    following = f", {rewritten - 1} entrée(s) suivante(s) re-chaînée(s)" if rewritten > 1 else ""
+    status = f"{colorize_rank(data[-1]['rank'])} - {data[-1]['lp_total']} LP" if data else "historique vide"
+    print(f"✅ {message}{following} · statut actuel: {status}")
+
+def prompt_edit_entry(data, args):
+    """Corrige une game : chaque champ est proposé avec sa valeur actuelle"""
+    try:
+        position = correction_target(data, args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    entry = data[position]
+    print(f"\n{BOLD}✏️  CORRIGER LA LIGNE {position + 1}{RESET} (Entrée : valeur inchangée)")
+    sys.stdout.write("\n".join(render_history_table([entry])) + "\n")
+    changes = {}
+    move = entry.get('promote') or entry.get('demote')
+    if isinstance(move, dict):
+        changes['start_lp'] = ask_correction("LP de départ", move.get('start_lp'), int)
+    if 'promote' not in entry:
+        changes['lp_change'] = ask_correction("Changement de LP", entry.get('lp_change', 0), int)
+    kda = f"{entry['kills']}/{entry['deaths']}/{entry['assists']}" if 'kills' in entry else 'N/A'
+    changes['kda'] = ask_correction("K/D/A", kda, parse_kda)
+    changes['grade'] = ask_correction("Grade", entry.get('grade', 'N/A'), parse_grade)
+    changes['note'] = ask_correction("Note ('-' pour l'effacer)", entry.get('note', ''),
+                                     lambda text: '' if text == '-' else text)
+    try:
+        rewritten = edit_entry(data, position, **changes)
+    except (OSError, ValueError) as e:
+        print(f"❌ Correction impossible: {e}")
+        return
+    if not rewritten:
+        print("ℹ️  Aucune modification")
+        return
+    print_correction(data, f"Ligne {position + 1} corrigée", rewritten)
+
+def prompt_delete_entry(data, args):
+    """Supprime une game après confirmation"""
+    try:
+        position = correction_target(data, args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    sys.stdout.write("\n".join(render_history_table([data[position]])) + "\n")
+    if input(f"🗑️  Supprimer la ligne {position + 1} ? (o/N): ").strip().lower() != 'o':
+        return
+    try:
+        rewritten = delete_entry(data, position)
+    except (OSError, ValueError) as e:
+        print(f"❌ Suppression impossible: {e}")
+        return
+    print_correction(data, f"Ligne {position + 1} supprimée", rewritten + 1)
+
+def undo_last_change(data):
+    """Annule la dernière correction ; retourne False en cas d'échec"""
+    try:
+        record = undo_change(data)
+    except (OSError, ValueError) as e:
+        print(f"❌ Annulation impossible: {e}", file=sys.stderr)
+        return False
+    if record is None:
+        print("↩️  Aucune correction à annuler")
+        return True
+    action = "Suppression" if record['action'] == 'delete' else "Correction"
+    print(f"↩️  {action} de la ligne {record['position'] + 1} ({record['at']}) annulée")
+    return True
+
 def show_help():
     """Affiche l'aide avec style"""
     help_text = f"""
@@ -360,7 +3344,21 @@ def show_help():
 ─────────────────────────────
 {BOLD}a{RESET} - ➕ Ajouter une entrée
 {BOLD}p{RESET} - 📊 Afficher l'historique
+{BOLD}v{RESET} - 📜 Parcourir tout l'historique (pages, dates, recherche)
+{BOLD}c [N|période]{RESET} - 📊 Courbe du ladder (tout, N dernières games ou période)
+{BOLD}r [N|Nj] [winrate|lp|kda|grade]{RESET} - 📉 Statistiques glissantes
+{BOLD}j [N] [tilt]{RESET} - 🕹️  Sessions de jeu (N dernières, ou seulement celles finies en tilt)
 {BOLD}s{RESET} - 📈 Statistiques
+{BOLD}s jour|semaine|mois|saison [date]{RESET} - 📅 Statistiques d'une période
+{BOLD}s AAAA-MM-JJ [AAAA-MM-JJ]{RESET} - 📅 Statistiques d'un jour ou d'un intervalle
+{BOLD}e [N]{RESET} - ✏️  Corriger une game (ligne N du pager, défaut: la dernière)
+{BOLD}d [N]{RESET} - 🗑️  Supprimer une game
+{BOLD}u{RESET} - ↩️  Annuler la dernière correction
+{BOLD}i{RESET} - 📥 Importer un fichier JSON/JSONL
+{BOLD}b{RESET} - 📦 Import en masse d'un journal de games (CSV/JSONL)
+{BOLD}o [rang]{RESET} - 🔮 Projection vers un rang (games nécessaires, chances avant la fin de saison)
+{BOLD}l{RESET} - 🏆 Classement de tous les profils
+{BOLD}x{RESET} - 📤 Exporter en JSON
 {BOLD}h{RESET} - ❓ Cette aide
 {BOLD}q{RESET} - 👋 Quitter et sauvegarder
 """
@@ -368,86 +3366,63 @@ def show_help():
 
 def calculate_streaks(data):
     """Calcule les win/lose streaks en se basant sur les vraies W/L pas les LP"""
-    if not data:
-        return {"current": 0, "best_win": 0, "worst_lose": 0, "type": "none"}
-    
-    current_streak = 0
-    best_win_streak = 0
-    worst_lose_streak = 0
-    streak_type = "none"
-    
-    # Streak actuel - on regarde depuis la fin
-    for entry in reversed(data):
-        lp_change = entry.get('lp_change', 0)
-        
-        # Les démotions comptent comme des losses même si elles ont une promotion/demotion flag
-        if 'demote' in entry:
-            # C'est une loss (démotion)
-            if current_streak <= 0:
-                current_streak -= 1
-                streak_type = "lose"
-            else:
-                break
-        elif 'promote' in entry:
-            # C'est une win (promotion)
-            if current_streak >= 0:
-                current_streak += 1
-                streak_type = "win"
-            else:
-                break
-        elif lp_change > 0:  # Win normale
-            if current_streak >= 0:
-                current_streak += 1
-                streak_type = "win"
-            else:
-                break
-        elif lp_change < 0:  # Loss normale
-            if current_streak <= 0:
-                current_streak -= 1
-                streak_type = "lose"
-            else:
-                break
-        # Ignorer les ±0 LP
-    
-    # Calcul des meilleurs streaks de toute la session
-    temp_streak = 0
-    for entry in data:
-        lp_change = entry.get('lp_change', 0)
-        
-        # Les démotions comptent comme des losses
-        if 'demote' in entry:
-            if temp_streak <= 0:
-                temp_streak -= 1
-            else:
-                temp_streak = -1
-            worst_lose_streak = min(worst_lose_streak, temp_streak)
-        elif 'promote' in entry:
-            if temp_streak >= 0:
-                temp_streak += 1
-            else:
-                temp_streak = 1
-            best_win_streak = max(best_win_streak, temp_streak)
-        elif lp_change > 0:  # Win
-            if temp_streak >= 0:
-                temp_streak += 1
-            else:
-                temp_streak = 1
-            best_win_streak = max(best_win_streak, temp_streak)
-        elif lp_change < 0:  # Loss
-            if temp_streak <= 0:
-                temp_streak -= 1
-            else:
-                temp_streak = -1
-            worst_lose_streak = min(worst_lose_streak, temp_streak)
-        # Ignorer les ±0 LP
+    if hasattr(data, 'streaks'):
+        return data.streaks()
     
+    # Règles de next_streak() : démotion = loss, promotion = win, ±0 LP ignorés
+    best_win_streak, worst_lose_streak, current_streak = streak_extremes(data)
     return {
         "current": abs(current_streak),
         "best_win": best_win_streak,
         "worst_lose": abs(worst_lose_streak),
-        "type": streak_type
+        "type": "win" if current_streak > 0 else "lose" if current_streak < 0 else "none"
     }
 
+def next_streak(streak, lp_change, promoted, demoted):
+    """Série (> 0 : victoires d'affilée, < 0 : défaites d'affilée) après une game. Une démotion
+    compte comme une défaite, une promotion comme une victoire ; ±0 LP laisse la série intacte."""
+    if demoted or (not promoted and lp_change < 0):
+        return streak - 1 if streak <= 0 else -1
+    if promoted or lp_change > 0:
+        return streak + 1 if streak >= 0 else 1
+    return streak
+
+def game_outcome(entry):
+    """1 pour une victoire, -1 pour une défaite, 0 sinon (règles de next_streak)"""
+    return next_streak(0, entry.get('lp_change', 0), 'promote' in entry, 'demote' in entry)
+
+def streak_run(data, position, step):
+    """Série de résultats identiques qui touche `position` (les ±0 LP ne l'interrompent pas),
+    lue dans le sens `step` (-1 : vers le début) jusqu'au premier résultat opposé.
+    Retourne ses entrées dans l'ordre de l'historique, et si elle atteint le bout de l'historique."""
+    run = []
+    sign = 0
+    total = len(data)
+    while 0 <= position < total:
+        if step > 0:
+            block = data[position:position + EDIT_READ_BLOCK]
+        else:
+            block = data[max(0, position - EDIT_READ_BLOCK + 1):position + 1][::-1]
+        for entry in block:
+            outcome = game_outcome(entry)
+            if outcome and sign and outcome != sign:
+                return (run if step > 0 else run[::-1]), False
+            sign = sign or outcome
+            run.append(entry)
+        position += step * len(block)
+    return (run if step > 0 else run[::-1]), True
+
+def streak_extremes(entries):
+    """Meilleure série de victoires, pire série de défaites (négative) et série finale"""
+    streak = best = worst = 0
+    for entry in entries:
+        streak = next_streak(streak, entry.get('lp_change', 0), 'promote' in entry, 'demote' in entry)
+        if streak < worst:
+            worst = streak
+        elif streak > best:
+            best = streak
+    return best, worst, streak
+
 def draw_winrate_chart(winrate):
     """Dessine un graphique de winrate en ASCII"""
     bar_length = 40
@@ -470,44 +3445,49 @@ def draw_winrate_chart(winrate):
     bar = "█" * filled + "░" * empty
     return f"{color}[{bar}] {winrate:.1f}% {icon}{RESET}"
 
-def draw_lp_trend(data, last_n=10):
-    """Dessine un graphique de tendance LP"""
-    if len(data) < 2:
+def ladder_label(position):
+    """Libellé lisible d'une position absolue sur le ladder"""
+    if position >= MASTER_ORDINAL * 100:
+        return f"Master+ {position - MASTER_ORDINAL * 100} LP"
+    ordinal, lp = divmod(position, 100)
+    return f"{RANKS[max(ordinal, 0)]} {lp} LP"
+
+def downsample_minmax(values, width):
+    """Réduit une série à `width` colonnes (min, max) en une passe : les pics et les creux
+    de chaque tranche sont conservés, contrairement à un simple échantillonnage"""
+    count = len(values)
+    if count <= width:
+        return [(value, value) for value in values]
+    columns = []
+    start = 0
+    for column in range(1, width + 1):
+        stop = column * count // width
+        bucket = values[start:stop]
+        columns.append((min(bucket), max(bucket)))
+        start = stop
+    return columns
+
+def chart_lines(columns, height, low, high):
+    """Lignes du graphique : chaque colonne est construite d'un bloc puis transposée"""
+    scale = (height - 1) / (high - low)
+    bars = []
+    for col_low, col_high in columns:
+        top = int((col_high - low) * scale)
+        bottom = int((col_low - low) * scale)
+        bars.append(" " * (height - 1 - top) + "●" * (top - bottom + 1) + "│" * bottom)
+    return ["".join(row) for row in zip(*bars)]
+
+def draw_chart(values, title, width=60, height=8, label=ladder_label):
+    """Graphique d'une série quelconque, sous-échantillonnée à la largeur demandée"""
+    if len(values) < 2:
         return "Pas assez de données"
+    columns = downsample_minmax(values, width)
+    low = min(col_low for col_low, _ in columns)
+    high = max(col_high for _, col_high in columns)
+    if high == low:
+        return f"{title}:\n{label(low)} stable " + "─" * len(columns)
     
-    # Prendre les derniers points
-    recent_data = data[-last_n:] if len(data) >= last_n else data
-    lp_values = [entry['lp_total'] for entry in recent_data]
-    
-    min_lp = min(lp_values)
-    max_lp = max(lp_values)
-    height = 8
-    width = min(len(lp_values), 30)
-    
-    if max_lp == min_lp:
-        return "LP stable " + "─" * width
-    
-    # Normaliser les valeurs
-    normalized = []
-    for lp in lp_values[-width:]:
-        norm = int((lp - min_lp) / (max_lp - min_lp) * (height - 1))
-        normalized.append(norm)
-    
-    # Dessiner le graphique
-    lines = []
-    for y in range(height - 1, -1, -1):
-        line = ""
-        for x, norm_val in enumerate(normalized):
-            if norm_val == y:
-                line += "●"
-            elif norm_val > y:
-                line += "│"
-            else:
-                line += " "
-        lines.append(line)
-    
-    # Couleur selon la tendance
-    trend = lp_values[-1] - lp_values[0]
+    trend = values[-1] - values[0]
     if trend > 0:
         color = '\033[92m'  # Vert
         arrow = "📈"
@@ -518,15 +3498,27 @@ def draw_lp_trend(data, last_n=10):
         color = '\033[93m'  # Jaune
         arrow = "➡️"
     
-    result = f"{arrow} Tendance LP (dernières {width} games):\n"
-    for line in lines:
-        result += f"    {color}{line}{RESET}\n"
+    lines = chart_lines(columns, height, low, high)
+    result = [f"{arrow} {title}:"]
+    result.extend(f"    {color}{line}{RESET}" for line in lines)
+    result[1] += f"  {label(high)}"
+    result[-1] += f"  {label(low)}"
+    return "\n".join(result)
+
+def draw_lp_trend(data, last_n=10):
+    """Dessine un graphique de tendance LP (position absolue : une promotion reste une hausse)"""
+    if len(data) < 2:
+        return "Pas assez de données"
     
-    result += f"    {min_lp} LP {' ' * (width-10)} {max_lp} LP"
-    return result
+    ladder = ladder_window(data, last_n)
+    net_lp = range_stats(data, -len(ladder))['lp']
+    return draw_chart(ladder, f"Tendance LP (dernières {len(ladder)} games, {net_lp:+d} LP)", width=30)
 
 def get_rank_distribution(data):
     """Calcule la distribution des rangs"""
+    if hasattr(data, 'rank_distribution'):
+        return data.rank_distribution()
+    
     ranks = {}
     for entry in data:
         rank = entry['rank']
@@ -536,6 +3528,9 @@ def get_rank_distribution(data):
 
 def calculate_kda_stats(data):
     """Calcule les statistiques KDA"""
+    if hasattr(data, 'kda_stats'):
+        return data.kda_stats()
+    
     entries_with_kda = [e for e in data if 'kills' in e]
     if not entries_with_kda:
         return None
@@ -571,32 +3566,18 @@ def calculate_kda_stats(data):
         'exceptional_games': exceptional_games
     }
 
-def calculate_grade_stats(data):
-    """Calcule les statistiques de grades"""
-    entries_with_grade = [e for e in data if 'grade' in e and e['grade'] != 'N/A']
-    if not entries_with_grade:
+def grade_stats_from_counts(grade_counts):
+    """Construit les statistiques de grades à partir de la distribution"""
+    games_count = sum(grade_counts.values())
+    if not games_count:
         return None
     
-    # Distribution des grades
-    grade_counts = {}
-    for entry in entries_with_grade:
-        grade = entry['grade']
-        grade_counts[grade] = grade_counts.get(grade, 0) + 1
-    
     # Convertir les grades en points pour calculer la moyenne
-    grade_points = {
-        'S+': 13, 'S': 12, 'S-': 11,
-        'A+': 10, 'A': 9, 'A-': 8,
-        'B+': 7, 'B': 6, 'B-': 5,
-        'C+': 4, 'C': 3, 'C-': 2,
-        'D+': 1, 'D': 0, 'D-': -1
-    }
-    
-    total_points = sum(grade_points.get(e['grade'], 0) for e in entries_with_grade)
-    avg_grade_points = total_points / len(entries_with_grade)
+    total_points = sum(GRADE_POINTS.get(grade, 0) * count for grade, count in grade_counts.items())
+    avg_grade_points = total_points / games_count
     
     # Reconvertir en grade moyen approximatif
-    for grade, points in sorted(grade_points.items(), key=lambda x: x[1], reverse=True):
+    for grade, points in sorted(GRADE_POINTS.items(), key=lambda x: x[1], reverse=True):
         if avg_grade_points >= points:
             avg_grade = grade
             break
@@ -604,12 +3585,292 @@ def calculate_grade_stats(data):
         avg_grade = 'D-'
     
     return {
-        'games_count': len(entries_with_grade),
+        'games_count': games_count,
         'grade_counts': grade_counts,
         'avg_grade': avg_grade,
         'avg_grade_points': avg_grade_points
     }
 
+def calculate_grade_stats(data):
+    """Calcule les statistiques de grades"""
+    if hasattr(data, 'grade_counts'):
+        # Backend SQLite (méthode) ou StatsAccumulator (distribution déjà tenue à jour)
+        counts = data.grade_counts
+        return grade_stats_from_counts(counts() if callable(counts) else dict(counts))
+    
+    # Distribution des grades
+    grade_counts = {}
+    for entry in data:
+        grade = entry.get('grade', 'N/A')
+        if grade != 'N/A':
+            grade_counts[grade] = grade_counts.get(grade, 0) + 1
+    
+    return grade_stats_from_counts(grade_counts)
+
+class StatsAccumulator:
+    """Accumule en un seul passage tous les chiffres affichés par show_stats()"""
+
+    def __init__(self):
+        self.total_games = 0
+        self.total_lp_gained = 0
+        self.wins = 0
+        self.losses = 0
+        self.lp_won = 0
+        self.lp_lost = 0
+        self.promotions = 0
+        self.demotions = 0
+        self.streak = 0          # > 0 : victoires d'affilée, < 0 : défaites d'affilée
+        self.best_win = 0
+        self.worst_lose = 0
+        self.rank_counts = {}
+        self.kda_games = 0
+        self.total_kills = 0
+        self.total_deaths = 0
+        self.total_assists = 0
+        self.best_kda = None
+        self.worst_kda = None
+        self.exceptional_games = 0
+        self.grade_counts = {}
+        self.peak_position = None  # meilleure position absolue sur le ladder
+        self.peak_rank = None
+        self.peak_lp = None
+
+    def add(self, entry):
+        """Intègre une entrée dans tous les compteurs"""
+        lp_change = entry.get('lp_change', 0)
+        promoted = 'promote' in entry
+        demoted = 'demote' in entry
+        
+        self.total_games += 1
+        self.total_lp_gained += lp_change
+        if lp_change > 0:
+            self.wins += 1
+            self.lp_won += lp_change
+        elif lp_change < 0:
+            self.losses += 1
+            self.lp_lost += lp_change
+        if promoted:
+            self.promotions += 1
+        if demoted:
+            self.demotions += 1
+        
+        # Streaks : règles de next_streak()
+        self.streak = streak = next_streak(self.streak, lp_change, promoted, demoted)
+        if streak < self.worst_lose:
+            self.worst_lose = streak
+        elif streak > self.best_win:
+            self.best_win = streak
+        
+        rank = entry['rank']
+        self.rank_counts[rank] = self.rank_counts.get(rank, 0) + 1
+        position = absolute_lp(rank, entry['lp_total'])
+        if self.peak_position is None or position > self.peak_position:
+            self.peak_position = position
+            self.peak_rank = rank
+            self.peak_lp = entry['lp_total']
+        
+        if 'kills' in entry:
+            kills = entry['kills']
+            assists = entry['assists']
+            deaths = entry['deaths']
+            self.kda_games += 1
+            self.total_kills += kills
+            self.total_deaths += deaths
+            self.total_assists += assists
+            ratio = (kills + assists) / max(deaths, 1)
+            if self.best_kda is None or ratio > self.best_kda:
+                self.best_kda = ratio
+            if self.worst_kda is None or ratio < self.worst_kda:
+                self.worst_kda = ratio
+            if kills >= 15:
+                self.exceptional_games += 1
+        
+        grade = entry.get('grade', 'N/A')
+        if grade != 'N/A':
+            self.grade_counts[grade] = self.grade_counts.get(grade, 0) + 1
+
+    def add_all(self, entries):
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    def discard(self, entry):
+        """Retire une entrée des compteurs (records et séries : voir replace)"""
+        lp_change = entry.get('lp_change', 0)
+        self.total_games -= 1
+        self.total_lp_gained -= lp_change
+        if lp_change > 0:
+            self.wins -= 1
+            self.lp_won -= lp_change
+        elif lp_change < 0:
+            self.losses -= 1
+            self.lp_lost -= lp_change
+        if 'promote' in entry:
+            self.promotions -= 1
+        if 'demote' in entry:
+            self.demotions -= 1
+        rank = entry['rank']
+        self.rank_counts[rank] -= 1
+        if not self.rank_counts[rank]:
+            del self.rank_counts[rank]
+        if 'kills' in entry:
+            self.kda_games -= 1
+            self.total_kills -= entry['kills']
+            self.total_deaths -= entry['deaths']
+            self.total_assists -= entry['assists']
+            if entry['kills'] >= 15:
+                self.exceptional_games -= 1
+        grade = entry.get('grade', 'N/A')
+        if grade != 'N/A':
+            self.grade_counts[grade] -= 1
+            if not self.grade_counts[grade]:
+                del self.grade_counts[grade]
+
+    def replace(self, old, new, before=(), after=(), at_end=False):
+        """Remplace des entrées déjà comptées par `new` sans repasser sur tout l'historique.
+        `before` / `after` : séries de résultats qui les encadrent (voir streak_run), `at_end` :
+        elles touchent la série en cours. Retourne False si un record (pic, meilleur ou pire KDA,
+        plus longue série) a pu disparaître avec `old` : tout est alors à recompter."""
+        
+        def kda_ratio(entry):
+            return (entry['kills'] + entry['assists']) / max(entry['deaths'], 1)
+        
+        peak, best_kda, worst_kda = self.peak_position, self.best_kda, self.worst_kda
+        lost = set()
+        for entry in old:
+            self.discard(entry)
+            if absolute_lp(entry['rank'], entry['lp_total']) == peak:
+                lost.add('peak')
+            if 'kills' in entry:
+                ratio = kda_ratio(entry)
+                if ratio == best_kda:
+                    lost.add('best_kda')
+                if ratio == worst_kda:
+                    lost.add('worst_kda')
+        streak, best_win, worst_lose = self.streak, self.best_win, self.worst_lose
+        for entry in new:
+            self.add(entry)
+        self.streak, self.best_win, self.worst_lose = streak, best_win, worst_lose
+        ratios = [kda_ratio(entry) for entry in new if 'kills' in entry]
+        # Un record retiré reste valable si une nouvelle entrée l'atteint
+        if 'peak' in lost and not any(absolute_lp(entry['rank'], entry['lp_total']) >= peak for entry in new):
+            return False
+        if 'best_kda' in lost and not any(ratio >= best_kda for ratio in ratios):
+            return False
+        if 'worst_kda' in lost and not any(ratio <= worst_kda for ratio in ratios):
+            return False
+        # Les séries hors de la fenêtre before + old + after ne changent pas
+        old_best, old_worst, _ = streak_extremes([*before, *old, *after])
+        new_best, new_worst, current = streak_extremes([*before, *new, *after])
+        if (old_best == self.best_win and new_best < old_best) or (old_worst == self.worst_lose and new_worst > old_worst):
+            return False
+        self.best_win = max(self.best_win, new_best)
+        self.worst_lose = min(self.worst_lose, new_worst)
+        if at_end:
+            self.streak = current
+        return True
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, state):
+        acc = cls()
+        for key in vars(acc):
+            setattr(acc, key, state[key])
+        return acc
+
+    def basic_stats(self):
+        return {
+            'total_games': self.total_games,
+            'total_lp_gained': self.total_lp_gained,
+            'wins': self.wins,
+            'losses': self.losses,
+            'promotions': self.promotions,
+            'demotions': self.demotions,
+            'lp_won': self.lp_won,
+            'lp_lost': self.lp_lost
+        }
+
+    def streaks(self):
+        if self.streak > 0:
+            streak_type = "win"
+        elif self.streak < 0:
+            streak_type = "lose"
+        else:
+            streak_type = "none"
+        return {
+            "current": abs(self.streak),
+            "best_win": self.best_win,
+            "worst_lose": abs(self.worst_lose),
+            "type": streak_type
+        }
+
+    def rank_distribution(self):
+        return sorted(self.rank_counts.items(), key=lambda x: x[1], reverse=True)
+
+    def kda_stats(self):
+        games_count = self.kda_games
+        if not games_count:
+            return None
+        avg_kills = self.total_kills / games_count
+        avg_deaths = self.total_deaths / games_count
+        avg_assists = self.total_assists / games_count
+        return {
+            'games_count': games_count,
+            'avg_kills': avg_kills,
+            'avg_deaths': avg_deaths,
+            'avg_assists': avg_assists,
+            'avg_kda': (avg_kills + avg_assists) / max(avg_deaths, 0.1),
+            'total_kills': self.total_kills,
+            'total_deaths': self.total_deaths,
+            'total_assists': self.total_assists,
+            'best_kda': self.best_kda,
+            'worst_kda': self.worst_kda,
+            'exceptional_games': self.exceptional_games
+        }
+
+    def grade_stats(self):
+        return grade_stats_from_counts(dict(self.grade_counts))
+
+    def peak(self):
+        if self.peak_rank is None:
+            return None
+        return {'rank': self.peak_rank, 'lp_total': self.peak_lp}
+
+    def report(self):
+        """Toutes les sections de show_stats()"""
+        return {
+            'basics': self.basic_stats(),
+            'streaks': self.streaks(),
+            'rank_distribution': self.rank_distribution(),
+            'peak': self.peak(),
+            'kda': self.kda_stats(),
+            'grades': self.grade_stats()
+        }
+
+def collect_stats(data):
+    """Calcule toutes les sections de show_stats() (un seul parcours de l'historique)"""
+    if hasattr(data, 'stats'):
+        # Statistiques tenues à jour par l'historique (cache persistant)
+        return data.stats().report()
+    if hasattr(data, 'basic_stats'):
+        # Le backend agrège lui-même (requêtes SQLite)
+        report = {}
+        with phase('stats.basics'):
+            report['basics'] = data.basic_stats()
+        with phase('stats.streaks'):
+            report['streaks'] = calculate_streaks(data)
+        with phase('stats.ranks'):
+            report['rank_distribution'] = get_rank_distribution(data)
+            report['peak'] = data.peak()
+        with phase('stats.kda'):
+            report['kda'] = calculate_kda_stats(data)
+        with phase('stats.grades'):
+            report['grades'] = calculate_grade_stats(data)
+        return report
+    return StatsAccumulator().add_all(data).report()
+
 def show_stats(data):
     """Affiche des statistiques ultra sexy avec graphiques ASCII"""
     if not data:
@@ -620,22 +3881,27 @@ def show_stats(data):
     print(f"║                    📊 STATISTIQUES DÉTAILLÉES                ║")
     print(f"╚══════════════════════════════════════════════════════════════╝{RESET}")
     
+    # Toutes les sections en un seul passage
+    with phase('stats.collect'):
+        report = collect_stats(data)
+    
     # Calculs de base
-    total_games = len(data)
-    total_lp_gained = sum(entry.get('lp_change', 0) for entry in data)
-    wins = len([e for e in data if e.get('lp_change', 0) > 0])
-    losses = len([e for e in data if e.get('lp_change', 0) < 0])
-    promotions = len([e for e in data if 'promote' in e])
-    demotions = len([e for e in data if 'demote' in e])
+    basics = report['basics']
+    total_games = basics['total_games']
+    total_lp_gained = basics['total_lp_gained']
+    wins = basics['wins']
+    losses = basics['losses']
+    promotions = basics['promotions']
+    demotions = basics['demotions']
     winrate = (wins / total_games * 100) if total_games > 0 else 0
     
     # LP par game
     avg_lp_per_game = total_lp_gained / total_games if total_games > 0 else 0
-    avg_lp_win = sum(e.get('lp_change', 0) for e in data if e.get('lp_change', 0) > 0) / wins if wins > 0 else 0
-    avg_lp_loss = sum(e.get('lp_change', 0) for e in data if e.get('lp_change', 0) < 0) / losses if losses > 0 else 0
+    avg_lp_win = basics['lp_won'] / wins if wins > 0 else 0
+    avg_lp_loss = basics['lp_lost'] / losses if losses > 0 else 0
     
     # Streaks
-    streaks = calculate_streaks(data)
+    streaks = report['streaks']
     
     print(f"\n{BOLD}🎮 STATISTIQUES GÉNÉRALES{RESET}")
     print("═" * 60)
@@ -672,7 +3938,8 @@ def show_stats(data):
     # Graphique de tendance
     print(f"\n{BOLD}📊 TENDANCE LP{RESET}")
     print("═" * 60)
-    trend_chart = draw_lp_trend(data)
+    with phase('stats.trend'):
+        trend_chart = draw_lp_trend(data)
     for line in trend_chart.split('\n'):
         if line.strip():
             print(f"  {line}")
@@ -680,21 +3947,25 @@ def show_stats(data):
     # Distribution des rangs
     print(f"\n{BOLD}🏅 DISTRIBUTION DES RANGS{RESET}")
     print("═" * 60)
-    rank_dist = get_rank_distribution(data)
+    rank_dist = report['rank_distribution']
     for rank, count in rank_dist[:5]:  # Top 5 des rangs
         percentage = (count / total_games * 100)
         bar_length = int(percentage / 100 * 20)
         bar = "█" * bar_length + "░" * (20 - bar_length)
         colored_rank = colorize_rank(rank)
         print(f"  {colored_rank:<30} │ {bar} {percentage:>5.1f}% ({count} games)")
+    if report['peak']:
+        peak = report['peak']
+        print(f"  Meilleur rang atteint │ {colorize_rank(peak['rank'])} - {BOLD}{peak['lp_total']} LP{RESET}")
     
     print(f"\n{BOLD}🎯 PERFORMANCES RÉCENTES (10 dernières games){RESET}")
     print("═" * 60)
-    recent = data[-10:] if len(data) >= 10 else data
-    recent_wins = len([e for e in recent if e.get('lp_change', 0) > 0])
-    recent_losses = len([e for e in recent if e.get('lp_change', 0) < 0])
-    recent_winrate = (recent_wins / len(recent) * 100) if recent else 0
-    recent_lp = sum(e.get('lp_change', 0) for e in recent)
+    with phase('stats.recent'):
+        recent = range_stats(data, -10)
+    recent_wins = recent['wins']
+    recent_losses = recent['losses']
+    recent_winrate = recent['winrate']
+    recent_lp = recent['lp']
     
     # Forme récente
     if recent_winrate >= 70:
@@ -711,7 +3982,7 @@ def show_stats(data):
     print(f"  Forme             │ {form}")
     
     # Statistiques KDA
-    kda_stats = calculate_kda_stats(data)
+    kda_stats = report['kda']
     if kda_stats:
         print(f"\n{BOLD}⚔️  STATISTIQUES KDA{RESET}")
         print("═" * 60)
@@ -728,7 +3999,7 @@ def show_stats(data):
             print(f"  Games exceptionnelles │ {BOLD}\033[93m{kda_stats['exceptional_games']} (15+ kills) ⭐{RESET}")
     
     # Statistiques de grades
-    grade_stats = calculate_grade_stats(data)
+    grade_stats = report['grades']
     if grade_stats:
         print(f"\n{BOLD}🏆 STATISTIQUES GRADES{RESET}")
         print("═" * 60)
@@ -740,8 +4011,7 @@ def show_stats(data):
         print("═" * 60)
         
         # Trier les grades par ordre décroissant de qualité
-        grade_order = ['S+', 'S', 'S-', 'A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-']
-        for grade in grade_order:
+        for grade in GRADE_ORDER:
             if grade in grade_stats['grade_counts']:
                 count = grade_stats['grade_counts'][grade]
                 percentage = (count / grade_stats['games_count'] * 100)
@@ -751,50 +4021,870 @@ def show_stats(data):
                 print("  %-12s │ %s %5.1f%% (%2d)" % (colored_grade, bar, percentage, count))
     print("═" * 60)
 
+def parse_period(args, now=None):
+    """Interprète une période : jour, semaine, mois, saison ou deux dates.
+    Retourne (début, fin exclue, libellé)."""
+    now = now or datetime.now()
+    today = datetime(now.year, now.month, now.day)
+    
+    def parse_day(text):
+        try:
+            return datetime.strptime(text, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"date invalide '{text}' (format attendu: AAAA-MM-JJ)")
+    
+    if not args:
+        raise ValueError("période manquante")
+    keyword = args[0].lower()
+    rest = args[1:]
+    if keyword in ('jour', 'day', 'today'):
+        day = parse_day(rest[0]) if rest else today
+        return day, day + timedelta(days=1), day.strftime("%Y-%m-%d")
+    if keyword in ('semaine', 'week'):
+        day = parse_day(rest[0]) if rest else today
+        monday = day - timedelta(days=day.weekday())
+        return monday, monday + timedelta(days=7), f"semaine du {monday.strftime('%Y-%m-%d')}"
+    if keyword in ('mois', 'month'):
+        try:
+            first = datetime.strptime(rest[0], "%Y-%m") if rest else today.replace(day=1)
+        except ValueError:
+            raise ValueError(f"mois invalide '{rest[0]}' (format attendu: AAAA-MM)")
+        following = first.replace(year=first.year + 1, month=1) if first.month == 12 else first.replace(month=first.month + 1)
+        return first, following, first.strftime("%Y-%m")
+    if keyword in ('saison', 'season'):
+        try:
+            year = int(rest[0]) if rest else today.year
+        except ValueError:
+            raise ValueError(f"saison invalide '{rest[0]}' (attendu: une année)")
+        return datetime(year, 1, 1), datetime(year + 1, 1, 1), f"saison {year}"
+    start = parse_day(args[0])
+    end = parse_day(args[1]) if len(args) > 1 else start
+    if end < start:
+        raise ValueError("la date de fin précède la date de début")
+    label = start.strftime("%Y-%m-%d") if end == start else f"{start.strftime('%Y-%m-%d')} → {end.strftime('%Y-%m-%d')}"
+    return start, end + timedelta(days=1), label
+
+def show_period_stats(data, args):
+    """Statistiques complètes restreintes à une période"""
+    try:
+        start, end, label = parse_period(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    entries = entries_between(data, start, end)
+    if not entries:
+        print(f"📊 Aucune partie sur la période {label}")
+        return
+    print(f"\n📅 Période : {BOLD}{label}{RESET} ({len(entries)} games)")
+    show_stats(entries)
+
+def grade_from_points(points):
+    """Grade correspondant à une moyenne de points (même arrondi que grade_stats_from_counts)"""
+    return GRADE_BY_POINTS[max(-1, min(13, int(points // 1)))]
+
+ROLLING_LABELS = {
+    'winrate': ("Winrate", lambda value: f"{value:.1f}%"),
+    'lp': ("LP/game", lambda value: f"{value:+.1f} LP"),
+    'kda': ("KDA", lambda value: f"{value:.2f}"),
+    'grade': ("Grade moyen", lambda value: f"{grade_from_points(value)} ({value:.1f} pts)"),
+}
+
+def parse_window(text):
+    """Fenêtre glissante : '50' (games) ou '30j' / '30d' (jours)"""
+    unit = text[-1:].lower()
+    count = text[:-1] if unit in ('j', 'd') else text
+    if not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"fenêtre invalide '{text}' (attendu: N games ou Nj)")
+    if unit in ('j', 'd'):
+        return {'days': int(count)}, f"{count} jours"
+    return {'games': int(count)}, f"{count} games"
+
+def show_rolling_stats(data, args):
+    """Analyses glissantes : résumé des fenêtres par défaut, ou détail et courbe d'une fenêtre"""
+    if len(data) < 2:
+        print(f"{BOLD}📊 Pas assez de données{RESET}")
+        return
+    
+    if not args:
+        print(f"\n{BOLD}{UNDERLINE}📉 FENÊTRES GLISSANTES (valeur actuelle){RESET}")
+        header = "  Fenêtre      │ " + " │ ".join(f"{ROLLING_LABELS[metric][0]:<16}" for metric in ROLLING_METRICS)
+        print(header)
+        print("  " + "─" * (len(header) - 2))
+        sums = prefix_index(data).sums
+        total = len(data)
+        for games in ROLLING_WINDOWS:
+            # Seule la dernière fenêtre est affichée : une seule différence de sommes cumulées
+            series = window_metrics(sums, [max(0, total - games)], [total])
+            cells = []
+            for metric in ROLLING_METRICS:
+                value = series[metric][-1]
+                cells.append(f"{ROLLING_LABELS[metric][1](value) if value is not None else 'N/A':<16}")
+            print(f"  {games:>3} games    │ " + " │ ".join(cells))
+        print(f"\n  Détail et courbe : {BOLD}r <N|Nj> [winrate|lp|kda|grade]{RESET}")
+        return
+    
+    try:
+        window, label = parse_window(args[0])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    metric = args[1].lower() if len(args) > 1 else 'winrate'
+    if metric not in ROLLING_LABELS:
+        print(f"❌ Métrique inconnue '{metric}' (winrate, lp, kda, grade)")
+        return
+    
+    series = rolling_series(data, **window)
+    print(f"\n{BOLD}{UNDERLINE}📉 FENÊTRE GLISSANTE : {label}{RESET}")
+    for name in ROLLING_METRICS:
+        title, fmt = ROLLING_LABELS[name]
+        values = [value for value in series[name] if value is not None]
+        if not values:
+            print(f"  {title:<12} │ N/A")
+            continue
+        print(f"  {title:<12} │ actuel {BOLD}{fmt(values[-1])}{RESET} · meilleur {fmt(max(values))} · pire {fmt(min(values))}")
+    
+    values = [value for value in series[metric] if value is not None]
+    title, fmt = ROLLING_LABELS[metric]
+    width = max(20, min(len(values), terminal_size().columns - 30))
+    print()
+    print(draw_chart(values, f"{title} glissant ({label})", width=width, label=fmt))
+
+def ladder_values(data, start=0, stop=None):
+    """Positions absolues d'une plage d'entrées, lues dans la série précalculée"""
+    return history_index(data, LadderSeries).values[start:stop]
+
+def show_ladder_chart(data, args):
+    """Courbe de la position sur le ladder : tout l'historique, les N dernières games ou une période"""
+    total = len(data)
+    label = "tout l'historique"
+    if not args:
+        values = ladder_values(data)
+    elif len(args) == 1 and args[0].isdigit():
+        count = min(int(args[0]), total)
+        values = ladder_values(data, total - count)
+        label = f"{count} dernières games"
+    else:
+        try:
+            start, end, label = parse_period(args)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        positions = history_index(data, TimestampIndex).positions(datetime_seconds(start), datetime_seconds(end))
+        if isinstance(positions, range):
+            values = ladder_values(data, positions.start, positions.stop)
+        else:
+            series = ladder_values(data)
+            values = [series[i] for i in positions]
+    
+    width = max(20, min(len(values), terminal_size().columns - 30))
+    print(f"\n{BOLD}📊 POSITION SUR LE LADDER{RESET}")
+    print("═" * 60)
+    print(draw_chart(values, f"{label} ({len(values)} games)", width=width))
+
+def show_sessions(data, last=SESSIONS_SHOWN, tilted_only=False):
+    """Sessions de jeu (les plus récentes d'abord) : games, W/L, LP, KDA, grade, rang atteint, tilt"""
+    if not data:
+        print(f"{BOLD}📊 Aucune donnée à afficher{RESET}")
+        return
+    with phase('sessions'):
+        sessions = history_index(data, SessionIndex).sessions
+    tilted = sum(1 for session in sessions if session.tilted)
+    shown = [session for session in sessions if session.tilted] if tilted_only else sessions
+    shown = shown[-last:] if last > 0 else []
+    
+    lines = [
+        f"\n{BOLD}{UNDERLINE}🕹️  SESSIONS DE JEU{RESET} ({len(sessions)} sessions, "
+        f"{len(data) / len(sessions):.1f} games en moyenne, {tilted} terminées en tilt "
+        f"({tilted / len(sessions) * 100:.0f}%))",
+        "─" * 110,
+        f"{'Début':<17} {'Durée':<7} {'Games':<6} {'W/L':<8} {'LP':<9} {'KDA':<6} {'Grade':<8} {'Rang atteint':<28} Fin",
+        "─" * 110
+    ]
+    for session in reversed(shown):
+        minutes = (session.last_seconds - session.first_seconds) // 60
+        kda = session.kda
+        grade_points = session.avg_grade_points
+        grade = grade_from_points(grade_points) if grade_points is not None else 'N/A'
+        if session.tilted:
+            end = f"🥵 tilt ({-session.streak} défaites)"
+        elif session.streak > 1:
+            end = f"🔥 {session.streak} victoires"
+        else:
+            end = ""
+        lines.append(f"{format_timestamp(session.first_seconds)[:16]:<17} {f'{minutes // 60}h{minutes % 60:02d}':<7} "
+                     f"{session.games:<6} {f'{session.wins}/{session.losses}':<8} {lp_change_cell(session.lp, 9)} "
+                     f"{f'{kda:.2f}' if kda is not None else 'N/A':<6} {grade_cell(grade)} "
+                     f"{rank_cell(session.rank)} {str(session.lp_total) + ' LP':<7} {end}")
+    lines.append("─" * 110)
+    if tilted_only and not shown:
+        lines.append("  Aucune session terminée en tilt 🎉")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def parse_grade(text):
+    """Grade S+ ... D- (minuscules acceptées)"""
+    grade = text.upper()
+    if grade not in GRADE_ORDER:
+        raise ValueError(f"Grade invalide '{text}' (S+ ... D-)")
+    return grade
+
+def parse_kda(text):
+    """KDA au format K/D/A (entiers positifs)"""
+    parts = text.split('/')
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        raise ValueError(f"KDA invalide '{text}' (format attendu: K/D/A)")
+    return tuple(int(part) for part in parts)
+
+PROJECTION_SIMULATIONS = 200000  # Trajectoires simulées par défaut
+PROJECTION_SAMPLE = 200          # Games récentes d'où sont tirés les gains/pertes de LP et le winrate
+PROJECTION_FORM_WEIGHT = 0.25    # Poids de la forme récente (10 dernières games) dans le winrate simulé
+PROJECTION_MAX_GAMES = 2000      # Horizon d'une trajectoire (en games)
+PROJECTION_BATCH = 5000          # Trajectoires par lot (un lot = une tâche du pool, une graine)
+PROJECTION_TABLE_BITS = 16       # Tirage d'un résultat de game : 2 octets aléatoires -> table de 65536 cases
+PROJECTION_DEFAULT_LP = (20, -20)  # Gain/perte par défaut si l'échantillon n'a aucune victoire/défaite
+
+def projection_inputs(data, winrate=None):
+    """Paramètres de la projection tirés de l'historique : position actuelle, gains et pertes de LP
+    des dernières games (hors promotions, dont le LP est recalculé), winrate de l'échantillon
+    mélangé à la forme récente (mêmes fenêtres que show_stats())"""
+    current = data[-1]
+    sample = data[-PROJECTION_SAMPLE:]
+    wins = [entry['lp_change'] for entry in sample if entry.get('lp_change', 0) > 0 and 'promote' not in entry]
+    losses = [entry['lp_change'] for entry in sample if entry.get('lp_change', 0) < 0]
+    sample_winrate = range_stats(data, -PROJECTION_SAMPLE)['winrate']
+    form_winrate = range_stats(data, -10)['winrate']
+    if winrate is None:
+        winrate = (1 - PROJECTION_FORM_WEIGHT) * sample_winrate + PROJECTION_FORM_WEIGHT * form_winrate
+    return {
+        'rank': current['rank'],
+        'lp_total': current['lp_total'],
+        'position': max(absolute_lp(current['rank'], current['lp_total']), 0),
+        'wins': wins or [PROJECTION_DEFAULT_LP[0]],
+        'losses': losses or [PROJECTION_DEFAULT_LP[1]],
+        'winrate': min(max(winrate, 0.0), 100.0),
+        'sample_winrate': sample_winrate,
+        'form_winrate': form_winrate,
+    }
+
+def increment_table(wins, losses, winrate):
+    """Table de tirage : case tirée uniformément -> variation de LP d'une game. Les cases de victoire
+    (proportion = winrate) parcourent les gains observés, les autres les pertes observées."""
+    size = 1 << PROJECTION_TABLE_BITS
+    win_slots = round(size * winrate / 100)
+    table = [wins[slot * len(wins) // win_slots] for slot in range(win_slots)]
+    loss_slots = size - win_slots
+    table.extend(losses[slot * len(losses) // loss_slots] for slot in range(loss_slots))
+    return table
+
+def simulate_batch(table, start, target, horizon, count, seed):
+    """Simule `count` trajectoires sur le ladder ; retourne pour chacune la game où la cible est
+    atteinte (0 : pas dans l'horizon). Avec les LP reportés d'une division à l'autre (carried_start_lp),
+    promotions et démotions laissent la position absolue inchangée : la trajectoire est une marche sur
+    ordinal * 100 + LP, bornée à 0 (Iron IV). Les games sont tirées par blocs et cumulées par des
+    fonctions C (randbytes, map, accumulate, max), sans boucle Python par game."""
+    import random  # import paresseux : inutile hors projection
+    rng = random.Random(seed)
+    draw = table.__getitem__
+    floored = lambda position, step: max(position + step, 0)
+    worst = min(table)
+    drift = sum(table) / len(table)
+    # Premier bloc à la taille attendue de la trajectoire (+20 %), puis doublé
+    first_block = min(max(int((target - start) / drift * 1.2), 16), 1024) if drift > 0 else 256
+    hits = array('i')
+    for _ in range(count):
+        position = start
+        played = 0
+        hit = 0
+        block = first_block
+        while played < horizon:
+            size = min(block, horizon - played)
+            block = min(block * 2, 1024)
+            positions = list(accumulate(map(draw, memoryview(rng.randbytes(2 * size)).cast('H')), initial=position))
+            if position + worst * size < 0 and min(positions) < 0:
+                # Plancher atteint (rare) : on recumule les mêmes games en bornant à 0
+                steps = [after - before for before, after in zip(positions, positions[1:])]
+                positions = list(accumulate(steps, floored, initial=position))
+            if max(positions) >= target:
+                hit = played + bisect_left(list(accumulate(positions, max)), target)
+                break
+            position = positions[-1]
+            played += size
+        hits.append(hit)
+    return hits
+
+def run_projection(table, start, target, horizon, simulations, seed=0, jobs=None):
+    """Toutes les trajectoires, par lots répartis sur un pool de processus. Chaque lot a sa propre
+    graine (dérivée de `seed`) : le résultat ne dépend pas du nombre de processus."""
+    batches = [(table, start, target, horizon, min(PROJECTION_BATCH, simulations - first), seed * 1000003 + number)
+               for number, first in enumerate(range(0, simulations, PROJECTION_BATCH))]
+    if jobs == 1 or len(batches) < 2:
+        results = [simulate_batch(*batch) for batch in batches]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(simulate_batch, *zip(*batches)))
+    hits = array('i')
+    for result in results:
+        hits.extend(result)
+    return hits
+
+def games_per_day(data, days=30):
+    """Rythme de jeu récent : games des `days` derniers jours de l'historique, par jour"""
+    last_seconds = entry_seconds(data[-1])
+    return (len(data) - find_position_by_time(data, last_seconds - days * 86400)) / days
+
+def show_projection(data, target_rank=None, simulations=PROJECTION_SIMULATIONS, seed=0, jobs=None,
+                    winrate=None, daily_games=None, season_end=None):
+    """Projection Monte Carlo : games nécessaires pour atteindre un rang, et probabilité
+    de l'atteindre avant la fin de saison"""
+    if len(data) < 2:
+        print(f"{BOLD}📊 Pas assez de données{RESET}")
+        return
+    inputs = projection_inputs(data, winrate)
+    if target_rank is None:
+        target_rank = get_next_rank(inputs['rank'])
+    if target_rank not in RANK_ORDINALS:
+        print(f"❌ Rang inconnu '{target_rank}' (ex: Platinum I)")
+        return
+    if RANK_ORDINALS[target_rank] > MASTER_ORDINAL:
+        # Master+ partagent une seule échelle de LP : GM/Challenger dépendent du classement du serveur
+        print(f"❌ {target_rank} n'a pas de seuil de LP fixe (places selon le classement du serveur) : "
+              f"cible maximale {APEX_TIERS[0]}")
+        return
+    target = absolute_lp(target_rank, 0)
+    print(f"\n{BOLD}{UNDERLINE}🔮 PROJECTION → {colorize_rank(target_rank)}{RESET}")
+    print(f"  Départ            │ {colorize_rank(inputs['rank'])} {inputs['lp_total']} LP")
+    if inputs['position'] >= target:
+        print(f"  🎉 Objectif déjà atteint !")
+        return
+    
+    now = datetime.now()
+    season_end = season_end or parse_period(['saison'], now)[1]
+    days_left = max((season_end - now).total_seconds() / 86400, 0)
+    daily_games = games_per_day(data) if daily_games is None else daily_games
+    season_games = int(daily_games * days_left)
+    horizon = PROJECTION_MAX_GAMES
+    
+    table = increment_table(inputs['wins'], inputs['losses'], inputs['winrate'])
+    start_time = time.perf_counter()
+    with phase('projection'):
+        hits = sorted(hit or horizon + 1 for hit in run_projection(
+            table, inputs['position'], target, horizon, simulations, seed, jobs))
+    elapsed = time.perf_counter() - start_time
+    
+    avg_win = sum(inputs['wins']) / len(inputs['wins'])
+    avg_loss = sum(inputs['losses']) / len(inputs['losses'])
+    reached = bisect_left(hits, horizon + 1)
+    by_season = bisect_left(hits, min(season_games, horizon) + 1)
+    
+    def quantile(q):
+        value = hits[min(int(q * len(hits)), len(hits) - 1)]
+        return f"{value}" if value <= horizon else f"> {horizon}"
+    
+    print(f"  Winrate simulé    │ {inputs['winrate']:.1f}% ({PROJECTION_SAMPLE} dernières: "
+          f"{inputs['sample_winrate']:.1f}%, forme: {inputs['form_winrate']:.1f}%)")
+    print(f"  LP par game       │ {format_lp_change(round(avg_win))} / {format_lp_change(round(avg_loss))} "
+          f"(moyennes sur {len(inputs['wins'])}W/{len(inputs['losses'])}L)")
+    print(f"  Simulations       │ {len(hits)} (graine {seed}, {elapsed:.1f}s)")
+    print(f"  Games nécessaires │ médiane {BOLD}{quantile(0.5)}{RESET} · 80% des cas entre {quantile(0.1)} et {quantile(0.9)}")
+    print(f"  Dans l'horizon    │ {reached / len(hits) * 100:.1f}% en {horizon} games au plus")
+    bound = "≥ " if season_games > horizon else ""  # au-delà de l'horizon : borne inférieure
+    print(f"  Fin de saison     │ {season_end.strftime('%Y-%m-%d')} : ~{daily_games:.1f} games/jour → {season_games} games, "
+          f"{BOLD}{bound}{by_season / len(hits) * 100:.1f}%{RESET} de chances")
+
+SERVE_PORT = 8765          # Port par défaut du mode serve
+SERVE_HISTORY_MAX = 1000   # Entrées au plus par réponse /history et /trend
+
+def api_status(data):
+    """/status : rang, LP, progression dans la division et série en cours"""
+    if not data:
+        return {'games': 0}
+    current = data[-1]
+    apex = rank_info(current['rank']).is_apex
+    return {
+        'rank': current['rank'],
+        'lp': current['lp_total'],
+        'progress': None if apex else current['lp_total'] % 100,
+        'position': absolute_lp(current['rank'], current['lp_total']),
+        'games': len(data),
+        'streak': collect_stats(data)['streaks'],
+        'last_game': current['timestamp']
+    }
+
+def api_history(data, last):
+    """/history : les `last` dernières entrées, telles qu'enregistrées"""
+    return {'games': len(data), 'entries': list(data[-last:]) if last else []}
+
+def api_stats(data):
+    """/stats : toutes les sections de show_stats()"""
+    if not data:
+        return {'games': 0}
+    report = collect_stats(data)
+    basics = report['basics']
+    report['winrate'] = basics['wins'] / basics['total_games'] * 100 if basics['total_games'] else 0
+    return report
+
+def api_trend(data, last):
+    """/trend : positions sur le ladder des `last` dernières games (série de draw_lp_trend)"""
+    if not data or not last:
+        return {'games': 0, 'points': []}
+    positions = ladder_window(data, last)
+    window = range_stats(data, -len(positions))
+    points = [{'timestamp': entry['timestamp'], 'rank': entry['rank'], 'lp_total': entry['lp_total'],
+               'position': position, 'label': ladder_label(position)}
+              for entry, position in zip(data[-len(positions):], positions)]
+    return {'games': len(points), 'net_lp': window['lp'], 'winrate': window['winrate'], 'points': points}
+
+# Chemin -> (fonction, valeur par défaut de ?last=, ou None si pas de paramètre)
+API_ENDPOINTS = {
+    '/status': (api_status, None),
+    '/history': (api_history, 20),
+    '/stats': (api_stats, None),
+    '/trend': (api_trend, 50),
+}
+
+class ResponseCache:
+    """Réponses JSON du mode serve : calculées une fois puis resservies telles quelles (avec
+    leur ETag) tant que le stockage ne change pas. Un seul appel à os.stat par requête."""
+
+    def __init__(self):
+        import threading  # import paresseux : inutile hors du mode serve
+        self.lock = threading.Lock()
+        self.data = None
+        self.stamp = None
+        self.responses = {}
+
+    def _open(self):
+        if STORAGE_BACKEND == 'sqlite':
+            # Connexion rouverte : une autre instance a pu écrire (compteurs en cache)
+            return load_sqlite_history(threaded=True, quiet=True)
+        return load_data(quiet=True)
+
+    def get(self, path, last):
+        """(ETag, corps JSON) de l'endpoint, recalculé seulement si le stockage a changé"""
+        key = (path, last)
+        with self.lock:
+            stamp = storage_stamp()
+            if stamp != self.stamp:
+                if isinstance(self.data, JournalHistory):
+                    self.data.refresh()
+                else:
+                    self.data = self._open()
+                    stamp = storage_stamp()
+                self.stamp = stamp
+                self.responses.clear()
+            response = self.responses.get(key)
+            if response is None:
+                builder, default = API_ENDPOINTS[path]
+                with phase('serve' + path):
+                    result = builder(self.data) if default is None else builder(self.data, last)
+                body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+                response = self.responses[key] = (f'"{zlib.crc32(body):08x}-{len(body):x}"', body)
+            return response
+
+def serve(host='127.0.0.1', port=SERVE_PORT):
+    """Serveur HTTP local en lecture seule (overlays de stream) : /status, /history?last=N,
+    /stats et /trend?last=N en JSON, avec ETag pour des 304 à chaque sondage sans changement"""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlsplit, parse_qs
+    cache = ResponseCache()
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # connexions persistantes : un sondage = une requête
+        disable_nagle_algorithm = True  # en-têtes et corps partent sans attendre l'ACK différé
+        
+        def _send(self, status, body=b"", etag=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            if etag:
+                self.send_header('ETag', etag)
+            if status != 304:
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body and self.command != 'HEAD':
+                self.wfile.write(body)
+        
+        def _error(self, status, message):
+            self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'))
+        
+        def do_GET(self):
+            url = urlsplit(self.path)
+            path = url.path.rstrip('/') or '/'
+            if path == '/':
+                self._send(200, json.dumps({'endpoints': sorted(API_ENDPOINTS)}).encode('utf-8'))
+                return
+            if path not in API_ENDPOINTS:
+                self._error(404, f"endpoint inconnu: {path}")
+                return
+            last = API_ENDPOINTS[path][1]
+            if last is not None:
+                try:
+                    last = int(parse_qs(url.query).get('last', [last])[0])
+                except ValueError:
+                    self._error(400, "last doit être un entier")
+                    return
+                last = max(0, min(last, SERVE_HISTORY_MAX))
+            try:
+                etag, body = cache.get(path, last)
+            except Exception as e:
+                self._error(500, str(e))
+                return
+            tags = self.headers.get('If-None-Match', '')
+            if tags and (tags.strip() == '*' or etag in (tag.strip() for tag in tags.split(','))):
+                self._send(304, etag=etag)
+            else:
+                self._send(200, body, etag)
+        
+        do_HEAD = do_GET
+        
+        def log_message(self, format, *args):
+            pass  # pas de ligne par requête : les overlays sondent en continu
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    print(f"🌐 Serveur en écoute sur http://{host}:{port}/ ({', '.join(sorted(API_ENDPOINTS))}) - Ctrl+C pour arrêter")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{BOLD}👋 Serveur arrêté{RESET}")
+    finally:
+        server.server_close()
+
+def build_parser():
+    """Sous-commandes non interactives (argparse n'est importé qu'en mode commande)"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="script.py", description="🎮 LoL Rank Tracker - commandes ponctuelles "
+                                     "(sans argument : mode interactif)")
+    parser.add_argument('--profile', action='store_true', help="chronos par phase affichés à la sortie")
+    parser.add_argument('--pstats', metavar='FICHIER', help="comme --profile, avec un dump cProfile dans FICHIER")
+    parser.add_argument('--account', metavar='NOM', default=ACCOUNT,
+                        help=f"profil à utiliser, stocké dans {PROFILES_DIR}/NOM/ (défaut: $LOL_TRACKER_ACCOUNT)")
+    sub = parser.add_subparsers(dest='command')
+    
+    def kda_type(text):
+        try:
+            return parse_kda(text)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    
+    def day_type(text):
+        try:
+            return datetime.strptime(text, "%Y-%m-%d")
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"date invalide '{text}' (format attendu: AAAA-MM-JJ)")
+    
+    status = sub.add_parser('status', help="rang et LP actuels sur une ligne (barres d'état)")
+    status.add_argument('--plain', action='store_true', help="sans couleurs ANSI")
+    
+    history = sub.add_parser('history', help="dernières entrées de l'historique")
+    history.add_argument('--last', type=int, default=20, metavar='N', help="nombre d'entrées (défaut: 20)")
+    
+    stats = sub.add_parser('stats', help="statistiques complètes ou d'une période")
+    stats.add_argument('period', nargs='*', help="jour|semaine|mois|saison [date] ou AAAA-MM-JJ [AAAA-MM-JJ]")
+    
+    add = sub.add_parser('add', help="ajoute une game")
+    add.add_argument('--lp', type=int, required=True, help="changement de LP (ex: +18, -15)")
+    add.add_argument('--kda', type=kda_type, required=True, help="K/D/A (ex: 5/2/9)")
+    add.add_argument('--grade', required=True, choices=GRADE_ORDER, metavar='GRADE', help="S+ ... D-")
+    add.add_argument('--note', default="", help="note optionnelle")
+    change = add.add_mutually_exclusive_group()
+    change.add_argument('--promote', type=int, metavar='LP', help="promotion, avec les LP de départ")
+    change.add_argument('--demote', type=int, metavar='LP', help="démotion, avec les LP de départ")
+    add.add_argument('--rank', help="rang initial (première entrée seulement)")
+    add.add_argument('--start-lp', type=int, default=0, help="LP initiaux (première entrée seulement)")
+    
+    bulk = sub.add_parser('import', help="import en masse d'un journal de games (CSV ou JSONL)")
+    bulk.add_argument('path', help="colonnes: timestamp, lp_change, grade, kills/deaths/assists ou kda, note, start_lp")
+    bulk.add_argument('--rank', help="rang initial (historique vide, ou games antérieures à la première)")
+    bulk.add_argument('--start-lp', type=int, default=0, help="LP initiaux (avec --rank)")
+    
+    riot = sub.add_parser('riot', help="K/D/A et résultats depuis des exports match-v5 locaux")
+    riot.add_argument('paths', nargs='+', help="fichiers JSON/JSONL de matchs")
+    riot.add_argument('--player', required=True, help="puuid, Riot ID (Nom#TAG) ou nom d'invocateur")
+    riot.add_argument('--lp-win', type=int, help="LP par victoire, pour ajouter les games absentes")
+    riot.add_argument('--lp-loss', type=int, help="LP par défaite (négatif), pour ajouter les games absentes")
+    riot.add_argument('--jobs', type=int, help="processus d'analyse en parallèle (défaut: nombre de CPU)")
+    
+    edit = sub.add_parser('edit', help="corrige une game (les suivantes sont re-chaînées)")
+    edit.add_argument('line', type=int, help="ligne de l'historique (1 = la plus ancienne, -1 = la dernière)")
+    edit.add_argument('--lp', type=int, help="changement de LP")
+    edit.add_argument('--kda', type=kda_type, help="K/D/A (ex: 5/2/9)")
+    edit.add_argument('--grade', choices=GRADE_ORDER, metavar='GRADE', help="S+ ... D-")
+    edit.add_argument('--note', help="note ('' pour l'effacer)")
+    edit.add_argument('--start-lp', type=int, help="LP de départ d'une promotion ou démotion")
+    
+    delete = sub.add_parser('delete', help="supprime une game (les suivantes sont re-chaînées)")
+    delete.add_argument('line', type=int, help="ligne de l'historique (1 = la plus ancienne, -1 = la dernière)")
+    
+    sub.add_parser('undo', help="annule la dernière correction (edit/delete)")
+    
+    sessions = sub.add_parser('sessions', help="sessions de jeu : games, W/L, LP, KDA, grade, rang atteint, tilt")
+    sessions.add_argument('--last', type=int, default=SESSIONS_SHOWN, metavar='N',
+                          help=f"nombre de sessions (défaut: {SESSIONS_SHOWN})")
+    sessions.add_argument('--tilt', action='store_true', help="seulement les sessions terminées en tilt")
+    
+    board = sub.add_parser('leaderboard', help="classement de tous les profils")
+    board.add_argument('--jobs', type=int, help="processus d'analyse en parallèle (défaut: nombre de CPU)")
+    
+    projection = sub.add_parser('projection', help="projection Monte Carlo vers un rang (games nécessaires, fin de saison)")
+    projection.add_argument('target', nargs='*', help="rang visé (ex: Platinum I ; défaut: division suivante)")
+    projection.add_argument('--sims', type=int, default=PROJECTION_SIMULATIONS,
+                            help=f"trajectoires simulées (défaut: {PROJECTION_SIMULATIONS})")
+    projection.add_argument('--seed', type=int, default=0, help="graine (résultats reproductibles)")
+    projection.add_argument('--jobs', type=int, help="processus de simulation (défaut: nombre de CPU)")
+    projection.add_argument('--winrate', type=float, help="winrate simulé en %% (défaut: récent + forme)")
+    projection.add_argument('--games-per-day', type=float, help="rythme de jeu (défaut: moyenne des 30 derniers jours)")
+    projection.add_argument('--season-end', type=day_type,
+                            metavar='AAAA-MM-JJ', help="fin de saison (défaut: fin de l'année)")
+    
+    server = sub.add_parser('serve', help="serveur HTTP local en lecture seule (JSON pour overlays)")
+    server.add_argument('--host', default='127.0.0.1', help="adresse d'écoute (défaut: 127.0.0.1)")
+    server.add_argument('--port', type=int, default=SERVE_PORT, help=f"port (défaut: {SERVE_PORT})")
+    
+    export = sub.add_parser('export', help="exporte l'historique en JSON")
+    export.add_argument('path', nargs='?', help=f"fichier de sortie (défaut: {STORAGE_FILE})")
+    return parser
+
+def cli_status(data, plain=False):
+    """Ligne de statut : ne lit que la dernière entrée et le nombre de lignes du journal"""
+    if not data:
+        print("Aucune game enregistrée")
+        return
+    current = data[-1]
+    rank = current['rank'] if plain else colorize_rank(current['rank'])
+    print(f"{rank} · {current['lp_total']} LP · {len(data)} games")
+
+def cli_add(parser, data, args):
+    """Ajout non interactif, mêmes règles que add_entry()"""
+    if data:
+        current_rank = data[-1]['rank']
+        current_lp = data[-1]['lp_total']
+    elif args.rank in RANK_ORDINALS and args.start_lp >= 0:
+        current_rank, current_lp = args.rank, args.start_lp
+    else:
+        parser.error("première entrée : --rank (ex: 'Silver II') et --start-lp sont requis")
+    
+    kills, deaths, assists = args.kda
+    entry = make_entry(current_rank, current_lp, args.lp, args.grade, kills, deaths, assists, args.note)
+    requested = 'promote' if args.promote is not None else 'demote' if args.demote is not None else None
+    if requested:
+        start_lp = args.promote if requested == 'promote' else args.demote
+        if rank_change_available(current_rank, entry["lp_total"]) != requested:
+            parser.error(f"--{requested} impossible avec {entry['lp_total']} LP en {current_rank}")
+        if not 0 <= start_lp <= 100:
+            parser.error(f"--{requested} : LP de départ entre 0 et 100")
+        apply_rank_change(entry, current_lp, requested, start_lp)
+    
+    data.append(entry)
+    if not save_data(data, quiet=True):
+        return 1
+    print(f"✅ Entrée ajoutée: {colorize_rank(entry['rank'])} - {entry['lp_total']} LP")
+    return 0
+
+def run_command(argv):
+    """Exécute une sous-commande puis rend la main (code de retour du processus).
+    Sans sous-commande (ex: `--profile` seul), lance le mode interactif."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        use_profile(args.account)
+    except ValueError as e:
+        parser.error(str(e))
+    with Profiling(args.pstats or ('1' if args.profile else PROFILE_SETTING)):
+        if args.command is None:
+            main()
+            return 0
+        return dispatch_command(parser, args)
+
+def dispatch_command(parser, args):
+    """Sous-commandes ponctuelles"""
+    if args.command == 'leaderboard':
+        show_leaderboard(args.jobs)
+        return 0
+    if args.command == 'serve':
+        serve(args.host, args.port)
+        return 0
+    data = load_data(quiet=True)
+    
+    if args.command == 'status':
+        cli_status(data, args.plain)
+    elif args.command == 'history':
+        if not data:
+            print(f"{BOLD}📊 Aucune donnée à afficher{RESET}")
+        elif args.last > 0:
+            sys.stdout.write("\n".join(render_history_table(data[-args.last:])) + "\n")
+    elif args.command == 'stats':
+        if args.period:
+            show_period_stats(data, args.period)
+        else:
+            show_stats(data)
+    elif args.command == 'add':
+        return cli_add(parser, data, args)
+    elif args.command == 'import':
+        try:
+            _, rejected = bulk_import(data, args.path, args.rank, args.start_lp)
+        except (OSError, ValueError) as e:
+            print(f"❌ Import impossible: {e}", file=sys.stderr)
+            return 1
+        if not save_data(data, quiet=True):
+            return 1
+        return 1 if rejected else 0
+    elif args.command == 'riot':
+        try:
+            import_match_dumps(data, args.paths, args.player, args.lp_win, args.lp_loss, args.jobs)
+        except (OSError, ValueError) as e:
+            print(f"❌ Import impossible: {e}", file=sys.stderr)
+            return 1
+        if not save_data(data, quiet=True):
+            return 1
+    elif args.command in ('edit', 'delete'):
+        try:
+            position = history_position(data, args.line)
+            if args.command == 'edit':
+                rewritten = edit_entry(data, position, args.lp, args.kda, args.grade, args.note, args.start_lp)
+            else:
+                rewritten = delete_entry(data, position) + 1
+        except (OSError, ValueError) as e:
+            print(f"❌ Correction impossible: {e}", file=sys.stderr)
+            return 1
+        if rewritten:
+            print_correction(data, f"Ligne {position + 1} {'corrigée' if args.command == 'edit' else 'supprimée'}",
+                             rewritten)
+        else:
+            print("ℹ️  Aucune modification")
+    elif args.command == 'undo':
+        return 0 if undo_last_change(data) else 1
+    elif args.command == 'sessions':
+        show_sessions(data, args.last, args.tilt)
+    elif args.command == 'projection':
+        show_projection(data, " ".join(args.target) or None, max(args.sims, 1), args.seed, args.jobs,
+                        args.winrate, args.games_per_day, args.season_end)
+    elif args.command == 'export':
+        export_data(data, args.path)
+    return 0
+
 def main():
     """Fonction principale ultra sexy"""
     print_banner()
+    if JOURNAL_FILE != _DEFAULT_FILES[1]:
+        print(f"👤 Profil: {BOLD}{os.path.basename(os.path.dirname(JOURNAL_FILE))}{RESET}")
     
+    saver = None
     try:
         data = load_data()
+        saver = AutoSaver(data)
         show_help()
         
         while True:
             try:
-                cmd = input(f"\n{BOLD}🎮 Commande{RESET} >> ").strip().lower()
+                parts = input(f"\n{BOLD}🎮 Commande{RESET} >> ").split()
+                cmd = parts[0].lower() if parts else ''
+                args = parts[1:]
                 
                 if cmd == 'q':
-                    if save_data(data):
+                    if saver.close():
                         print(f"{BOLD}👋 Merci d'avoir utilisé LoL Rank Tracker !{RESET}")
                     break
+                
+                with saver.lock:
+                    if isinstance(data, LazyHistory):
+                        changed = data.refresh()
+                        if changed:
+                            print(f"🔄 Journal modifié par un autre terminal"
+                                  + (f" : {changed} nouvelle(s) entrée(s)" if changed > 0 else ", historique relu"))
                     
-                elif cmd == 'a':
-                    data = add_entry(data)
+                    if cmd == 'a':
+                        data = add_entry(data)
+                        saver.request()
                     
-                elif cmd == 'p':
-                    display_data(data)
+                    elif cmd == 'p':
+                        display_data(data)
                     
-                elif cmd == 's':
-                    show_stats(data)
+                    elif cmd == 'v':
+                        page_history(data)
                     
-                elif cmd == 'h':
-                    show_help()
+                    elif cmd == 'c':
+                        show_ladder_chart(data, args)
                     
-                elif cmd == '':
-                    continue
+                    elif cmd == 'r':
+                        show_rolling_stats(data, args)
                     
-                else:
-                    print(f"❓ Commande '{cmd}' inconnue. Tapez 'h' pour l'aide.")
+                    elif cmd == 'e':
+                        prompt_edit_entry(data, args)
+                    
+                    elif cmd == 'd':
+                        prompt_delete_entry(data, args)
+                    
+                    elif cmd == 'u':
+                        undo_last_change(data)
+                    
+                    elif cmd == 'j':
+                        counts = [int(arg) for arg in args if arg.isdigit()]
+                        show_sessions(data, counts[0] if counts else SESSIONS_SHOWN, 'tilt' in args)
+                    
+                    elif cmd == 's':
+                        if args:
+                            show_period_stats(data, args)
+                        else:
+                            show_stats(data)
+                    
+                    elif cmd == 'i':
+                        path = get_user_input("Fichier à importer (JSON ou JSONL)")
+                        try:
+                            data = import_data(data, path)
+                            save_data(data, quiet=True)
+                        except (OSError, ValueError) as e:
+                            print(f"❌ Import impossible: {e}")
+                    
+                    elif cmd == 'b':
+                        path = get_user_input("Journal de games à importer (CSV ou JSONL)")
+                        start_rank, start_lp = None, 0
+                        if not data:
+                            start_rank = get_user_input("Rang initial (ex: Silver II)", str, lambda x: x in RANK_ORDINALS)
+                            start_lp = get_user_input("LP initial", int, lambda x: x >= 0)
+                        try:
+                            bulk_import(data, path, start_rank, start_lp)
+                            save_data(data, quiet=True)
+                        except (OSError, ValueError) as e:
+                            print(f"❌ Import impossible: {e}")
+                    
+                    elif cmd == 'o':
+                        show_projection(data, " ".join(args) or None)
+                    
+                    elif cmd == 'l':
+                        show_leaderboard()
+                    
+                    elif cmd == 'x':
+                        export_data(data)
+                    
+                    elif cmd == 'h':
+                        show_help()
+                    
+                    elif cmd == '':
+                        continue
+                    
+                    else:
+                        print(f"❓ Commande '{cmd}' inconnue. Tapez 'h' pour l'aide.")
                     
             except KeyboardInterrupt:
                 print(f"\n\n{BOLD}💾 Sauvegarde avant fermeture...{RESET}")
-                save_data(data)
+                saver.close()
                 print(f"{BOLD}👋 Au revoir !{RESET}")
                 break
                 
     except Exception as e:
         print(f"💥 Erreur inattendue: {e}")
         print("📧 Veuillez signaler ce bug !")
+        if saver is not None:
+            saver.close()
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
+    try:
+        use_profile(ACCOUNT)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    with Profiling(PROFILE_SETTING):
+        main()